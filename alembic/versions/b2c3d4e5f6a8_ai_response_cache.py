@@ -0,0 +1,41 @@
+"""ai_response_cache
+
+Revision ID: b2c3d4e5f6a8
+Revises: a1b2c3d4e5f7
+Create Date: 2026-10-19 10:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b2c3d4e5f6a8"
+down_revision = "a1b2c3d4e5f7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_response_cache",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("feature", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=64), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("last_hit_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("fingerprint"),
+    )
+    op.create_index(op.f("ix_ai_response_cache_feature"), "ai_response_cache", ["feature"], unique=False)
+    op.create_index(op.f("ix_ai_response_cache_expires_at"), "ai_response_cache", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_ai_response_cache_expires_at"), table_name="ai_response_cache")
+    op.drop_index(op.f("ix_ai_response_cache_feature"), table_name="ai_response_cache")
+    op.drop_table("ai_response_cache")
@@ -0,0 +1,76 @@
+"""ai_usage_rollups
+
+Revision ID: c3d4e5f6a7b9
+Revises: b2c3d4e5f6a8
+Create Date: 2026-10-19 12:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c3d4e5f6a7b9"
+down_revision = "b2c3d4e5f6a8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_usage_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("granularity", sa.String(length=8), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("feature", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=64), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("calls", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("cache_hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+    )
+    # One row per key, so writers can upsert and add in SQL. NULL users share
+    # one key (COALESCE), which a plain unique constraint would not do.
+    op.create_index(
+        "uq_ai_usage_rollups_key",
+        "ai_usage_rollups",
+        ["granularity", "bucket_start", "feature", "model", sa.text("COALESCE(user_id, 0)")],
+        unique=True,
+    )
+    op.create_index(op.f("ix_ai_usage_rollups_user_id"), "ai_usage_rollups", ["user_id"], unique=False)
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # Backfill existing logs; new rows are rolled up as they are written.
+    for granularity in ("hour", "day"):
+        op.execute(
+            f"""
+            INSERT INTO ai_usage_rollups (
+                granularity, bucket_start, feature, model, user_id, calls, cache_hits,
+                prompt_tokens, completion_tokens, total_tokens, cost_usd
+            )
+            SELECT
+                '{granularity}',
+                date_trunc('{granularity}', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                feature,
+                model,
+                user_id,
+                COUNT(*) FILTER (WHERE status <> 'cache_hit'),
+                COUNT(*) FILTER (WHERE status = 'cache_hit'),
+                COALESCE(SUM(prompt_tokens), 0),
+                COALESCE(SUM(completion_tokens), 0),
+                COALESCE(SUM(total_tokens), 0),
+                COALESCE(SUM(cost_usd), 0)
+            FROM ai_usage_logs
+            GROUP BY 2, feature, model, user_id
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_ai_usage_rollups_user_id"), table_name="ai_usage_rollups")
+    op.drop_index("uq_ai_usage_rollups_key", table_name="ai_usage_rollups")
+    op.drop_table("ai_usage_rollups")
@@ -0,0 +1,44 @@
+"""chat_memory
+
+Revision ID: d5e6f7a8b9c1
+Revises: c3d4e5f6a7b9
+Create Date: 2026-10-19 15:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d5e6f7a8b9c1"
+down_revision = "c3d4e5f6a7b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_memories",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("summary", sa.Text(), nullable=False, server_default=""),
+        sa.Column("summarized_through_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+    )
+    op.create_table(
+        "chat_message_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("role", sa.Enum("USER", "ASSISTANT", "SYSTEM", name="chatrole", native_enum=False), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+    )
+    op.create_index(op.f("ix_chat_message_archive_user_id"), "chat_message_archive", ["user_id"], unique=False)
+    op.create_index("ix_chat_messages_user_created", "chat_messages", ["user_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_messages_user_created", table_name="chat_messages")
+    op.drop_index(op.f("ix_chat_message_archive_user_id"), table_name="chat_message_archive")
+    op.drop_table("chat_message_archive")
+    op.drop_table("chat_memories")
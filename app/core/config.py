@@ -16,7 +16,47 @@ class Settings(BaseSettings):
         alias="DATABASE_URL",
     )
     database_use_null_pool: bool = Field(default=True, alias="DATABASE_USE_NULL_POOL")
+    database_pool_size: int = Field(default=5, alias="DATABASE_POOL_SIZE")
+    database_max_overflow: int = Field(default=10, alias="DATABASE_MAX_OVERFLOW")
     openai_api_key: str | None = Field(default=None, alias="OPENAI_API_KEY")
+    openai_base_url: str | None = Field(default=None, alias="OPENAI_BASE_URL")
+    openai_timeout_seconds: float = Field(default=60.0, alias="OPENAI_TIMEOUT_SECONDS")
+    openai_connect_timeout_seconds: float = Field(
+        default=5.0, alias="OPENAI_CONNECT_TIMEOUT_SECONDS"
+    )
+    openai_max_retries: int = Field(default=2, alias="OPENAI_MAX_RETRIES")
+    openai_max_connections: int = Field(default=20, alias="OPENAI_MAX_CONNECTIONS")
+    openai_max_keepalive_connections: int = Field(
+        default=10, alias="OPENAI_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    openai_keepalive_expiry_seconds: float = Field(
+        default=30.0, alias="OPENAI_KEEPALIVE_EXPIRY_SECONDS"
+    )
+    openai_http2: bool = Field(default=True, alias="OPENAI_HTTP2")
+    ai_cache_enabled: bool = Field(default=True, alias="AI_CACHE_ENABLED")
+    ai_cache_ttl_hours: float = Field(default=720.0, alias="AI_CACHE_TTL_HOURS")
+    ai_cache_max_entries: int = Field(default=50_000, alias="AI_CACHE_MAX_ENTRIES")
+    ai_usage_flush_interval_seconds: float = Field(
+        default=2.0, alias="AI_USAGE_FLUSH_INTERVAL_SECONDS"
+    )
+    ai_usage_batch_size: int = Field(default=100, alias="AI_USAGE_BATCH_SIZE")
+    challenge_rotation_interval_seconds: float = Field(
+        default=3600.0, alias="CHALLENGE_ROTATION_INTERVAL_SECONDS"
+    )
+    chat_stream_flush_ms: int = Field(default=60, alias="CHAT_STREAM_FLUSH_MS")
+    chat_stream_flush_chars: int = Field(default=200, alias="CHAT_STREAM_FLUSH_CHARS")
+    chat_history_max_tokens: int = Field(default=1200, alias="CHAT_HISTORY_MAX_TOKENS")
+    chat_recent_messages: int = Field(default=12, alias="CHAT_RECENT_MESSAGES")
+    chat_summary_batch: int = Field(default=16, alias="CHAT_SUMMARY_BATCH")
+    chat_hot_messages: int = Field(default=40, alias="CHAT_HOT_MESSAGES")
+    ocr_workers: int = Field(default=1, alias="OCR_WORKERS")
+    ocr_queue_limit: int = Field(default=4, alias="OCR_QUEUE_LIMIT")
+    ocr_cache_max_entries: int = Field(default=256, alias="OCR_CACHE_MAX_ENTRIES")
+    ocr_cache_ttl_seconds: float = Field(default=3600.0, alias="OCR_CACHE_TTL_SECONDS")
+    ocr_cache_dir: str = Field(default="", alias="OCR_CACHE_DIR")
+    ocr_cache_max_disk_entries: int = Field(
+        default=2000, alias="OCR_CACHE_MAX_DISK_ENTRIES"
+    )
     offline_sense_model_enabled: bool = Field(
         default=True, alias="OFFLINE_SENSE_MODEL_ENABLED"
     )
@@ -35,6 +75,8 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = Field(default=80, alias="RATE_LIMIT_PER_MINUTE")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
     request_id_header: str = Field(default="X-Request-ID", alias="REQUEST_ID_HEADER")
+    sql_metrics_header: bool = Field(default=False, alias="SQL_METRICS_HEADER")
+    sql_repeat_threshold: int = Field(default=5, alias="SQL_REPEAT_THRESHOLD")
 
 
 @lru_cache(maxsize=1)
@@ -10,6 +10,12 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.core.config import settings
+from app.core.query_metrics import (
+    QUERY_COUNT_HEADER,
+    QUERY_REPEATS_HEADER,
+    QUERY_TIME_HEADER,
+    track_queries,
+)
 
 request_id_ctx: ContextVar[str] = ContextVar("request_id", default="-")
 
@@ -59,27 +65,43 @@ class RequestLogMiddleware(BaseHTTPMiddleware):
         started = time.perf_counter()
         logger = logging.getLogger("app.request")
 
-        try:
-            response = await call_next(request)
-        except Exception:
-            duration_ms = (time.perf_counter() - started) * 1000
-            logger.exception(
-                "Unhandled request error: %s %s %.1fms",
-                request.method,
-                request.url.path,
-                duration_ms,
-            )
-            request_id_ctx.reset(token)
-            raise
+        with track_queries() as queries:
+            try:
+                response = await call_next(request)
+            except Exception:
+                duration_ms = (time.perf_counter() - started) * 1000
+                logger.exception(
+                    "Unhandled request error: %s %s %.1fms",
+                    request.method,
+                    request.url.path,
+                    duration_ms,
+                )
+                request_id_ctx.reset(token)
+                raise
 
         duration_ms = (time.perf_counter() - started) * 1000
+        repeated = queries.repeated(settings.sql_repeat_threshold)
         response.headers[settings.request_id_header] = request_id
+        if settings.sql_metrics_header:
+            response.headers[QUERY_COUNT_HEADER] = str(queries.count)
+            response.headers[QUERY_TIME_HEADER] = f"{queries.total_ms:.1f}"
+            response.headers[QUERY_REPEATS_HEADER] = str(len(repeated))
         logger.info(
-            "%s %s -> %s %.1fms",
+            "%s %s -> %s %.1fms db=%d/%.1fms",
             request.method,
             request.url.path,
             response.status_code,
             duration_ms,
+            queries.count,
+            queries.total_ms,
         )
+        for shape, count in repeated:
+            logger.warning(
+                "Repeated statement (%dx, possible N+1) on %s %s: %s",
+                count,
+                request.method,
+                request.url.path,
+                shape[:300],
+            )
         request_id_ctx.reset(token)
         return response
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+QUERY_REPEATS_HEADER = "X-DB-Repeated-Statements"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Expanded IN lists ("$1, $2, $3" / "?, ?, ?") vary in length with the input,
+# so collapse them before comparing shapes or every page size looks unique.
+_PARAM_LIST_RE = re.compile(r"(?:\$\d+|\?|%\(\w+\)s)(?:\s*,\s*(?:\$\d+|\?|%\(\w+\)s))+")
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s")
+_NUMBER_RE = re.compile(r"\b\d+\b")
+_STARTED_KEY = "query_metrics_started"
+
+
+@dataclass(slots=True)
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed at least ``threshold`` times (N+1 suspects)."""
+        if threshold <= 1:
+            return []
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+query_stats_ctx: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _PARAM_LIST_RE.sub("?…", shape)
+    shape = _PARAM_RE.sub("?", shape)
+    return _NUMBER_RE.sub("N", shape)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect every statement executed in the current context into a fresh ``QueryStats``."""
+    stats = QueryStats()
+    token = query_stats_ctx.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats_ctx.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if query_stats_ctx.get() is not None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = query_stats_ctx.get()
+    started = conn.info.get(_STARTED_KEY)
+    if stats is None or not started:
+        return
+    stats.record(statement, (time.perf_counter() - started.pop()) * 1000)
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is None:
+        return
+    started = connection.info.get(_STARTED_KEY)
+    if started:
+        started.pop()
+
+
+def install_query_metrics(engine: AsyncEngine | Engine) -> None:
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
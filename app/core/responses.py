@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.datastructures import Default
+from pydantic import BaseModel
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class JSONResponse(StarletteJSONResponse):
+    """``JSONResponse`` rendered with orjson.
+
+    Datetimes, dates, enums, UUIDs, dataclasses and numpy values serialize
+    natively, so payloads can carry them as-is instead of pre-formatting with
+    ``isoformat()``. Datetimes come out in the same RFC 3339 form.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# For ``APIRouter(default_response_class=...)``. Kept a default placeholder so
+# routes with a ``response_model`` still take FastAPI's Pydantic ``dump_json``
+# path, which serializes straight to bytes and is faster than any response class.
+DEFAULT_RESPONSE_CLASS = Default(JSONResponse)
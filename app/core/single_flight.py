@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls that share a key into one in-flight awaitable.
+
+    The first caller for a key runs ``factory``; callers arriving while it is
+    pending await the same result (or exception). Nothing is cached once the
+    call settles — persistence is the caller's job.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future[T]] = {}
+
+    def pending(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        existing = self._inflight.get(key)
+        if existing is not None:
+            try:
+                return await asyncio.shield(existing)
+            except asyncio.CancelledError:
+                if not existing.cancelled():
+                    raise
+                # The leader was cancelled (client went away); do the work here.
+                return await self.run(key, factory)
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Followers re-raise it; keep the loop from warning when none exist.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
+def advisory_lock_key(*parts: object) -> int:
+    """Stable signed 64-bit key for ``pg_advisory_xact_lock``."""
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode("utf-8"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+async def advisory_xact_lock(db: AsyncSession, *parts: object) -> bool:
+    """Take a transaction-scoped advisory lock; no-op (False) off PostgreSQL.
+
+    The lock is released when the caller's transaction commits, so a waiter
+    that re-reads after acquiring it sees whatever the holder persisted.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    await db.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"),
+        {"key": advisory_lock_key(*parts)},
+    )
+    return True
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+from functools import lru_cache
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Preferred first: brotli is ~15% smaller than gzip on the SPA bundle.
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Codings the client accepts (``q`` > 0) from an ``Accept-Encoding`` header."""
+    accepted: set[str] = set()
+    listed: set[str] = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        listed.add(coding)
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    if "*" in accepted:
+        # ``*`` covers only codings not named elsewhere: ``gzip;q=0, *`` still refuses gzip.
+        accepted.update(encoding for encoding, _ in PRECOMPRESSED_ENCODINGS if encoding not in listed)
+    return accepted
+
+
+@lru_cache(maxsize=512)
+def _siblings(full_path: str, mtime_ns: int) -> tuple[tuple[str, str, os.stat_result], ...]:
+    # Keyed by the original's mtime, so a rebuild picks up new siblings.
+    found = []
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        try:
+            found.append((encoding, full_path + suffix, os.stat(full_path + suffix)))
+        except OSError:
+            continue
+    return tuple(found)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """``StaticFiles`` that serves build-time ``.br``/``.gz`` siblings.
+
+    The SPA build writes compressed copies next to each bundle, so no CPU is
+    spent compressing per request. The variant is chosen from
+    ``Accept-Encoding``, and ``Vary: Accept-Encoding`` is set whenever a
+    variant exists. Each variant has its own ``ETag`` from its own file stat.
+    With ``immutable=True``, everything except HTML (content-hashed bundle
+    names) is cached for a year.
+    """
+
+    def __init__(self, *args, immutable: bool = False, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.immutable = immutable
+
+    def file_response(
+        self,
+        full_path: os.PathLike[str] | str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        path = os.fspath(full_path)
+        siblings = _siblings(path, stat_result.st_mtime_ns)
+        headers: dict[str, str] = {}
+        if siblings:
+            headers["Vary"] = "Accept-Encoding"
+        if self.immutable and not path.endswith(".html"):
+            headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+
+        accepted = accepted_encodings(request_headers.get("accept-encoding", "")) if siblings else set()
+        variant = next((sibling for sibling in siblings if sibling[0] in accepted), None)
+        if variant is None:
+            response = FileResponse(path, status_code=status_code, stat_result=stat_result, headers=headers)
+        else:
+            encoding, variant_path, variant_stat = variant
+            headers["Content-Encoding"] = encoding
+            response = FileResponse(
+                variant_path,
+                status_code=status_code,
+                stat_result=variant_stat,
+                headers=headers,
+                media_type=mimetypes.guess_type(path)[0] or "application/octet-stream",
+            )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
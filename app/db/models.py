@@ -18,6 +18,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     func,
+    literal_column,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -339,6 +340,38 @@ class ChatMessage(Base):
 
     user: Mapped[User] = relationship("User", back_populates="chat_messages")
 
+    __table_args__ = (Index("ix_chat_messages_user_created", "user_id", "created_at"),)
+
+
+class ChatMemory(Base):
+    """Compressed summary of a user's older tutor turns.
+
+    Covers every ``chat_messages`` row up to ``summarized_through_id``; newer
+    rows are sent to the model verbatim.
+    """
+
+    __tablename__ = "chat_memories"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    summary: Mapped[str] = mapped_column(Text, default="")
+    summarized_through_id: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class ChatMessageArchive(Base):
+    """Chat messages moved out of ``chat_messages`` once folded into the summary."""
+
+    __tablename__ = "chat_message_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    role: Mapped[ChatRole] = mapped_column(Enum(ChatRole, native_enum=False))
+    content: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
 
 class AIUsageLog(Base):
     __tablename__ = "ai_usage_logs"
@@ -362,6 +395,68 @@ class AIUsageLog(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
 
 
+class AIUsageRollup(Base):
+    """Pre-aggregated ``ai_usage_logs`` per hour/day bucket, feature, model and user.
+
+    Maintained when usage rows are written, so the admin report sums a few
+    buckets instead of scanning the raw log. Each key is one row: writers
+    upsert with ``ON CONFLICT ... DO UPDATE`` and add to the counters in SQL,
+    so concurrent flushes never lose increments. The key treats a missing user
+    as user 0, so anonymous calls share one row per bucket (users are never
+    deleted, so ``SET NULL`` does not merge rows).
+    """
+
+    __tablename__ = "ai_usage_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    granularity: Mapped[str] = mapped_column(String(8))
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    feature: Mapped[str] = mapped_column(String(64))
+    model: Mapped[str] = mapped_column(String(64))
+    user_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), index=True, nullable=True
+    )
+    calls: Mapped[int] = mapped_column(Integer, default=0)
+    cache_hits: Mapped[int] = mapped_column(Integer, default=0)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    total_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, default=0.0)
+
+
+# The rollup key, also the ON CONFLICT target. Its leading columns serve the
+# report's granularity/bucket range scans.
+AI_USAGE_ROLLUP_KEY = (
+    AIUsageRollup.granularity,
+    AIUsageRollup.bucket_start,
+    AIUsageRollup.feature,
+    AIUsageRollup.model,
+    func.coalesce(AIUsageRollup.user_id, literal_column("0")),
+)
+Index("uq_ai_usage_rollups_key", *AI_USAGE_ROLLUP_KEY, unique=True)
+
+
+class AIResponseCache(Base):
+    """Model responses keyed by a fingerprint of (model, system prompt, user message).
+
+    Safe for private lookups: the context and question are part of the key, so a
+    row is only ever served back for a byte-identical request.
+    """
+
+    __tablename__ = "ai_response_cache"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), unique=True)
+    feature: Mapped[str] = mapped_column(String(64), index=True)
+    model: Mapped[str] = mapped_column(String(64))
+    content: Mapped[str] = mapped_column(Text)
+    cost_usd: Mapped[float] = mapped_column(Float, default=0.0)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_hit_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+
 class XPEvent(Base):
     __tablename__ = "xp_events"
 
@@ -4,12 +4,17 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
+from app.core.query_metrics import install_query_metrics
 
 engine_kwargs: dict[str, object] = {"echo": False, "future": True}
 if settings.database_use_null_pool:
     engine_kwargs["poolclass"] = NullPool
+elif not settings.database_url.startswith("sqlite"):
+    engine_kwargs["pool_size"] = settings.database_pool_size
+    engine_kwargs["max_overflow"] = settings.database_max_overflow
 
 engine = create_async_engine(settings.database_url, **engine_kwargs)
+install_query_metrics(engine)
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
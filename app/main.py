@@ -3,7 +3,6 @@ from __future__ import annotations
 from pathlib import Path
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
@@ -13,8 +12,15 @@ from app.core.config import settings
 from app.core.languages import LANGUAGE_DEFINITIONS
 from app.core.observability import RequestLogMiddleware, configure_logging
 from app.core.rate_limit import limiter
+from app.core.responses import JSONResponse
+from app.core.static_files import PrecompressedStaticFiles
 from app.db.models import Language
 from app.db.session import AsyncSessionLocal
+from app.services.ai_usage import usage_buffer
+from app.services.challenge_rotation import challenge_rotation
+from app.services.chat_memory import stop_memory_refreshes
+from app.services.gamification import ensure_badge_catalog
+from app.services.openai_client import close_openai_client
 from sqlalchemy import select
 from app.routers import (
     admin,
@@ -51,20 +57,17 @@ app.add_middleware(SlowAPIMiddleware)
 app.add_middleware(RequestLogMiddleware)
 
 
-@app.middleware("http")
-async def static_cache_headers(request: Request, call_next):
+if SPA_STATIC_DIR.exists():
     # SPA assets carry content hashes in their filenames (vite manifest), so
     # they can be cached forever — a deploy changes the URL, never the content
     # behind it. Without this, Cloudflare applied its default 4h TTL to
-    # .js/.css and served stale bundles after deploys.
-    response = await call_next(request)
-    path = request.url.path
-    if path.startswith("/static/spa/") and not path.endswith(".html"):
-        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
-    return response
-
-if SPA_STATIC_DIR.exists():
-    app.mount("/static/spa", StaticFiles(directory=str(SPA_STATIC_DIR)), name="spa-static")
+    # .js/.css and served stale bundles after deploys. The build also writes
+    # .br/.gz siblings, served as-is to clients that accept them.
+    app.mount(
+        "/static/spa",
+        PrecompressedStaticFiles(directory=str(SPA_STATIC_DIR), immutable=True),
+        name="spa-static",
+    )
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
 
 app.include_router(ops.router)
@@ -116,3 +119,43 @@ async def _ensure_language_rows() -> None:
             changed = True
         if changed:
             await db.commit()
+
+
+@app.on_event("startup")
+async def _provision_badge_catalog() -> None:
+    # Provisioned once here rather than upserted on every bootstrap.
+    async with AsyncSessionLocal() as db:
+        await ensure_badge_catalog(db)
+        await db.commit()
+
+
+@app.on_event("startup")
+async def _start_challenge_rotation() -> None:
+    challenge_rotation.start()
+
+
+@app.on_event("startup")
+async def _start_ai_usage_buffer() -> None:
+    usage_buffer.start()
+
+
+@app.on_event("shutdown")
+async def _stop_memory_refreshes() -> None:
+    # Before the usage buffer drains, so nothing is enqueued after it stops.
+    await stop_memory_refreshes()
+
+
+@app.on_event("shutdown")
+async def _flush_ai_usage_buffer() -> None:
+    await usage_buffer.stop()
+
+
+@app.on_event("shutdown")
+async def _stop_challenge_rotation() -> None:
+    await challenge_rotation.stop()
+
+
+@app.on_event("shutdown")
+async def _close_openai_client() -> None:
+    # Last: the hooks above may still be finishing AI calls.
+    await close_openai_client()
@@ -3,10 +3,11 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import RedirectResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.responses import DEFAULT_RESPONSE_CLASS, JSONResponse
 from app.core.security import get_current_user
 from app.db.models import (
     ChatMessage,
@@ -27,10 +28,11 @@ from app.db.models import (
     WordNativeTranslation,
 )
 from app.db.session import get_db
-from app.routers.common import render_template, templates
+from app.routers.common import not_modified, render_template, templates, with_etag
+from app.services.state_version import state_versions
 from app.services.word_ai_service import WordAIError, translate_word
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+router = APIRouter(prefix="/admin", tags=["admin"], default_response_class=DEFAULT_RESPONSE_CLASS)
 
 
 @router.get("")
@@ -159,9 +161,13 @@ async def monitor_panel(
 
 @router.get("/api/live")
 async def live_monitor_api(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     user: User | None = Depends(get_current_user),
 ):
+    etag = state_versions.etag("admin-live", None, user.id if user else None, activity=True)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
     snapshot = await _monitor_snapshot(db)
     payload = {
         "totals": snapshot["totals"],
@@ -172,7 +178,7 @@ async def live_monitor_api(
                 "user_id": session.user_id,
                 "mode": session.mode.value,
                 "language_pair": session.language_pair,
-                "started_at": session.started_at.isoformat() if session.started_at else None,
+                "started_at": session.started_at,
                 "config": session.config,
             }
             for session in snapshot["active_sessions"]
@@ -184,8 +190,8 @@ async def live_monitor_api(
                 "mode": session.mode.value,
                 "language_pair": session.language_pair,
                 "score": session.score,
-                "started_at": session.started_at.isoformat() if session.started_at else None,
-                "completed_at": session.completed_at.isoformat() if session.completed_at else None,
+                "started_at": session.started_at,
+                "completed_at": session.completed_at,
             }
             for session in snapshot["recent_sessions"]
         ],
@@ -200,7 +206,7 @@ async def live_monitor_api(
                 "expected": item.expected,
                 "correct": item.correct,
                 "multiplier_applied": item.multiplier_applied,
-                "timestamp": item.timestamp.isoformat() if item.timestamp else None,
+                "timestamp": item.timestamp,
             }
             for item in snapshot["recent_items"]
         ],
@@ -214,7 +220,7 @@ async def live_monitor_api(
                 "times_seen": row.times_seen,
                 "times_correct": row.times_correct,
                 "streak": row.streak,
-                "last_seen": row.last_seen.isoformat() if row.last_seen else None,
+                "last_seen": row.last_seen,
             }
             for row in snapshot["hottest_progress"]
         ],
@@ -224,13 +230,13 @@ async def live_monitor_api(
                 "user_id": message.user_id,
                 "role": message.role.value,
                 "content": message.content,
-                "created_at": message.created_at.isoformat() if message.created_at else None,
+                "created_at": message.created_at,
             }
             for message in snapshot["recent_messages"]
         ],
         "viewer": user.username if user is not None else "open-admin",
     }
-    return JSONResponse(payload)
+    return with_etag(JSONResponse(payload), etag)
 
 
 @router.get("/users")
@@ -1,13 +1,11 @@
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
-from datetime import datetime
-import json
+from datetime import date
 import re
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,6 +13,7 @@ from app.core.config import settings
 from app.core.csrf import get_or_create_csrf_token, validate_csrf
 from app.core.languages import LANGUAGE_DEFINITIONS, format_direction_label
 from app.core.rate_limit import limiter
+from app.core.responses import DEFAULT_RESPONSE_CLASS, JSONResponse
 from app.core.security import (
     SESSION_USER_KEY,
     attach_profile_if_missing,
@@ -24,9 +23,10 @@ from app.core.security import (
     require_auth_context,
     verify_password,
 )
-from app.db.models import ChatMessage, ChatRole, Language, TrainingMode, User, UserProfile, VerbConjugation
+from app.db.models import ChatMessage, Language, TrainingMode, User, UserPreference, UserProfile, VerbConjugation
 from app.db.session import get_db
 from app.routers.admin import _monitor_snapshot
+from app.routers.common import not_modified, with_etag
 from app.schemas.spa import (
     AdminConjugationRowPayload,
     AdminVerbRowPayload,
@@ -61,17 +61,17 @@ from app.services.admin_content import (
 )
 from app.services import onboarding as onboarding_service
 from app.services.ai_usage import ai_usage_report
-from app.services.chat_service import stream_chat_response
+from app.services.chat_service import chat_event_stream, prepare_chat_turn
 from app.services.conjugation_engine import accepted_conjugation_forms
 from app.services.dashboard_service import dashboard_snapshot, recent_chat_messages, summarize_progress
 from app.services.gamification import (
     add_circle_friend,
-    ensure_gamification_catalog,
     ensure_user_preference,
     gamification_snapshot,
     remove_circle_friend,
     set_sound_enabled,
 )
+from app.services.ocr_service import ocr_pool_stats
 from app.services.training_service import (
     ITEM_TYPE_BY_MODE,
     close_active_sessions,
@@ -92,14 +92,10 @@ from app.services.training_service import (
     translation_study_pool,
     translation_hint_for_session,
 )
+from app.services.state_version import state_versions
+from app.services.tutor_context import learner_weak_items, tutor_contexts
 
-router = APIRouter(prefix="/api", tags=["api"])
-
-
-def _iso(value: Any) -> str | None:
-    if isinstance(value, datetime):
-        return value.isoformat()
-    return None
+router = APIRouter(prefix="/api", tags=["api"], default_response_class=DEFAULT_RESPONSE_CLASS)
 
 
 def _sanitize_chat_text(raw: str) -> str:
@@ -134,6 +130,32 @@ async def _ensure_app_preferences(
     return preference.sound_enabled, preference.show_shortcuts, state
 
 
+async def _read_app_state(
+    db: AsyncSession, user: User | None
+) -> tuple[UserProfile | None, bool, bool, dict[str, Any]]:
+    """Profile, preferences and onboarding for the boot payload, without writes.
+
+    Registration creates both rows; an older account missing one gets defaults
+    here, and the rows are created by the next writing request.
+    """
+    if user is None:
+        return None, False, True, onboarding_service.empty_state()
+    row = (
+        await db.execute(
+            select(UserProfile, UserPreference)
+            .select_from(User)
+            .outerjoin(UserProfile, UserProfile.user_id == User.id)
+            .outerjoin(UserPreference, UserPreference.user_id == User.id)
+            .where(User.id == user.id)
+        )
+    ).one()
+    profile, preference = row
+    state = await onboarding_service.load_state(db, user_id=user.id, preference=preference, persist=False)
+    if preference is None:
+        return profile, False, True, state
+    return profile, preference.sound_enabled, preference.show_shortcuts, state
+
+
 def _profile_payload(profile: UserProfile | None) -> dict[str, Any] | None:
     if profile is None:
         return None
@@ -205,8 +227,8 @@ def _serialize_recent_session(session) -> dict[str, Any]:
         "mode": session.mode.value,
         "language_pair": session.language_pair,
         "score": session.score,
-        "started_at": _iso(session.started_at),
-        "completed_at": _iso(session.completed_at),
+        "started_at": session.started_at,
+        "completed_at": session.completed_at,
     }
 
 
@@ -215,7 +237,7 @@ def _serialize_chat_message(message: ChatMessage) -> dict[str, Any]:
         "id": message.id,
         "role": message.role.value,
         "content": message.content,
-        "created_at": _iso(message.created_at),
+        "created_at": message.created_at,
     }
 
 
@@ -226,13 +248,7 @@ def _serialize_dashboard_snapshot(snapshot: dict[str, Any]) -> dict[str, Any]:
         "completed_sessions": snapshot["completed_sessions"],
         "today_sessions": snapshot["today_sessions"],
         "recent_sessions": [_serialize_recent_session(session) for session in snapshot["recent_sessions"]],
-        "active_sessions": [
-            {
-                **session,
-                "started_at": _iso(session.get("started_at")),
-            }
-            for session in snapshot["active_sessions"]
-        ],
+        "active_sessions": snapshot["active_sessions"],
         "mode_counts": snapshot["mode_counts"],
         "recent_messages": [_serialize_chat_message(message) for message in snapshot["recent_messages"]],
     }
@@ -589,42 +605,52 @@ async def _conjugation_state(
 
 async def _chat_state(db: AsyncSession, *, user_id: int) -> dict[str, Any]:
     messages = await recent_chat_messages(db, user_id=user_id, limit=18)
-    weak_items = await summarize_progress(db, user_id=user_id, focus_limit=5)
+    focus_items = [item.focus_item() for item in await learner_weak_items(db, user_id=user_id, limit=5)]
     suggestions = [
         "Quiz me on the words I miss most often.",
         "Give me a short French-to-Spanish verb drill.",
         "Create a conjugation challenge using my weakest tense.",
     ]
-    if weak_items["focus_items"]:
-        suggestions[0] = f"Quiz me on {weak_items['focus_items'][0]['label']} and similar words."
+    if focus_items:
+        suggestions[0] = f"Quiz me on {focus_items[0]['label']} and similar words."
     return {
         "messages": [_serialize_chat_message(message) for message in messages],
-        "focus_items": weak_items["focus_items"],
+        "focus_items": focus_items,
         "suggestions": suggestions,
         "api_enabled": bool(settings.openai_api_key),
     }
 
 
+async def bootstrap_state(request: Request, db: AsyncSession, user: User | None) -> dict[str, Any]:
+    """The SPA boot payload; ``/app`` embeds it in the shell as well.
+
+    Read-only: the gamification catalog is provisioned at startup and the
+    profile and preference rows at registration, so opening the app writes
+    nothing.
+    """
+    profile, sound_enabled, show_shortcuts, onboarding_state = await _read_app_state(db, user)
+    return _bootstrap_payload(
+        request,
+        user,
+        profile,
+        sound_enabled=sound_enabled,
+        show_shortcuts=show_shortcuts,
+        onboarding=onboarding_state,
+    )
+
+
 @router.get("/bootstrap")
 async def bootstrap(
     request: Request,
     db: AsyncSession = Depends(get_db),
     user: User | None = Depends(get_current_user),
 ):
-    await ensure_gamification_catalog(db)
-    profile = await _ensure_profile(db, user)
-    sound_enabled, show_shortcuts, onboarding_state = await _ensure_app_preferences(db, user)
-    await db.commit()
-    return JSONResponse(
-        _bootstrap_payload(
-            request,
-            user,
-            profile,
-            sound_enabled=sound_enabled,
-            show_shortcuts=show_shortcuts,
-            onboarding=onboarding_state,
-        )
-    )
+    # The payload echoes the session's CSRF token, so it is part of the tag.
+    csrf_token = get_or_create_csrf_token(request)
+    etag = state_versions.etag("bootstrap", user.id if user else None, csrf_token)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    return with_etag(JSONResponse(await bootstrap_state(request, db, user)), etag)
 
 
 @router.post("/auth/login")
@@ -642,7 +668,6 @@ async def login(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     request.session[SESSION_USER_KEY] = user.id
-    await ensure_gamification_catalog(db)
     profile = await _ensure_profile(db, user)
     sound_enabled, show_shortcuts, onboarding_state = await _ensure_app_preferences(db, user)
     await db.commit()
@@ -681,8 +706,8 @@ async def register(
     await db.flush()
     profile = UserProfile(user_id=user.id, xp=0, level=1, streak_days=0, theme_preference="arcade")
     db.add(profile)
-    await ensure_gamification_catalog(db)
-    await ensure_user_preference(db, user.id)
+    # Seeded here so bootstrap can stay read-only for this account.
+    db.add(UserPreference(user_id=user.id, sound_enabled=False, onboarding=onboarding_service.empty_state()))
     await db.commit()
 
     request.session[SESSION_USER_KEY] = user.id
@@ -734,15 +759,20 @@ async def update_sound_preference(
 
 @router.get("/dashboard")
 async def dashboard(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     auth=Depends(require_auth_context),
 ):
-    await ensure_gamification_catalog(db)
+    # Tagged with the versions read before building, so a write racing the
+    # build only costs the next poll a full response.
+    etag = state_versions.etag("dashboard", auth.user.id, social=True)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
     preference = await ensure_user_preference(db, auth.user.id)
     snapshot = await dashboard_snapshot(db, user_id=auth.user.id)
     gamification = await gamification_snapshot(db, user=auth.user, profile=auth.profile)
     await db.commit()
-    return JSONResponse(
+    response = JSONResponse(
         {
             "user": _user_payload(auth.user, auth.profile),
             "theme": auth.profile.theme_preference,
@@ -754,22 +784,33 @@ async def dashboard(
             **_serialize_dashboard_snapshot(snapshot),
         }
     )
+    return with_etag(response, etag)
 
 
 @router.get("/training/words")
 async def words_state(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     auth=Depends(require_auth_context),
 ):
-    return JSONResponse(await _translation_state(db, user_id=auth.user.id, mode=TrainingMode.WORD_TRANSLATION))
+    etag = state_versions.etag("training:words", auth.user.id)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    state = await _translation_state(db, user_id=auth.user.id, mode=TrainingMode.WORD_TRANSLATION)
+    return with_etag(JSONResponse(state), etag)
 
 
 @router.get("/training/verbs")
 async def verbs_state(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     auth=Depends(require_auth_context),
 ):
-    return JSONResponse(await _translation_state(db, user_id=auth.user.id, mode=TrainingMode.VERB_TRANSLATION))
+    etag = state_versions.etag("training:verbs", auth.user.id)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    state = await _translation_state(db, user_id=auth.user.id, mode=TrainingMode.VERB_TRANSLATION)
+    return with_etag(JSONResponse(state), etag)
 
 
 @router.get("/training/study-pool")
@@ -1237,38 +1278,31 @@ async def chat_stream(
     if not content:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Message is required")
 
-    db.add(ChatMessage(user_id=auth.user.id, role=ChatRole.USER, content=content))
-    await db.flush()
-
-    async def event_stream() -> AsyncIterator[str]:
-        chunks: list[str] = []
-        try:
-            async for chunk in stream_chat_response(db=db, user_id=auth.user.id, user_message=content):
-                chunks.append(chunk)
-                yield f"data: {json.dumps({'chunk': chunk})}\n\n"
-        except Exception:
-            fallback = "The tutor stream failed. Please try again."
-            chunks.append(fallback)
-            yield f"data: {json.dumps({'chunk': fallback})}\n\n"
-
-        full_response = "".join(chunks)
-        db.add(ChatMessage(user_id=auth.user.id, role=ChatRole.ASSISTANT, content=full_response))
-        await db.commit()
-        yield "event: done\ndata: [DONE]\n\n"
+    turn = await prepare_chat_turn(db, user_id=auth.user.id, user_message=content)
+    await db.commit()
+    # Hand the connection back before streaming; the reply is written on a
+    # fresh short-lived session in finish_chat_turn.
+    await db.close()
 
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+    return StreamingResponse(
+        chat_event_stream(turn, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+    )
 
 
 @router.get("/community")
 async def community_state(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     auth=Depends(require_auth_context),
 ):
-    await ensure_gamification_catalog(db)
+    etag = state_versions.etag("community", auth.user.id, social=True)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
     await ensure_user_preference(db, auth.user.id)
     snapshot = await gamification_snapshot(db, user=auth.user, profile=auth.profile)
     await db.commit()
-    return JSONResponse(snapshot)
+    return with_etag(JSONResponse(snapshot), etag)
 
 
 @router.post("/community/friends")
@@ -1312,13 +1346,17 @@ async def admin_content_summary(
 @router.get("/admin/ai/usage")
 async def admin_ai_usage(
     limit: int = 50,
+    start: date | None = None,
+    end: date | None = None,
     db: AsyncSession = Depends(get_db),
     auth=Depends(require_admin_context),
 ):
+    if start is not None and end is not None and start > end:
+        raise _http_400("start must be on or before end")
     return JSONResponse(
         {
             "viewer": auth.user.username,
-            **await ai_usage_report(db, limit=max(1, min(limit, 200))),
+            **await ai_usage_report(db, limit=max(1, min(limit, 200)), start=start, end=end),
         }
     )
 
@@ -1521,6 +1559,8 @@ async def admin_monitor(
         {
             "viewer": auth.user.username,
             "totals": snapshot["totals"],
+            "ocr": ocr_pool_stats(),
+            "tutor_context": tutor_contexts.stats(),
             "users": snapshot["users"],
             "active_sessions": [
                 {
@@ -1528,7 +1568,7 @@ async def admin_monitor(
                     "user_id": session.user_id,
                     "mode": session.mode.value,
                     "language_pair": session.language_pair,
-                    "started_at": _iso(session.started_at),
+                    "started_at": session.started_at,
                     "config": session.config,
                 }
                 for session in snapshot["active_sessions"]
@@ -1540,8 +1580,8 @@ async def admin_monitor(
                     "mode": session.mode.value,
                     "language_pair": session.language_pair,
                     "score": session.score,
-                    "started_at": _iso(session.started_at),
-                    "completed_at": _iso(session.completed_at),
+                    "started_at": session.started_at,
+                    "completed_at": session.completed_at,
                 }
                 for session in snapshot["recent_sessions"]
             ],
@@ -1556,7 +1596,7 @@ async def admin_monitor(
                     "expected": item.expected,
                     "correct": item.correct,
                     "multiplier_applied": item.multiplier_applied,
-                    "timestamp": _iso(item.timestamp),
+                    "timestamp": item.timestamp,
                     "meta": item.meta,
                 }
                 for item in snapshot["recent_items"]
@@ -1571,7 +1611,7 @@ async def admin_monitor(
                     "times_seen": row.times_seen,
                     "times_correct": row.times_correct,
                     "streak": row.streak,
-                    "last_seen": _iso(row.last_seen),
+                    "last_seen": row.last_seen,
                 }
                 for row in snapshot["hottest_progress"]
             ],
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
-import json
 import re
 
 from fastapi import APIRouter, Depends, Form, Request
@@ -12,11 +10,11 @@ from app.core.config import settings
 from app.core.csrf import validate_csrf
 from app.core.rate_limit import limiter
 from app.core.security import require_auth_context
-from app.db.models import ChatMessage, ChatRole
 from app.db.session import get_db
 from app.routers.common import render_template
-from app.services.dashboard_service import recent_chat_messages, summarize_progress
-from app.services.chat_service import stream_chat_response
+from app.services.dashboard_service import recent_chat_messages
+from app.services.chat_service import chat_event_stream, prepare_chat_turn
+from app.services.tutor_context import learner_weak_items
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -31,21 +29,21 @@ def _sanitize_chat_text(raw: str) -> str:
 async def chat_page(request: Request, db: AsyncSession = Depends(get_db), auth=Depends(require_auth_context)):
     request.state.user = auth.user
     messages = await recent_chat_messages(db, user_id=auth.user.id, limit=18)
-    weak_items = await summarize_progress(db, user_id=auth.user.id, focus_limit=5)
+    focus_items = [item.focus_item() for item in await learner_weak_items(db, user_id=auth.user.id, limit=5)]
     suggestions = [
         "Quiz me on the words I miss most often.",
         "Give me a short French-to-Spanish verb drill.",
         "Create a conjugation challenge using my weakest tense.",
     ]
-    if weak_items["focus_items"]:
-        suggestions[0] = f"Quiz me on {weak_items['focus_items'][0]['label']} and similar words."
+    if focus_items:
+        suggestions[0] = f"Quiz me on {focus_items[0]['label']} and similar words."
     return render_template(
         request,
         "chat/chat.html",
         {
             "profile": auth.profile,
             "messages": messages,
-            "focus_items": weak_items["focus_items"],
+            "focus_items": focus_items,
             "suggestions": suggestions,
             "api_enabled": bool(settings.openai_api_key),
         },
@@ -68,25 +66,13 @@ async def stream_chat(
     if not content:
         return RedirectResponse(url="/chat", status_code=303)
 
-    user_message = ChatMessage(user_id=auth.user.id, role=ChatRole.USER, content=content)
-    db.add(user_message)
-    await db.flush()
+    turn = await prepare_chat_turn(db, user_id=auth.user.id, user_message=content)
+    await db.commit()
+    # Hand the connection back before streaming; the reply is written on a
+    # fresh short-lived session in finish_chat_turn.
+    await db.close()
 
-    async def event_stream() -> AsyncIterator[str]:
-        chunks: list[str] = []
-        try:
-            async for chunk in stream_chat_response(db=db, user_id=auth.user.id, user_message=content):
-                chunks.append(chunk)
-                payload = json.dumps({"chunk": chunk})
-                yield f"data: {payload}\n\n"
-        except Exception:
-            fallback = "The tutor stream failed. Please try again."
-            chunks.append(fallback)
-            yield f"data: {json.dumps({'chunk': fallback})}\n\n"
-
-        full_response = "".join(chunks)
-        db.add(ChatMessage(user_id=auth.user.id, role=ChatRole.ASSISTANT, content=full_response))
-        await db.commit()
-        yield "event: done\ndata: [DONE]\n\n"
-
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+    return StreamingResponse(
+        chat_event_stream(turn, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+    )
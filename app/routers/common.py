@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-from fastapi import Request
+from fastapi import Request, Response, status
 from fastapi.templating import Jinja2Templates
 
 from app.core.config import settings
@@ -29,3 +29,27 @@ def render_template(request: Request, name: str, context: dict[str, Any]):
         "current_user": current_user,
     }
     return templates.TemplateResponse(request, name, {**base_context, **context})
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """A 304 for ``etag`` when ``If-None-Match`` already holds it (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    wanted = _opaque_tag(etag)
+    if header.strip() != "*" and wanted not in {_opaque_tag(tag) for tag in header.split(",")}:
+        return None
+    return with_etag(Response(status_code=status.HTTP_304_NOT_MODIFIED), etag)
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    # no-cache: the browser keeps the body but revalidates on every poll.
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Vary"] = "Cookie"
+    return response
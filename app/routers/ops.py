@@ -3,13 +3,13 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
 from app.core.config import settings
+from app.core.responses import DEFAULT_RESPONSE_CLASS, JSONResponse
 from app.db.session import AsyncSessionLocal
 
-router = APIRouter(tags=["ops"])
+router = APIRouter(tags=["ops"], default_response_class=DEFAULT_RESPONSE_CLASS)
 
 
 @router.get("/healthz")
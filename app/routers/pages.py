@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Form, Request
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import RedirectResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.csrf import validate_csrf
+from app.core.responses import JSONResponse
 from app.core.security import get_current_user
 from app.db.models import User, UserProfile
 from app.db.session import get_db
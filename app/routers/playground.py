@@ -7,12 +7,13 @@ from fastapi import APIRouter, HTTPException, Request, status
 
 from app.core.csrf import validate_csrf
 from app.core.rate_limit import limiter
+from app.core.responses import DEFAULT_RESPONSE_CLASS
 from app.schemas.playground import SemanticGradePayload, SemanticGradeResponse
 from app.services.playground_challenges import get_playground_challenge
 from app.services.semantic_grading import grade_semantic_answer
 
 
-router = APIRouter(prefix="/api/playground", tags=["playground"])
+router = APIRouter(prefix="/api/playground", tags=["playground"], default_response_class=DEFAULT_RESPONSE_CLASS)
 _INFERENCE_SLOT = asyncio.Semaphore(1)
 _QUEUE_TIMEOUT_SECONDS = 1.5
 
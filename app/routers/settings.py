@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.csrf import validate_csrf
+from app.core.responses import DEFAULT_RESPONSE_CLASS
 from app.core.security import AuthContext, require_auth_context
 from app.db.models import Language, TrainingMode, UserPreference
 from app.db.session import get_db
@@ -16,7 +17,7 @@ from app.services.gamification import ensure_user_preference
 from app.services.training_service import close_active_sessions
 from app.services.tutorial import ensure_tutorial_words, tutorial_script
 
-router = APIRouter(prefix="/api", tags=["settings"])
+router = APIRouter(prefix="/api", tags=["settings"], default_response_class=DEFAULT_RESPONSE_CLASS)
 
 
 VALID_DISPLAY_MODES = {"mother_full", "partial", "learning_full"}
@@ -1,25 +1,49 @@
 from __future__ import annotations
 
+import html
 import json
+import time
 from pathlib import Path
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request, Response
+from markupsafe import Markup
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.routers.common import render_template
+from app.core.csrf import get_or_create_csrf_token
+from app.core.responses import dumps
+from app.core.security import get_current_user
+from app.db.models import User
+from app.db.session import get_db
+from app.routers.api import bootstrap_state
+from app.routers.common import templates
 
 router = APIRouter(tags=["spa"])
 
 SPA_DIR = Path(__file__).resolve().parent.parent.parent / "frontend" / "static" / "spa"
 MANIFEST_PATH = SPA_DIR / ".vite" / "manifest.json"
+# Deploys replace the manifest; checking it at most this often keeps a stat()
+# off every navigation while still picking up dev rebuilds within seconds.
+MANIFEST_CHECK_SECONDS = 2.0
+
+SHELL_TEMPLATE = "spa_shell.html"
+SHELL_SLOTS = ("theme", "csrf_token", "csrf_token_json", "theme_json", "spa_path_json", "bootstrap_json")
 
 # Vite emits content-hashed filenames (app-<hash>.js) so deploys are never
 # served stale from a cache; the manifest tells us the current names. Cached
 # per manifest mtime so dev rebuilds are picked up without a server restart.
 _manifest_cache: tuple[float, str, str | None] | None = None
+_manifest_checked_at = float("-inf")
+# (js, css) -> shell split into literal chunks and slot names, alternating.
+_shell_cache: tuple[tuple[str, str | None], list[str]] | None = None
 
 
 def _spa_assets() -> tuple[str, str | None]:
-    global _manifest_cache
+    global _manifest_cache, _manifest_checked_at
+    now = time.monotonic()
+    if _manifest_cache and now - _manifest_checked_at < MANIFEST_CHECK_SECONDS:
+        return _manifest_cache[1], _manifest_cache[2]
+    _manifest_checked_at = now
+
     try:
         mtime = MANIFEST_PATH.stat().st_mtime
     except OSError:
@@ -40,20 +64,46 @@ def _spa_assets() -> tuple[str, str | None]:
     return js, css
 
 
+def _shell_parts(assets: tuple[str, str | None]) -> list[str]:
+    """The shell rendered once per bundle, split around its per-request slots."""
+    global _shell_cache
+    if _shell_cache is not None and _shell_cache[0] == assets:
+        return _shell_cache[1]
+    spa_js, spa_css = assets
+    slots = {name: Markup(f"\x00{name}\x00") for name in SHELL_SLOTS}
+    rendered = templates.get_template(SHELL_TEMPLATE).render(spa_js=spa_js, spa_css=spa_css, **slots)
+    parts = rendered.split("\x00")
+    _shell_cache = (assets, parts)
+    return parts
+
+
+def _script_json(value: object) -> str:
+    # Safe inside <script>: no "</script>" or "<!--" can be formed.
+    return dumps(value).decode().replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+
+
 @router.get("/app")
 @router.get("/app/{path:path}")
-async def spa_shell(request: Request, path: str = ""):
-    spa_js, spa_css = _spa_assets()
-    response = render_template(
-        request,
-        "spa_shell.html",
-        {
-            "spa_path": path,
-            "spa_js": spa_js,
-            "spa_css": spa_css,
-        },
-    )
+async def spa_shell(
+    request: Request,
+    path: str = "",
+    db: AsyncSession = Depends(get_db),
+    user: User | None = Depends(get_current_user),
+):
+    # Embedding the boot payload saves the SPA its /api/bootstrap round trip
+    # before first paint.
+    boot = await bootstrap_state(request, db, user)
+    csrf_token = get_or_create_csrf_token(request)
+    values = {
+        "theme": html.escape(boot["theme"]),
+        "csrf_token": html.escape(csrf_token),
+        "csrf_token_json": _script_json(csrf_token),
+        "theme_json": _script_json(boot["theme"]),
+        "spa_path_json": _script_json(path),
+        "bootstrap_json": _script_json(boot),
+    }
+    parts = _shell_parts(_spa_assets())
+    body = "".join(values[part] if index % 2 else part for index, part in enumerate(parts))
     # The shell must always be revalidated — it is what points browsers at the
     # current hashed bundle after a deploy.
-    response.headers["Cache-Control"] = "no-cache"
-    return response
+    return Response(body, media_type="text/html", headers={"Cache-Control": "no-cache"})
@@ -4,11 +4,12 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.responses import DEFAULT_RESPONSE_CLASS
 from app.core.security import AuthContext, require_auth_context
 from app.db.models import Tag
 from app.db.session import get_db
 
-router = APIRouter(prefix="/api/tags", tags=["tags"])
+router = APIRouter(prefix="/api/tags", tags=["tags"], default_response_class=DEFAULT_RESPONSE_CLASS)
 
 
 @router.get("")
@@ -6,12 +6,13 @@ from sqlalchemy import and_, delete, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.csrf import validate_csrf
+from app.core.responses import DEFAULT_RESPONSE_CLASS
 from app.core.security import AuthContext, require_auth_context
 from app.db.models import Tag, Word, WordSet, WordSetMember, WordTag
 from app.db.session import get_db
 from app.schemas.spa import CsrfPayload
 
-router = APIRouter(prefix="/api/word-sets", tags=["word-sets"])
+router = APIRouter(prefix="/api/word-sets", tags=["word-sets"], default_response_class=DEFAULT_RESPONSE_CLASS)
 
 
 class WordSetCreatePayload(CsrfPayload):
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import json
+import logging
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import FormData, UploadFile as StarletteUploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
 from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.csrf import validate_csrf
 from app.core.rate_limit import limiter
+from app.core.responses import DEFAULT_RESPONSE_CLASS, JSONResponse
 from app.core.security import AuthContext, require_auth_context
 from app.db.models import (
     Language,
@@ -28,6 +35,7 @@ from app.db.session import get_db
 from app.schemas.spa import (
     AddWordOfflinePayload,
     AddWordPayload,
+    AddWordsBulkPayload,
     DeleteUserWordPayload,
     ExpandWordPayload,
     OcrExtractResponse,
@@ -39,20 +47,28 @@ from app.services.onboarding import mark_feature_complete as mark_onboarding_fea
 from app.services.ocr_service import (
     MAX_UPLOAD_BYTES,
     OCR_LANG_BY_CODE,
+    OcrBusyError,
     OcrError,
     OcrUnavailableError,
     extract_text,
+    ocr_pool_stats,
 )
+from app.services.tutor_context import tutor_contexts
 from app.services.word_ai_service import (
+    BulkWordInput,
     DefinitionPresentation,
+    TranslatedWord,
     WordAIError,
     expand_word,
     present_definitions,
     translate_selected_sense,
     translate_word,
+    translate_words_bulk,
 )
 
-router = APIRouter(prefix="/api/words", tags=["words"])
+LOGGER = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/words", tags=["words"], default_response_class=DEFAULT_RESPONSE_CLASS)
 
 
 def _is_monolingual_pair(language_pair: str) -> bool:
@@ -168,80 +184,51 @@ async def _require_lang_prefs(
     return learning, mother
 
 
-@router.post("/add")
-async def add_word(
-    request: Request,
-    payload: AddWordPayload,
-    auth: AuthContext = Depends(require_auth_context),
-    db: AsyncSession = Depends(get_db),
-):
-    validate_csrf(request, payload.csrf_token)
-    preference = await ensure_user_preference(db, auth.user.id)
-
+async def _lookup_languages(
+    db: AsyncSession,
+    preference: UserPreference,
+    *,
+    learning_code: str | None,
+    mother_code: str | None,
+) -> tuple[Language, Language]:
     # An explicit pair in the payload stands on its own; settings prefs are only
     # a fallback when a code is missing.
-    if payload.learning_lang_code and payload.mother_lang_code:
-        learning = await _lang_by_code(db, payload.learning_lang_code)
-        mother = await _lang_by_code(db, payload.mother_lang_code)
-    else:
-        learning, mother = await _require_lang_prefs(db, preference)
-        if payload.learning_lang_code:
-            learning = await _lang_by_code(db, payload.learning_lang_code)
-        if payload.mother_lang_code:
-            mother = await _lang_by_code(db, payload.mother_lang_code)
-    monolingual = learning.id == mother.id
-    # "You get" is the complete output language. Selecting the same language
-    # twice therefore requests a monolingual definition; there is no separate
-    # definition-language mode to keep in sync.
-    definition_language = mother
+    if learning_code and mother_code:
+        return await _lang_by_code(db, learning_code), await _lang_by_code(db, mother_code)
+    learning, mother = await _require_lang_prefs(db, preference)
+    if learning_code:
+        learning = await _lang_by_code(db, learning_code)
+    if mother_code:
+        mother = await _lang_by_code(db, mother_code)
+    return learning, mother
 
-    try:
-        result = await translate_word(
-            db,
-            input_text=payload.input_text,
-            learning_lang=learning,
-            mother_tongue=mother,
-            context=payload.context,
-            question=payload.question,
-            user_id=auth.user.id,
-        )
-        definition = (
-            await present_definitions(
-                db,
-                result=result,
-                learning_lang=learning,
-                definition_language=definition_language,
-                user_id=auth.user.id,
-            )
-            if result.status != "not_found"
-            else None
-        )
-    except WordAIError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-
-    if result.status == "not_found":
-        await db.commit()
-        return {
-            "status": "not_found",
-            "suggestions": result.suggestions or [],
-            "original_input": payload.input_text,
-            "learning_language_code": learning.code,
-            "mother_tongue_code": mother.code,
-        }
 
+async def _record_word_lookup(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    preference: UserPreference,
+    result: TranslatedWord,
+    definition: DefinitionPresentation,
+    learning: Language,
+    mother: Language,
+    input_text: str,
+    cleaned_context: str | None,
+    cleaned_question: str | None,
+    context_source: str,
+) -> dict:
+    """Add a resolved lookup to the learner's words and private history."""
     assert result.word is not None and result.lexical is not None and result.natives is not None
-    assert definition is not None
+    monolingual = learning.id == mother.id
     serialized_result = _serialize_translated_result(
         result, mother.code, definition, monolingual=monolingual
     )
 
     language_pair = f"{learning.code.lower()}_{mother.code.lower()}"
-    cleaned_context = (payload.context or "").strip() or None
-    cleaned_question = (payload.question or "").strip() or None
 
     existing_added = await db.execute(
         select(UserAddedWord).where(
-            UserAddedWord.user_id == auth.user.id,
+            UserAddedWord.user_id == user_id,
             UserAddedWord.word_id == result.word.id,
             UserAddedWord.language_pair == language_pair,
         )
@@ -249,7 +236,7 @@ async def add_word(
     added = existing_added.scalar_one_or_none()
     if added is None:
         added = UserAddedWord(
-            user_id=auth.user.id,
+            user_id=user_id,
             word_id=result.word.id,
             language_pair=language_pair,
             context_hint=cleaned_context,
@@ -257,7 +244,7 @@ async def add_word(
         )
         db.add(added)
         await db.flush()
-        await mark_onboarding_feature(db, user_id=auth.user.id, feature="add-word")
+        await mark_onboarding_feature(db, user_id=user_id, feature="add-word")
     else:
         added.context_hint = cleaned_context
         added.selected_sense_id = result.selected_sense_id
@@ -267,7 +254,7 @@ async def add_word(
     await db.flush()
 
     private_lookup = UserWordLookup(
-        user_id=auth.user.id,
+        user_id=user_id,
         word_id=result.word.id,
         selected_sense_id=result.selected_sense_id,
         source_language_id=learning.id,
@@ -275,7 +262,7 @@ async def add_word(
         context=cleaned_context,
         question=cleaned_question,
         answer=result.question_answer,
-        context_source=payload.context_source,
+        context_source=context_source,
         result_data=serialized_result,
         ranking_method=result.ranking_method,
         ranking_score=result.ranking_score,
@@ -287,7 +274,7 @@ async def add_word(
     if preference.force_unlock_added_words and not monolingual:
         existing_progress = await db.execute(
             select(UserProgress).where(
-                UserProgress.user_id == auth.user.id,
+                UserProgress.user_id == user_id,
                 UserProgress.item_type == ProgressItemType.WORD,
                 UserProgress.item_id == result.word.id,
                 UserProgress.language_pair == language_pair,
@@ -297,7 +284,7 @@ async def add_word(
         if progress is None:
             db.add(
                 UserProgress(
-                    user_id=auth.user.id,
+                    user_id=user_id,
                     item_type=ProgressItemType.WORD,
                     item_id=result.word.id,
                     language_pair=language_pair,
@@ -308,11 +295,9 @@ async def add_word(
             )
             force_unlocked = True
 
-    await db.commit()
-
     return {
         "status": result.status,
-        "original_input": result.original_input or payload.input_text,
+        "original_input": result.original_input or input_text,
         "detected_input_language": result.detected_input_language,
         "word_id": result.word.id,
         "text": result.word.text,
@@ -327,6 +312,187 @@ async def add_word(
     }
 
 
+@router.post("/add")
+async def add_word(
+    request: Request,
+    payload: AddWordPayload,
+    auth: AuthContext = Depends(require_auth_context),
+    db: AsyncSession = Depends(get_db),
+):
+    validate_csrf(request, payload.csrf_token)
+    preference = await ensure_user_preference(db, auth.user.id)
+    learning, mother = await _lookup_languages(
+        db,
+        preference,
+        learning_code=payload.learning_lang_code,
+        mother_code=payload.mother_lang_code,
+    )
+    # "You get" is the complete output language. Selecting the same language
+    # twice therefore requests a monolingual definition; there is no separate
+    # definition-language mode to keep in sync.
+    definition_language = mother
+
+    try:
+        result = await translate_word(
+            db,
+            input_text=payload.input_text,
+            learning_lang=learning,
+            mother_tongue=mother,
+            context=payload.context,
+            question=payload.question,
+            user_id=auth.user.id,
+        )
+        definition = (
+            await present_definitions(
+                db,
+                result=result,
+                learning_lang=learning,
+                definition_language=definition_language,
+                user_id=auth.user.id,
+            )
+            if result.status != "not_found"
+            else None
+        )
+    except WordAIError as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+
+    if result.status == "not_found":
+        await db.commit()
+        return {
+            "status": "not_found",
+            "suggestions": result.suggestions or [],
+            "original_input": payload.input_text,
+            "learning_language_code": learning.code,
+            "mother_tongue_code": mother.code,
+        }
+
+    assert definition is not None
+    response = await _record_word_lookup(
+        db,
+        user_id=auth.user.id,
+        preference=preference,
+        result=result,
+        definition=definition,
+        learning=learning,
+        mother=mother,
+        input_text=payload.input_text,
+        cleaned_context=(payload.context or "").strip() or None,
+        cleaned_question=(payload.question or "").strip() or None,
+        context_source=payload.context_source,
+    )
+    await db.commit()
+    return response
+
+
+async def _reload(db: AsyncSession, *instances: object) -> None:
+    # A rolled-back savepoint expires what it touched, and an async session
+    # cannot lazy-load on attribute access.
+    for instance in instances:
+        await db.refresh(instance)
+
+
+@router.post("/add-bulk")
+@limiter.limit("10/minute")
+async def add_words_bulk(
+    request: Request,
+    payload: AddWordsBulkPayload,
+    auth: AuthContext = Depends(require_auth_context),
+    db: AsyncSession = Depends(get_db),
+):
+    """Add a word list (typically picked from OCR) in one request.
+
+    Streams one NDJSON line per input as it resolves: offline hits first,
+    then every AI-resolved word from a single batched request. Definitions
+    stay in the learning language; opening a word fetches the translated one.
+    """
+    validate_csrf(request, payload.csrf_token)
+    preference = await ensure_user_preference(db, auth.user.id)
+    learning, mother = await _lookup_languages(
+        db,
+        preference,
+        learning_code=payload.learning_lang_code,
+        mother_code=payload.mother_lang_code,
+    )
+    inputs = [
+        BulkWordInput(text=entry.text, context=entry.context)
+        for entry in payload.entries
+    ]
+
+    async def lines() -> AsyncIterator[str]:
+        added = failed = 0
+        error = None
+        try:
+            async for item in translate_words_bulk(
+                db,
+                inputs=inputs,
+                learning_lang=learning,
+                mother_tongue=mother,
+                user_id=auth.user.id,
+            ):
+                line: dict = {"index": item.index, "input_text": item.input_text}
+                try:
+                    async with db.begin_nested():
+                        if item.error is not None or item.result is None:
+                            line.update(status="error", detail=item.error)
+                        elif item.result.status == "not_found":
+                            line.update(
+                                status="not_found", suggestions=item.result.suggestions or []
+                            )
+                        else:
+                            definition = await present_definitions(
+                                db,
+                                result=item.result,
+                                learning_lang=learning,
+                                definition_language=learning,
+                            )
+                            line.update(
+                                await _record_word_lookup(
+                                    db,
+                                    user_id=auth.user.id,
+                                    preference=preference,
+                                    result=item.result,
+                                    definition=definition,
+                                    learning=learning,
+                                    mother=mother,
+                                    input_text=item.input_text,
+                                    cleaned_context=(inputs[item.index].context or "").strip()
+                                    or None,
+                                    cleaned_question=None,
+                                    context_source=payload.context_source,
+                                )
+                            )
+                except Exception:
+                    # One bad word must not end the stream: its savepoint is
+                    # rolled back and it is reported like any other failure.
+                    LOGGER.exception("Bulk add failed for item %d", item.index)
+                    await _reload(db, preference, learning, mother)
+                    line = {
+                        "index": item.index,
+                        "input_text": item.input_text,
+                        "status": "error",
+                        "detail": "Could not add this word.",
+                    }
+                await db.commit()
+                if line.get("status") in {"error", "not_found"}:
+                    failed += 1
+                else:
+                    added += 1
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+        except WordAIError as exc:
+            await db.commit()
+            error = str(exc)
+        except Exception:
+            LOGGER.exception("Bulk add stream failed")
+            await db.rollback()
+            error = "Bulk lookup failed."
+        summary = {"done": True, "added": added, "failed": failed}
+        if error is not None:
+            summary["error"] = error
+        yield json.dumps(summary) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/lookups/{lookup_id}/sense")
 async def select_word_sense(
     request: Request,
@@ -415,51 +581,129 @@ async def select_word_sense(
     return serialized_result
 
 
+@router.get("/ocr/queue")
+async def ocr_queue(auth: AuthContext = Depends(require_auth_context)):
+    stats = ocr_pool_stats()
+    return {key: stats[key] for key in ("workers", "busy", "waiting", "queue_limit")}
+
+
+# Multipart framing plus the csrf_token/lang_code fields on top of the image.
+_OCR_FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+def _upload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail="Image too large (max 8 MB).",
+    )
+
+
+class _UploadTooLarge(MultiPartException):
+    pass
+
+
+async def _limited_body(request: Request, limit: int) -> AsyncIterator[bytes]:
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > limit:
+            # A MultiPartException makes the parser close its spooled files.
+            raise _UploadTooLarge("Upload too large")
+        yield chunk
+
+
+async def _read_ocr_form(request: Request) -> FormData:
+    """Parse the upload with the body capped, spooling the image to a temp file.
+
+    Oversized bodies are refused from Content-Length before reading, or as soon
+    as the streamed byte count passes the cap (chunked or lying clients).
+    """
+    limit = MAX_UPLOAD_BYTES + _OCR_FORM_OVERHEAD_BYTES
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise _upload_too_large()
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload must be multipart/form-data.",
+        )
+    parser = MultiPartParser(
+        request.headers, _limited_body(request, limit), max_files=1, max_fields=4
+    )
+    try:
+        return await parser.parse()
+    except _UploadTooLarge as exc:
+        raise _upload_too_large() from exc
+    except MultiPartException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message) from exc
+
+
 @router.post("/ocr", response_model=OcrExtractResponse)
 @limiter.limit("10/minute")
 async def ocr_extract(
     request: Request,
-    image: UploadFile = File(...),
-    csrf_token: str = Form(...),
-    lang_code: str = Form(...),
+    response: Response,
     auth: AuthContext = Depends(require_auth_context),
 ):
-    validate_csrf(request, csrf_token)
-
-    lang_code = lang_code.lower()
-    if lang_code not in OCR_LANG_BY_CODE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported OCR language: {lang_code}",
-        )
-    if not (image.content_type or "").startswith("image/"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Upload must be an image.",
-        )
-    data = await image.read(MAX_UPLOAD_BYTES + 1)
-    if len(data) > MAX_UPLOAD_BYTES:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="Image too large (max 8 MB).",
-        )
-
+    # Parsed by hand rather than with File()/Form() so the body size is
+    # enforced while it streams and the image never sits in memory whole.
+    form = await _read_ocr_form(request)
     try:
-        result = await extract_text(data, lang_code)
-    except OcrUnavailableError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
-        ) from exc
-    except OcrError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
-        ) from exc
+        image = form.get("image")
+        csrf_token = form.get("csrf_token")
+        lang_code = form.get("lang_code")
+        validate_csrf(request, csrf_token if isinstance(csrf_token, str) else None)
+        if not isinstance(image, StarletteUploadFile) or not isinstance(lang_code, str):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="image and lang_code are required.",
+            )
 
+        lang_code = lang_code.lower()
+        if lang_code not in OCR_LANG_BY_CODE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported OCR language: {lang_code}",
+            )
+        if not (image.content_type or "").startswith("image/"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Upload must be an image.",
+            )
+        if (image.size or 0) > MAX_UPLOAD_BYTES:
+            raise _upload_too_large()
+
+        await image.seek(0)
+        try:
+            result = await extract_text(image.file, lang_code)
+        except OcrBusyError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(exc),
+                headers={"Retry-After": "5"},
+            ) from exc
+        except OcrUnavailableError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+            ) from exc
+        except OcrError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+            ) from exc
+    finally:
+        await form.close()
+
+    if result.timings_ms:
+        response.headers["Server-Timing"] = ", ".join(
+            f"ocr-{stage};dur={duration}" for stage, duration in result.timings_ms.items()
+        )
     return OcrExtractResponse(
         text=result.text,
         lines=result.lines,
         mean_confidence=result.mean_confidence,
         ocr_lang=lang_code,
+        queue_position=result.queue_position,
+        cached=result.cached,
         words=[
             {
                 "text": word.text,
@@ -493,7 +737,7 @@ async def word_history(
     )
     added_list = list(added_rows.scalars().all())
     if not added_list:
-        return {"entries": []}
+        return JSONResponse({"entries": []})
 
     word_ids = [a.word_id for a in added_list]
     words_lookup = await db.execute(select(Word).where(Word.id.in_(word_ids)))
@@ -671,7 +915,7 @@ async def word_history(
                 "language_pair": added.language_pair,
                 "learning_language_code": learning_code.upper(),
                 "mother_tongue_code": mother_code.upper(),
-                "added_at": added.added_at.isoformat() if added.added_at else None,
+                "added_at": added.added_at,
                 "lexical": serialized_lexical,
                 "definition_language_code": definition_language_code,
                 "display_definition": display_definition,
@@ -696,7 +940,9 @@ async def word_history(
                 "tags": tags_by_word.get(word.id, []),
             }
         )
-    return {"entries": entries}
+    # Returned as a response so this large payload skips jsonable_encoder;
+    # orjson renders it directly.
+    return JSONResponse({"entries": entries})
 
 
 async def _resolve_language_pair(
@@ -879,6 +1125,7 @@ async def delete_user_word(
         )
     )
     await db.commit()
+    tutor_contexts.forget(auth.user.id)
     return {"ok": True}
 
 
@@ -118,6 +118,20 @@ class AddWordPayload(CsrfPayload):
     mother_lang_code: str | None = Field(default=None, max_length=8)
 
 
+class BulkWordEntry(BaseModel):
+    text: str = Field(min_length=1, max_length=128)
+    context: str | None = Field(default=None, max_length=512)
+
+
+class AddWordsBulkPayload(CsrfPayload):
+    entries: list[BulkWordEntry] = Field(min_length=1, max_length=50)
+    context_source: str = Field(
+        default="manual", pattern=r"^(manual|photo)$"
+    )
+    learning_lang_code: str | None = Field(default=None, max_length=8)
+    mother_lang_code: str | None = Field(default=None, max_length=8)
+
+
 class SelectWordSensePayload(CsrfPayload):
     sense_id: int = Field(gt=0)
 
@@ -149,6 +163,8 @@ class OcrExtractResponse(BaseModel):
     mean_confidence: float | None = None
     ocr_lang: str
     words: list[OcrWordResult] = Field(default_factory=list)
+    queue_position: int = 0
+    cached: bool = False
 
 
 class DeleteUserWordPayload(CsrfPayload):
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import AIResponseCache
+from app.services.ai_usage import record_cache_hit
+
+# Expired/over-budget rows are pruned inline every N stores rather than by a
+# separate job; the delete is index-backed and cheap at this cadence.
+PRUNE_EVERY_STORES = 200
+_stores_since_prune = 0
+
+
+def prompt_fingerprint(model: str, system: str, user: str) -> str:
+    # Hashing the system prompt versions the key: any prompt edit (or new
+    # language pair wording) produces a new fingerprint automatically.
+    system_version = hashlib.sha256(system.encode("utf-8")).hexdigest()
+    material = json.dumps([model, system_version, user], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def get_cached_response(
+    db: AsyncSession, *, model: str, system: str, user: str
+) -> str | None:
+    if not settings.ai_cache_enabled:
+        return None
+    fingerprint = prompt_fingerprint(model, system, user)
+    content = await db.scalar(
+        select(AIResponseCache.content).where(
+            AIResponseCache.fingerprint == fingerprint,
+            AIResponseCache.expires_at > _now(),
+        )
+    )
+    if content is None:
+        return None
+    # Counted off the request transaction (batched by the usage buffer), so a
+    # popular row is never held locked until the request commits.
+    await record_cache_hit(db, fingerprint)
+    return content
+
+
+async def store_cached_response(
+    db: AsyncSession,
+    *,
+    feature: str,
+    model: str,
+    system: str,
+    user: str,
+    content: str,
+    cost_usd: float = 0.0,
+) -> None:
+    global _stores_since_prune
+    if not settings.ai_cache_enabled:
+        return
+    fingerprint = prompt_fingerprint(model, system, user)
+    expires_at = _now() + timedelta(hours=settings.ai_cache_ttl_hours)
+    existing = (
+        await db.execute(
+            select(AIResponseCache).where(AIResponseCache.fingerprint == fingerprint)
+        )
+    ).scalar_one_or_none()
+    if existing is not None:
+        # Only reachable once the old row expired: refresh it in place.
+        existing.content = content
+        existing.cost_usd = cost_usd
+        existing.hit_count = 0
+        existing.last_hit_at = None
+        existing.expires_at = expires_at
+    else:
+        try:
+            async with db.begin_nested():
+                db.add(
+                    AIResponseCache(
+                        fingerprint=fingerprint,
+                        feature=feature,
+                        model=model,
+                        content=content,
+                        cost_usd=cost_usd,
+                        expires_at=expires_at,
+                    )
+                )
+        except IntegrityError:
+            # A concurrent request stored the same response first.
+            pass
+
+    _stores_since_prune += 1
+    if _stores_since_prune >= PRUNE_EVERY_STORES:
+        _stores_since_prune = 0
+        await prune_ai_cache(db)
+
+
+async def prune_ai_cache(db: AsyncSession, *, max_entries: int | None = None) -> int:
+    """Drop expired rows, then the least recently used ones beyond the size cap."""
+    limit = settings.ai_cache_max_entries if max_entries is None else max_entries
+    removed = (
+        await db.execute(
+            delete(AIResponseCache).where(AIResponseCache.expires_at <= _now())
+        )
+    ).rowcount or 0
+    count = int(await db.scalar(select(func.count(AIResponseCache.id))) or 0)
+    if count > limit:
+        stale_ids = (
+            select(AIResponseCache.id)
+            .order_by(
+                func.coalesce(AIResponseCache.last_hit_at, AIResponseCache.created_at).asc(),
+                AIResponseCache.id.asc(),
+            )
+            .limit(count - limit)
+            .scalar_subquery()
+        )
+        removed += (
+            await db.execute(
+                delete(AIResponseCache).where(AIResponseCache.id.in_(stale_ids))
+            )
+        ).rowcount or 0
+    return removed
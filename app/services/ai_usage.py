@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import bindparam, desc, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import AIUsageLog, User
+from app.core.config import settings
+from app.db.models import AI_USAGE_ROLLUP_KEY, AIResponseCache, AIUsageLog, AIUsageRollup, User
+from app.db.session import AsyncSessionLocal
+
+LOGGER = logging.getLogger(__name__)
 
 
 # Prices are stored with each row so historical reports stay stable if rates change.
@@ -17,7 +28,12 @@ MODEL_TOKEN_PRICING_USD: dict[str, tuple[float, float]] = {
     "gpt-4o-mini": (0.15, 0.60),
     "gpt-5.6-luna": (0.20, 1.20),
 }
-TRANSLATION_FEATURES = {"word_translate", "word_native_translate"}
+TRANSLATION_FEATURES = {"word_translate", "word_native_translate", "word_translate_bulk"}
+# Responses served from ai_response_cache are logged with this status and zero
+# tokens, so hit rates are reportable without inflating call or cost totals.
+CACHE_HIT_STATUS = "cache_hit"
+ROLLUP_GRANULARITIES = ("hour", "day")
+ROLLUP_COUNTERS = ("calls", "cache_hits", "prompt_tokens", "completion_tokens", "total_tokens", "cost_usd")
 
 
 def _usage_int(usage: Any, attr: str) -> int:
@@ -45,6 +61,227 @@ def estimate_cost_usd(model: str, prompt_tokens: int, completion_tokens: int) ->
     return input_rate, output_rate, cost
 
 
+@dataclass(slots=True)
+class _UsageRecord:
+    user_id: int | None
+    feature: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    status: str
+    request_label: str | None
+    extra_data: dict[str, object]
+    created_at: datetime
+
+
+def _usage_values(record: _UsageRecord) -> dict[str, Any]:
+    input_rate, output_rate, cost_usd = estimate_cost_usd(
+        record.model, record.prompt_tokens, record.completion_tokens
+    )
+    return {
+        "user_id": record.user_id,
+        "feature": record.feature,
+        "model": record.model,
+        "prompt_tokens": record.prompt_tokens,
+        "completion_tokens": record.completion_tokens,
+        "total_tokens": record.total_tokens,
+        "input_cost_per_million": input_rate,
+        "output_cost_per_million": output_rate,
+        "cost_usd": cost_usd,
+        "status": record.status,
+        "request_label": record.request_label,
+        "extra_data": record.extra_data,
+        "created_at": record.created_at,
+    }
+
+
+def _bucket_start(moment: datetime, granularity: str) -> datetime:
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+async def _apply_rollups(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    totals: dict[tuple[str, datetime, str, str, int | None], list[float]] = {}
+    for values in rows:
+        is_hit = values["status"] == CACHE_HIT_STATUS
+        for granularity in ROLLUP_GRANULARITIES:
+            key = (
+                granularity,
+                _bucket_start(values["created_at"], granularity),
+                values["feature"],
+                values["model"],
+                values["user_id"],
+            )
+            bucket = totals.setdefault(key, [0, 0, 0, 0, 0, 0.0])
+            bucket[0] += 0 if is_hit else 1
+            bucket[1] += 1 if is_hit else 0
+            bucket[2] += values["prompt_tokens"]
+            bucket[3] += values["completion_tokens"]
+            bucket[4] += values["total_tokens"]
+            bucket[5] += values["cost_usd"]
+
+    if not totals:
+        return
+    values = [
+        {
+            "granularity": granularity,
+            "bucket_start": bucket_start,
+            "feature": feature,
+            "model": model,
+            "user_id": user_id,
+            "calls": int(calls),
+            "cache_hits": int(cache_hits),
+            "prompt_tokens": int(prompt_tokens),
+            "completion_tokens": int(completion_tokens),
+            "total_tokens": int(total_tokens),
+            "cost_usd": cost_usd,
+        }
+        # Sorted, so concurrent writers lock shared buckets in the same order.
+        for (granularity, bucket_start, feature, model, user_id), (
+            calls,
+            cache_hits,
+            prompt_tokens,
+            completion_tokens,
+            total_tokens,
+            cost_usd,
+        ) in sorted(totals.items(), key=lambda item: (*item[0][:4], item[0][4] or 0))
+    ]
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = dialect_insert(AIUsageRollup).values(values)
+    rollups = AIUsageRollup.__table__.c
+    # Added in SQL rather than read-modify-write, so concurrent writers to the
+    # same bucket never lose increments.
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=list(AI_USAGE_ROLLUP_KEY),
+            set_={column: rollups[column] + statement.excluded[column] for column in ROLLUP_COUNTERS},
+        )
+    )
+
+
+async def _apply_cache_hits(db: AsyncSession, hits: dict[str, tuple[int, datetime]]) -> None:
+    if not hits:
+        return
+    cache = AIResponseCache.__table__.c
+    # One relative UPDATE per fingerprint, sorted so concurrent writers lock
+    # rows in the same order; a row pruned meanwhile just matches nothing.
+    await db.execute(
+        update(AIResponseCache.__table__)
+        .where(cache.fingerprint == bindparam("hit_fingerprint"))
+        .values(
+            hit_count=cache.hit_count + bindparam("hit_delta"),
+            last_hit_at=bindparam("hit_at"),
+        ),
+        [
+            {"hit_fingerprint": fingerprint, "hit_delta": count, "hit_at": hit_at}
+            for fingerprint, (count, hit_at) in sorted(hits.items())
+        ],
+    )
+
+
+class AIUsageBuffer:
+    """Collects usage records in memory and bulk-inserts them in the background.
+
+    Rows are written by a single task on its own session every
+    ``AI_USAGE_FLUSH_INTERVAL_SECONDS`` or as soon as ``AI_USAGE_BATCH_SIZE``
+    records are waiting, so request transactions never wait on logging.
+    ``stop`` drains whatever is left. Response-cache hits are counted per
+    fingerprint and applied in the same flush. While the buffer is not running
+    (scripts, unit tests) ``record_ai_usage`` and ``record_cache_hit`` write
+    inline instead.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] | None = None,
+        *,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: list[_UsageRecord] = []
+        self._cache_hits: dict[str, tuple[int, datetime]] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, record: _UsageRecord) -> None:
+        self._pending.append(record)
+        batch_size = self._batch_size or settings.ai_usage_batch_size
+        if self._wakeup is not None and len(self._pending) >= batch_size:
+            self._wakeup.set()
+
+    def count_cache_hit(self, fingerprint: str, hit_at: datetime) -> None:
+        count, _ = self._cache_hits.get(fingerprint, (0, hit_at))
+        self._cache_hits[fingerprint] = (count + 1, hit_at)
+
+    async def flush(self) -> int:
+        if not self._pending and not self._cache_hits:
+            return 0
+        batch, self._pending = self._pending, []
+        hits, self._cache_hits = self._cache_hits, {}
+        session_factory = self._session_factory or AsyncSessionLocal
+        try:
+            rows = [_usage_values(record) for record in batch]
+            async with session_factory() as db:
+                if rows:
+                    await db.execute(insert(AIUsageLog), rows)
+                    await _apply_rollups(db, rows)
+                await _apply_cache_hits(db, hits)
+                await db.commit()
+        except Exception:
+            # Losing a batch of usage rows beats failing (or retrying forever
+            # inside) the process that made the calls.
+            LOGGER.exception("Dropped %d AI usage records", len(batch))
+            return 0
+        return len(batch)
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        interval = self._flush_interval or settings.ai_usage_flush_interval_seconds
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if not self.running:
+            # Bound to the loop that starts it; a restarted app gets a new one.
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run(self._wakeup))
+
+    async def stop(self) -> None:
+        # Not cancelled: a cancel landing inside flush() would lose the batch
+        # it had already taken. The loop finishes its flush and exits instead.
+        task, wakeup = self._task, self._wakeup
+        self._stopping = True
+        if wakeup is not None:
+            wakeup.set()
+        if task is not None:
+            await task
+        self._task = self._wakeup = None
+        await self.flush()
+
+
+usage_buffer = AIUsageBuffer()
+
+
 async def record_ai_usage(
     db: AsyncSession,
     *,
@@ -55,61 +292,117 @@ async def record_ai_usage(
     request_label: str | None = None,
     extra_data: dict[str, object] | None = None,
     status: str = "success",
-) -> AIUsageLog:
+) -> None:
     prompt_tokens, completion_tokens, total_tokens = token_counts(usage)
-    input_rate, output_rate, cost_usd = estimate_cost_usd(model, prompt_tokens, completion_tokens)
-    row = AIUsageLog(
+    record = _UsageRecord(
         user_id=user_id,
         feature=feature,
         model=model,
         prompt_tokens=prompt_tokens,
         completion_tokens=completion_tokens,
         total_tokens=total_tokens,
-        input_cost_per_million=input_rate,
-        output_cost_per_million=output_rate,
-        cost_usd=cost_usd,
         status=status,
         request_label=(request_label or "")[:255] or None,
         extra_data=extra_data or {},
+        created_at=datetime.now(timezone.utc),
     )
-    db.add(row)
+    if usage_buffer.running:
+        usage_buffer.enqueue(record)
+        return
+    values = _usage_values(record)
+    db.add(AIUsageLog(**values))
+    await _apply_rollups(db, [values])
     await db.flush()
-    return row
+
+
+async def record_cache_hit(db: AsyncSession, fingerprint: str) -> None:
+    """Count a response-cache hit without locking the row in the caller's transaction."""
+    hit_at = datetime.now(timezone.utc)
+    if usage_buffer.running:
+        usage_buffer.count_cache_hit(fingerprint, hit_at)
+        return
+    await _apply_cache_hits(db, {fingerprint: (1, hit_at)})
 
 
 def _round_money(value: float | int | None, digits: int = 6) -> float:
     return round(float(value or 0), digits)
 
 
+def _hit_rate(hits: int, calls: int) -> float:
+    served = hits + calls
+    return round(hits / served, 4) if served else 0.0
+
+
 def _feature_label(feature: str) -> str:
     labels = {
         "word_translate": "Word translation",
         "word_native_translate": "Cached word, new target language",
+        "word_translate_bulk": "Batch word translation",
         "word_expand": "More info",
         "chat_stream": "AI tutor",
+        "chat_summary": "AI tutor memory",
     }
     return labels.get(feature, feature.replace("_", " ").title())
 
 
-async def ai_usage_report(db: AsyncSession, *, limit: int = 50) -> dict[str, Any]:
+def _report_window(
+    start: date | None, end: date | None
+) -> tuple[datetime | None, datetime | None]:
+    lower = datetime.combine(start, time.min, tzinfo=timezone.utc) if start else None
+    upper = (
+        datetime.combine(end + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        if end
+        else None
+    )
+    return lower, upper
+
+
+async def ai_usage_report(
+    db: AsyncSession,
+    *,
+    limit: int = 50,
+    start: date | None = None,
+    end: date | None = None,
+) -> dict[str, Any]:
+    """Usage totals for ``start``..``end`` (inclusive UTC days; open-ended if omitted).
+
+    Aggregates come from the daily rollups and the timeline from the hourly
+    ones for ranges of two days or less; only ``recent`` touches raw logs.
+    """
+    lower, upper = _report_window(start, end)
+    hourly = lower is not None and upper is not None and upper - lower <= timedelta(days=2)
+
+    def in_window(granularity: str) -> list[Any]:
+        conditions = [AIUsageRollup.granularity == granularity]
+        if lower is not None:
+            conditions.append(AIUsageRollup.bucket_start >= lower)
+        if upper is not None:
+            conditions.append(AIUsageRollup.bucket_start < upper)
+        return conditions
+
+    daily = in_window("day")
+    calls_sum = func.coalesce(func.sum(AIUsageRollup.calls), 0)
+    cost_sum = func.coalesce(func.sum(AIUsageRollup.cost_usd), 0)
+    hits_sum = func.coalesce(func.sum(AIUsageRollup.cache_hits), 0)
+    tokens_sum = func.coalesce(func.sum(AIUsageRollup.total_tokens), 0)
+
     total_row = (
         await db.execute(
             select(
-                func.count(AIUsageLog.id),
-                func.coalesce(func.sum(AIUsageLog.cost_usd), 0),
-                func.coalesce(func.sum(AIUsageLog.prompt_tokens), 0),
-                func.coalesce(func.sum(AIUsageLog.completion_tokens), 0),
-                func.coalesce(func.sum(AIUsageLog.total_tokens), 0),
-            )
+                calls_sum,
+                cost_sum,
+                func.coalesce(func.sum(AIUsageRollup.prompt_tokens), 0),
+                func.coalesce(func.sum(AIUsageRollup.completion_tokens), 0),
+                tokens_sum,
+                hits_sum,
+            ).where(*daily)
         )
     ).one()
     translation_row = (
         await db.execute(
-            select(
-                func.count(AIUsageLog.id),
-                func.coalesce(func.sum(AIUsageLog.cost_usd), 0),
-                func.coalesce(func.sum(AIUsageLog.total_tokens), 0),
-            ).where(AIUsageLog.feature.in_(TRANSLATION_FEATURES))
+            select(calls_sum, cost_sum, tokens_sum).where(
+                *daily, AIUsageRollup.feature.in_(TRANSLATION_FEATURES)
+            )
         )
     ).one()
 
@@ -117,59 +410,90 @@ async def ai_usage_report(db: AsyncSession, *, limit: int = 50) -> dict[str, Any
     translation_calls = int(translation_row[0] or 0)
     total_cost = float(total_row[1] or 0)
     translation_cost = float(translation_row[1] or 0)
+    cache_hits = int(total_row[5] or 0)
 
     by_feature_rows = (
         await db.execute(
             select(
-                AIUsageLog.feature,
-                func.count(AIUsageLog.id),
-                func.coalesce(func.sum(AIUsageLog.cost_usd), 0),
-                func.coalesce(func.sum(AIUsageLog.prompt_tokens), 0),
-                func.coalesce(func.sum(AIUsageLog.completion_tokens), 0),
-                func.coalesce(func.sum(AIUsageLog.total_tokens), 0),
+                AIUsageRollup.feature,
+                calls_sum,
+                cost_sum,
+                func.coalesce(func.sum(AIUsageRollup.prompt_tokens), 0),
+                func.coalesce(func.sum(AIUsageRollup.completion_tokens), 0),
+                tokens_sum,
+                hits_sum,
             )
-            .group_by(AIUsageLog.feature)
-            .order_by(desc(func.sum(AIUsageLog.cost_usd)))
+            .where(*daily)
+            .group_by(AIUsageRollup.feature)
+            .order_by(desc(cost_sum), desc(calls_sum))
         )
     ).all()
 
     by_model_rows = (
         await db.execute(
-            select(
-                AIUsageLog.model,
-                func.count(AIUsageLog.id),
-                func.coalesce(func.sum(AIUsageLog.cost_usd), 0),
-                func.coalesce(func.sum(AIUsageLog.total_tokens), 0),
-            )
-            .group_by(AIUsageLog.model)
-            .order_by(desc(func.sum(AIUsageLog.cost_usd)))
+            select(AIUsageRollup.model, calls_sum, cost_sum, tokens_sum)
+            .where(*daily)
+            .group_by(AIUsageRollup.model)
+            .having(calls_sum > 0)
+            .order_by(desc(cost_sum))
         )
     ).all()
 
     top_user_rows = (
         await db.execute(
-            select(
-                User.username,
-                func.count(AIUsageLog.id),
-                func.coalesce(func.sum(AIUsageLog.cost_usd), 0),
-            )
-            .join(User, User.id == AIUsageLog.user_id)
+            select(User.username, calls_sum, cost_sum)
+            .join(User, User.id == AIUsageRollup.user_id)
+            .where(*daily)
             .group_by(User.username)
-            .order_by(desc(func.count(AIUsageLog.id)))
+            .having(calls_sum > 0)
+            .order_by(desc(calls_sum))
             .limit(8)
         )
     ).all()
 
-    recent_rows = (
+    timeline_granularity = "hour" if hourly else "day"
+    timeline_rows = (
         await db.execute(
-            select(AIUsageLog, User)
-            .outerjoin(User, User.id == AIUsageLog.user_id)
-            .order_by(AIUsageLog.created_at.desc())
-            .limit(max(1, min(limit, 200)))
+            select(AIUsageRollup.bucket_start, calls_sum, hits_sum, cost_sum, tokens_sum)
+            .where(*in_window(timeline_granularity))
+            .group_by(AIUsageRollup.bucket_start)
+            .order_by(AIUsageRollup.bucket_start)
         )
     ).all()
 
+    recent_query = (
+        select(AIUsageLog, User)
+        .outerjoin(User, User.id == AIUsageLog.user_id)
+        .order_by(AIUsageLog.created_at.desc())
+        .limit(max(1, min(limit, 200)))
+    )
+    if lower is not None:
+        recent_query = recent_query.where(AIUsageLog.created_at >= lower)
+    if upper is not None:
+        recent_query = recent_query.where(AIUsageLog.created_at < upper)
+    recent_rows = (await db.execute(recent_query)).all()
+
+    by_feature = [
+        {
+            "feature": feature,
+            "label": _feature_label(feature),
+            "calls": int(calls or 0),
+            "cost_usd": _round_money(cost, 6),
+            "prompt_tokens": int(prompt_tokens or 0),
+            "completion_tokens": int(completion_tokens or 0),
+            "total_tokens": int(total_tokens or 0),
+            "average_cost_usd": _round_money((float(cost or 0) / int(calls or 1)) if calls else 0, 6),
+            "cache_hits": int(hits or 0),
+            "cache_hit_rate": _hit_rate(int(hits or 0), int(calls or 0)),
+        }
+        for feature, calls, cost, prompt_tokens, completion_tokens, total_tokens, hits in by_feature_rows
+    ]
+
     return {
+        "range": {
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+        },
         "financials": {
             "total_cost_usd": _round_money(total_cost, 4),
             "translation_cost_usd": _round_money(translation_cost, 4),
@@ -183,20 +507,23 @@ async def ai_usage_report(db: AsyncSession, *, limit: int = 50) -> dict[str, Any
             "completion_tokens": int(total_row[3] or 0),
             "total_tokens": int(total_row[4] or 0),
             "translation_tokens": int(translation_row[2] or 0),
+            "cache_hits": cache_hits,
+            "cache_hit_rate": _hit_rate(cache_hits, total_calls),
+        },
+        "by_feature": by_feature,
+        "timeline": {
+            "granularity": timeline_granularity,
+            "points": [
+                {
+                    "bucket_start": _bucket_start(bucket_start, timeline_granularity).isoformat(),
+                    "calls": int(calls or 0),
+                    "cache_hits": int(hits or 0),
+                    "cost_usd": _round_money(cost, 6),
+                    "total_tokens": int(tokens or 0),
+                }
+                for bucket_start, calls, hits, cost, tokens in timeline_rows
+            ],
         },
-        "by_feature": [
-            {
-                "feature": feature,
-                "label": _feature_label(feature),
-                "calls": int(calls or 0),
-                "cost_usd": _round_money(cost, 6),
-                "prompt_tokens": int(prompt_tokens or 0),
-                "completion_tokens": int(completion_tokens or 0),
-                "total_tokens": int(total_tokens or 0),
-                "average_cost_usd": _round_money((float(cost or 0) / int(calls or 1)) if calls else 0, 6),
-            }
-            for feature, calls, cost, prompt_tokens, completion_tokens, total_tokens in by_feature_rows
-        ],
         "by_model": [
             {
                 "model": model,
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from contextlib import suppress
+from datetime import datetime, time, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.gamification import (
+    CurrentChallenge,
+    cache_weekly_challenges,
+    current_week_window,
+    provision_weekly_challenges,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+def seconds_until_next_rotation(now: datetime, interval: float) -> float:
+    """Sleep for ``interval``, but wake at the start of the next week if that is sooner."""
+    next_week = datetime.combine(current_week_window(now.date())[0] + timedelta(weeks=1), time.min)
+    return max(0.0, min(interval, (next_week - now).total_seconds()))
+
+
+class WeeklyChallengeRotation:
+    """Background job that keeps upcoming weekly challenges provisioned.
+
+    Each run creates this week's challenge and the next few ahead of time,
+    activates this week's, and caches them in process, so request paths read
+    the current challenge without touching ``weekly_challenges``. It runs at
+    startup, every ``CHALLENGE_ROTATION_INTERVAL_SECONDS``, and at each week
+    boundary.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] | None = None,
+        *,
+        interval: float | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def rotate(self) -> list[CurrentChallenge]:
+        session_factory = self._session_factory or AsyncSessionLocal
+        async with session_factory() as db:
+            challenges = await provision_weekly_challenges(db)
+            await db.commit()
+        cache_weekly_challenges(challenges)
+        return challenges
+
+    async def _run(self) -> None:
+        interval = self._interval or settings.challenge_rotation_interval_seconds
+        while True:
+            try:
+                await self.rotate()
+            except Exception:
+                # Requests still provision the current week on a cache miss.
+                LOGGER.exception("Weekly challenge rotation failed")
+            await asyncio.sleep(seconds_until_next_rotation(datetime.now(), interval))
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
+challenge_rotation = WeeklyChallengeRotation()
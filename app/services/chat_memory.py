@@ -0,0 +1,229 @@
+"""Rolling conversation memory for the AI tutor.
+
+Each tutor prompt carries a compressed summary of older turns
+(``chat_memories``) plus the most recent messages, together capped at
+``CHAT_HISTORY_MAX_TOKENS``. Once ``CHAT_SUMMARY_BATCH`` messages have aged
+out of the recent window, a background task folds them into the summary. The
+model call runs with no DB connection held. Summarized messages beyond the
+newest ``CHAT_HOT_MESSAGES`` then move to ``chat_message_archive``, so
+``chat_messages`` stays small per user.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.models import ChatMemory, ChatMessage, ChatMessageArchive, ChatRole
+from app.db.session import AsyncSessionLocal
+from app.services.ai_usage import record_ai_usage
+from app.services.openai_client import get_openai_client
+from app.services.state_version import STATE_VERSION_USER_OPTION
+
+LOGGER = logging.getLogger(__name__)
+
+CHAT_SUMMARY_MODEL = "gpt-4o-mini"
+SUMMARY_MAX_TOKENS = 300
+# Per-message clip when building the transcript to summarize.
+SUMMARY_MESSAGE_CHARS = 800
+# Role/formatting overhead the chat API adds to every message.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain the memory of a language tutor. Merge the previous summary and the new "
+    "turns into one short summary of at most 120 words: what the learner practised, recurring "
+    "mistakes, preferences and any open exercise. Write plain sentences, no greetings."
+)
+
+_refreshing: set[int] = set()
+_refresh_tasks: set[asyncio.Task[None]] = set()
+
+
+def estimate_tokens(text: str) -> int:
+    # About four characters per token for the Latin-script languages the app
+    # teaches; close enough to cap prompt size without a tokenizer dependency.
+    return len(text) // 4 + 1
+
+
+@dataclass(slots=True)
+class ChatHistory:
+    summary: str = ""
+    # Oldest first, in chat completion message format.
+    messages: list[dict[str, str]] = field(default_factory=list)
+    tokens: int = 0
+    needs_summary: bool = False
+
+
+async def load_chat_history(db: AsyncSession, *, user_id: int) -> ChatHistory:
+    """Summary plus the newest unsummarized messages that fit the token budget."""
+    memory = await db.get(ChatMemory, user_id)
+    summary = memory.summary if memory is not None else ""
+    through_id = memory.summarized_through_id if memory is not None else 0
+    # Read one batch past the window to learn whether a refresh is due.
+    scan = settings.chat_recent_messages + settings.chat_summary_batch
+    rows = (
+        await db.execute(
+            select(ChatMessage.role, ChatMessage.content)
+            .where(ChatMessage.user_id == user_id, ChatMessage.id > through_id)
+            .order_by(ChatMessage.id.desc())
+            .limit(scan)
+        )
+    ).all()
+
+    budget = settings.chat_history_max_tokens
+    # The summary may use at most half of the budget; recent turns get the rest.
+    summary = summary[: budget * 2]
+    tokens = estimate_tokens(summary) if summary else 0
+    messages: list[dict[str, str]] = []
+    for role, content in rows[: settings.chat_recent_messages]:
+        cost = estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+        if tokens + cost > budget:
+            break
+        messages.append({"role": ChatRole(role).value, "content": content})
+        tokens += cost
+    messages.reverse()
+    return ChatHistory(
+        summary=summary,
+        messages=messages,
+        tokens=tokens,
+        needs_summary=bool(settings.openai_api_key) and len(rows) >= scan,
+    )
+
+
+def _clip(text: str) -> str:
+    return text if len(text) <= SUMMARY_MESSAGE_CHARS else f"{text[:SUMMARY_MESSAGE_CHARS]}…"
+
+
+async def _summarize(previous: str, rows: list[Any]) -> tuple[str, Any]:
+    transcript = "\n".join(
+        f"{'Learner' if row.role == ChatRole.USER else 'Tutor'}: {_clip(row.content)}" for row in rows
+    )
+    response = await get_openai_client().chat.completions.create(
+        model=CHAT_SUMMARY_MODEL,
+        max_tokens=SUMMARY_MAX_TOKENS,
+        messages=[
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": f"Previous summary:\n{previous or '(none)'}\n\nNew turns:\n{transcript}",
+            },
+        ],
+    )
+    return (response.choices[0].message.content or "").strip(), response.usage
+
+
+async def archive_chat_messages(db: AsyncSession, *, user_id: int, through_id: int) -> int:
+    """Move summarized messages older than the newest ``CHAT_HOT_MESSAGES`` to the archive."""
+    oldest_hot_id = (
+        await db.execute(
+            select(ChatMessage.id)
+            .where(ChatMessage.user_id == user_id)
+            .order_by(ChatMessage.id.desc())
+            .offset(max(0, settings.chat_hot_messages - 1))
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+    if oldest_hot_id is None:
+        return 0
+    condition = (ChatMessage.user_id == user_id, ChatMessage.id < oldest_hot_id, ChatMessage.id <= through_id)
+    columns = ["id", "user_id", "role", "content", "created_at"]
+    await db.execute(
+        insert(ChatMessageArchive).from_select(
+            columns,
+            select(
+                ChatMessage.id, ChatMessage.user_id, ChatMessage.role, ChatMessage.content, ChatMessage.created_at
+            ).where(*condition),
+        )
+    )
+    # Only this user's rows: bump their state version, not everyone's.
+    archived = (
+        delete(ChatMessage)
+        .where(*condition)
+        .execution_options(**{STATE_VERSION_USER_OPTION: user_id})
+    )
+    return (await db.execute(archived)).rowcount or 0
+
+
+async def refresh_chat_memory(
+    user_id: int, *, session_factory: async_sessionmaker[AsyncSession] | None = None
+) -> bool:
+    """Fold messages that left the recent window into the summary; True if it changed."""
+    factory = session_factory or AsyncSessionLocal
+    # Bounds one summary call. A backlog older than this (history from before
+    # the memory existed) is archived without being summarized.
+    max_fold = settings.chat_summary_batch * 2
+    async with factory() as db:
+        memory = await db.get(ChatMemory, user_id)
+        through_id = memory.summarized_through_id if memory is not None else 0
+        previous = memory.summary if memory is not None else ""
+        rows = (
+            await db.execute(
+                select(ChatMessage.id, ChatMessage.role, ChatMessage.content)
+                .where(ChatMessage.user_id == user_id, ChatMessage.id > through_id)
+                .order_by(ChatMessage.id.desc())
+                .limit(settings.chat_recent_messages + max_fold)
+            )
+        ).all()
+    fold = list(reversed(rows[settings.chat_recent_messages :]))
+    if len(fold) < settings.chat_summary_batch:
+        return False
+
+    summary, usage = await _summarize(previous, fold)
+    async with factory() as db:
+        memory = await db.get(ChatMemory, user_id)
+        if memory is None:
+            memory = ChatMemory(user_id=user_id)
+            db.add(memory)
+        elif memory.summarized_through_id != through_id:
+            return False
+        memory.summary = summary
+        memory.summarized_through_id = fold[-1].id
+        await record_ai_usage(
+            db,
+            user_id=user_id,
+            feature="chat_summary",
+            model=CHAT_SUMMARY_MODEL,
+            usage=usage,
+            extra_data={"messages": len(fold)},
+        )
+        archived = await archive_chat_messages(db, user_id=user_id, through_id=fold[-1].id)
+        await db.commit()
+    LOGGER.debug("Summarized %s chat messages for user %s, archived %s", len(fold), user_id, archived)
+    return True
+
+
+async def _refresh_in_background(user_id: int) -> None:
+    try:
+        await refresh_chat_memory(user_id)
+    except Exception:
+        LOGGER.exception("Chat memory refresh failed for user %s", user_id)
+    finally:
+        _refreshing.discard(user_id)
+
+
+def schedule_memory_refresh(user_id: int) -> None:
+    """Refresh after the reply is saved, off the request path; one refresh per user at a time."""
+    if user_id in _refreshing:
+        return
+    _refreshing.add(user_id)
+    task = asyncio.create_task(_refresh_in_background(user_id))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+async def stop_memory_refreshes() -> None:
+    """Cancel in-flight refreshes and wait for them to unwind; used on shutdown.
+
+    A cancelled refresh commits nothing, so the same messages are folded again
+    by the next turn that needs a summary.
+    """
+    tasks = list(_refresh_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,87 +1,236 @@
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
 
-from openai import AsyncOpenAI
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.config import settings
-from app.db.models import ProgressItemType, UserProgress
+from app.db.models import ChatMessage, ChatRole, ProgressItemType
+from app.db.session import AsyncSessionLocal
 from app.services.ai_usage import record_ai_usage
+from app.services.chat_memory import load_chat_history, schedule_memory_refresh
+from app.services.openai_client import get_openai_client
+from app.services.tutor_context import TutorItem, learner_weak_items
 
 
 CHAT_AI_MODEL = "gpt-4o-mini"
+CHAT_STREAM_FALLBACK = "The tutor stream failed. Please try again."
+SSE_DONE_FRAME = b"event: done\ndata: [DONE]\n\n"
 
+_finish_tasks: set[asyncio.Task[None]] = set()
 
-async def weak_items_context(db: AsyncSession, user_id: int) -> str:
-    result = await db.execute(
-        select(UserProgress)
-        .where(UserProgress.user_id == user_id)
-        .order_by(UserProgress.probability.desc())
-        .limit(6)
-    )
-    rows = result.scalars().all()
-    if not rows:
+
+def _weak_item_line(item: TutorItem) -> str:
+    label = f'"{item.label}"'
+    if item.translation:
+        label += f' = "{item.translation}"'
+    if item.item_type == ProgressItemType.CONJUGATION:
+        # Tense scores use the probability scale: higher means weaker.
+        weakest = sorted(item.tense_scores, key=item.tense_scores.__getitem__, reverse=True)[:2]
+        detail = f"weakest tenses: {', '.join(weakest)}" if weakest else "not practised yet"
+    elif item.times_seen:
+        detail = f"{item.times_correct}/{item.times_seen} correct"
+    else:
+        detail = "not practised yet"
+    return f"- {item.item_type.value} {label} ({item.language_pair}): {detail}"
+
+
+def weak_items_context(items: list[TutorItem]) -> str:
+    if not items:
         return "No progress data yet. Start with basics and adapt difficulty gradually."
+    return "\n".join(_weak_item_line(item) for item in items)
 
-    lines = []
-    for row in rows:
-        if row.item_type == ProgressItemType.CONJUGATION:
-            tense_scores = (row.extra_data or {}).get("tense_scores", {})
-            lines.append(
-                f"Conjugation verb_id={row.item_id}, probability={row.probability:.0f}, weak_tenses={tense_scores}"
-            )
-        else:
-            lines.append(
-                f"{row.item_type.value} item_id={row.item_id}, probability={row.probability:.0f}, seen={row.times_seen}, correct={row.times_correct}"
-            )
-    return "\n".join(lines)
 
+@dataclass(slots=True)
+class ChatTurn:
+    """Everything a streaming reply needs once the request session is released."""
+
+    user_id: int
+    user_message: str
+    system_prompt: str
+    history: list[dict[str, str]] = field(default_factory=list)
+    needs_summary: bool = False
+    usage: Any = None
 
-async def stream_chat_response(
-    *,
-    db: AsyncSession,
-    user_id: int,
-    user_message: str,
-) -> AsyncIterator[str]:
-    if not settings.openai_api_key:
-        yield "OpenAI API key is not configured. Add OPENAI_API_KEY in .env."
-        return
 
-    profile_context = await weak_items_context(db, user_id)
+async def prepare_chat_turn(db: AsyncSession, *, user_id: int, user_message: str) -> ChatTurn:
+    """Stage the learner's message and read their context on the request session.
+
+    The caller commits and closes ``db`` before streaming, so no pooled
+    connection is held while the model produces tokens.
+    """
+    history = await load_chat_history(db, user_id=user_id)
+    db.add(ChatMessage(user_id=user_id, role=ChatRole.USER, content=user_message))
+    profile_context = weak_items_context(await learner_weak_items(db, user_id=user_id))
     system_prompt = (
         "You are a multilingual tutor for VerbPractice. "
         "Generate concise, targeted feedback and include one short exercise. "
         "Use the learner context to prioritize weak areas.\n"
         f"Learner weak items:\n{profile_context}"
     )
+    if history.summary:
+        system_prompt += f"\nEarlier conversation (summary):\n{history.summary}"
+    return ChatTurn(
+        user_id=user_id,
+        user_message=user_message,
+        system_prompt=system_prompt,
+        history=history.messages,
+        needs_summary=history.needs_summary,
+    )
 
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
-    usage = None
+
+async def stream_chat_turn(turn: ChatTurn) -> AsyncIterator[str]:
+    if not settings.openai_api_key:
+        yield "OpenAI API key is not configured. Add OPENAI_API_KEY in .env."
+        return
+
+    client = get_openai_client()
     stream = await client.chat.completions.create(
         model=CHAT_AI_MODEL,
         stream=True,
         stream_options={"include_usage": True},
         messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message},
+            {"role": "system", "content": turn.system_prompt},
+            *turn.history,
+            {"role": "user", "content": turn.user_message},
         ],
     )
 
-    async for chunk in stream:
-        if getattr(chunk, "usage", None) is not None:
-            usage = chunk.usage
-        if chunk.choices and chunk.choices[0].delta.content:
-            yield chunk.choices[0].delta.content
-
-    if usage is not None:
-        await record_ai_usage(
-            db,
-            user_id=user_id,
-            feature="chat_stream",
-            model=CHAT_AI_MODEL,
-            usage=usage,
-            request_label=user_message[:120],
-            extra_data={"message_chars": len(user_message)},
-        )
+    try:
+        async for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                turn.usage = chunk.usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        # Closing the HTTP response stops generation (and billing) upstream
+        # when the reader goes away before the reply is complete.
+        await stream.close()
+
+
+async def coalesce_chunks(
+    chunks: AsyncIterator[str], *, max_delay: float, max_chars: int
+) -> AsyncIterator[str]:
+    """Merge token deltas into fewer, larger pieces.
+
+    The first delta passes straight through so time-to-first-token is
+    unchanged. After that a piece is emitted once ``max_chars`` are buffered or
+    ``max_delay`` seconds have passed since the oldest buffered delta. Closing
+    this generator cancels and closes ``chunks``.
+    """
+    loop = asyncio.get_running_loop()
+    buffered: list[str] = []
+    size = 0
+    deadline: float | None = None
+    first = True
+    pending: asyncio.Future[str] | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(chunks))
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if done:
+                finished, pending = pending, None
+                try:
+                    chunk = finished.result()
+                except StopAsyncIteration:
+                    break
+                buffered.append(chunk)
+                size += len(chunk)
+                if deadline is None:
+                    deadline = loop.time() + max_delay
+                if not first and size < max_chars:
+                    continue
+            first = False
+            yield "".join(buffered)
+            buffered, size, deadline = [], 0, None
+        if buffered:
+            yield "".join(buffered)
+    finally:
+        if pending is not None:
+            pending.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await pending
+        await chunks.aclose()
+
+
+def _sse_frame(text: str) -> bytes:
+    return b"data: " + orjson.dumps({"chunk": text}) + b"\n\n"
+
+
+async def chat_event_stream(
+    turn: ChatTurn,
+    *,
+    is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+) -> AsyncIterator[bytes]:
+    """SSE frames for one tutor reply, then the reply is persisted.
+
+    ``is_disconnected`` is polled before each frame; once the client is gone
+    the upstream stream is cancelled and only the part already sent is saved.
+    The same holds when the server closes the generator because a send failed:
+    a piece counts as sent once the generator is resumed after yielding it.
+    """
+    reply: list[str] = []
+    pieces = coalesce_chunks(
+        stream_chat_turn(turn),
+        max_delay=settings.chat_stream_flush_ms / 1000,
+        max_chars=settings.chat_stream_flush_chars,
+    )
+    disconnected = False
+    try:
+        async for piece in pieces:
+            if is_disconnected is not None and await is_disconnected():
+                disconnected = True
+                break
+            yield _sse_frame(piece)
+            reply.append(piece)
+    except (GeneratorExit, asyncio.CancelledError):
+        disconnected = True
+        raise
+    except Exception:
+        yield _sse_frame(CHAT_STREAM_FALLBACK)
+        reply.append(CHAT_STREAM_FALLBACK)
+    finally:
+        # The save runs on its own task, started before anything else is
+        # awaited: if the response task is being cancelled it still completes.
+        saving = None
+        if reply or not disconnected:
+            saving = asyncio.create_task(finish_chat_turn(turn, "".join(reply)))
+            _finish_tasks.add(saving)
+            saving.add_done_callback(_finish_tasks.discard)
+        await pieces.aclose()
+        if saving is not None:
+            await asyncio.shield(saving)
+
+    if not disconnected:
+        yield SSE_DONE_FRAME
+
+
+async def finish_chat_turn(
+    turn: ChatTurn,
+    reply: str,
+    *,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> None:
+    """Persist the reply and its usage in one short transaction of its own."""
+    async with (session_factory or AsyncSessionLocal)() as db:
+        db.add(ChatMessage(user_id=turn.user_id, role=ChatRole.ASSISTANT, content=reply))
+        if turn.usage is not None:
+            await record_ai_usage(
+                db,
+                user_id=turn.user_id,
+                feature="chat_stream",
+                model=CHAT_AI_MODEL,
+                usage=turn.usage,
+                request_label=turn.user_message[:120],
+                extra_data={"message_chars": len(turn.user_message)},
+            )
+        await db.commit()
+    if turn.needs_summary:
+        schedule_memory_refresh(turn.user_id)
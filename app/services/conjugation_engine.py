@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 import re
 
-from app.services.normalization import normalize_for_comparison
+from app.services.normalization import normalize_for_comparison, normalize_reference
 from app.services.training_engine import clamp_probability
 
 
@@ -57,7 +57,7 @@ def accepted_conjugation_forms(expected: str, language_code: str) -> set[str]:
 def conjugation_answer_is_correct(user_answer: str, expected: str, language_code: str) -> bool:
     normalized_answer = normalize_for_comparison(user_answer)
     return bool(normalized_answer) and any(
-        normalized_answer == normalize_for_comparison(candidate)
+        normalized_answer == normalize_reference(candidate)
         for candidate in accepted_conjugation_forms(expected, language_code)
     )
 
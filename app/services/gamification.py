@@ -5,6 +5,7 @@ from datetime import date, datetime, time, timedelta, timezone
 from typing import Any
 
 from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import (
@@ -231,44 +232,162 @@ def current_week_window(today: date | None = None) -> tuple[date, date]:
     return start, end
 
 
-async def ensure_weekly_challenge(db: AsyncSession, today: date | None = None) -> WeeklyChallenge:
-    today = today or date.today()
-    start, end = current_week_window(today)
-    iso_year, iso_week, _ = today.isocalendar()
+# Challenges are provisioned this many weeks beyond the current one, so a new
+# week never starts with its row missing.
+CHALLENGE_WEEKS_AHEAD = 2
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentChallenge:
+    """Detached copy of a ``WeeklyChallenge`` row, safe to share across sessions."""
+
+    id: int
+    slug: str
+    title: str
+    description: str
+    icon: str
+    metric_key: str
+    target_value: int
+    reward_xp: int
+    starts_at: date
+    ends_at: date
+
+    @classmethod
+    def from_row(cls, row: WeeklyChallenge) -> CurrentChallenge:
+        return cls(
+            id=row.id,
+            slug=row.slug,
+            title=row.title,
+            description=row.description,
+            icon=row.icon,
+            metric_key=row.metric_key,
+            target_value=row.target_value,
+            reward_xp=row.reward_xp,
+            starts_at=row.starts_at,
+            ends_at=row.ends_at,
+        )
+
+
+# Week start -> that week's challenge. Only committed rows go in: the rotation
+# job caches what it provisioned, and a miss caches what it reads.
+_challenge_cache: dict[date, CurrentChallenge] = {}
+# Session.info key for slugs a session inserted itself, possibly uncommitted.
+_PROVISIONED_KEY = "provisioned_challenges"
+
+
+def _challenge_slug(day: date) -> tuple[str, dict[str, Any]]:
+    iso_year, iso_week, _ = day.isocalendar()
     template = WEEKLY_CHALLENGE_ROTATION[(iso_week - 1) % len(WEEKLY_CHALLENGE_ROTATION)]
-    slug = f"week-{iso_year}-w{iso_week:02d}-{template['metric_key']}"
+    return f"week-{iso_year}-w{iso_week:02d}-{template['metric_key']}", template
 
-    existing = await db.execute(select(WeeklyChallenge).where(WeeklyChallenge.slug == slug))
-    challenge = existing.scalar_one_or_none()
-    if challenge is not None:
-        if not challenge.active:
-            challenge.active = True
-        return challenge
 
-    active_rows = await db.execute(select(WeeklyChallenge).where(WeeklyChallenge.active.is_(True)))
-    for row in active_rows.scalars().all():
-        row.active = False
+def cache_weekly_challenges(challenges: list[CurrentChallenge]) -> None:
+    """Remember committed challenges by week; drops weeks that have ended."""
+    for challenge in challenges:
+        _challenge_cache[challenge.starts_at] = challenge
+    this_week = current_week_window()[0]
+    for week_start in [week for week in _challenge_cache if week < this_week]:
+        del _challenge_cache[week_start]
 
-    challenge = WeeklyChallenge(
-        slug=slug,
-        title=template["title"],
-        description=template["description"],
-        icon=template["icon"],
-        metric_key=template["metric_key"],
-        target_value=template["target_value"],
-        reward_xp=template["reward_xp"],
-        starts_at=start,
-        ends_at=end,
-        active=True,
-    )
-    db.add(challenge)
+
+def clear_weekly_challenge_cache() -> None:
+    _challenge_cache.clear()
+
+
+async def provision_weekly_challenges(
+    db: AsyncSession, today: date | None = None, *, weeks_ahead: int = CHALLENGE_WEEKS_AHEAD
+) -> list[CurrentChallenge]:
+    """Create this week's and the next ``weeks_ahead`` challenges, and activate this week's.
+
+    Safe to run concurrently: a slug inserted by another worker first is read
+    back instead. The caller commits, then may pass the result to
+    ``cache_weekly_challenges``.
+    """
+    today = today or date.today()
+    weeks = [today + timedelta(weeks=offset) for offset in range(weeks_ahead + 1)]
+    slugs = [_challenge_slug(day)[0] for day in weeks]
+    rows = {
+        row.slug: row
+        for row in (
+            await db.execute(select(WeeklyChallenge).where(WeeklyChallenge.slug.in_(slugs)))
+        ).scalars()
+    }
+    for day, slug in zip(weeks, slugs):
+        if slug in rows:
+            continue
+        start, end = current_week_window(day)
+        template = _challenge_slug(day)[1]
+        try:
+            async with db.begin_nested():
+                db.info.setdefault(_PROVISIONED_KEY, set()).add(slug)
+                db.add(
+                    WeeklyChallenge(
+                        slug=slug,
+                        title=template["title"],
+                        description=template["description"],
+                        icon=template["icon"],
+                        metric_key=template["metric_key"],
+                        target_value=template["target_value"],
+                        reward_xp=template["reward_xp"],
+                        starts_at=start,
+                        ends_at=end,
+                        active=False,
+                    )
+                )
+        except IntegrityError:
+            # Another worker provisioned the same week first.
+            pass
+    if len(rows) < len(slugs):
+        rows = {
+            row.slug: row
+            for row in (
+                await db.execute(select(WeeklyChallenge).where(WeeklyChallenge.slug.in_(slugs)))
+            ).scalars()
+        }
+
+    current = rows[slugs[0]]
+    # Flipped through the ORM, and only when they differ: a bulk update()
+    # would bump the content state version (and every ETag) on each run.
+    stale = (
+        await db.execute(
+            select(WeeklyChallenge).where(
+                WeeklyChallenge.active.is_(True), WeeklyChallenge.id != current.id
+            )
+        )
+    ).scalars()
+    for row in stale:
+        row.active = False
+    if not current.active:
+        current.active = True
     await db.flush()
-    return challenge
+    return [CurrentChallenge.from_row(rows[slug]) for slug in slugs]
 
 
-async def ensure_gamification_catalog(db: AsyncSession) -> None:
-    await ensure_badge_catalog(db)
-    await ensure_weekly_challenge(db)
+async def current_weekly_challenge(db: AsyncSession, today: date | None = None) -> CurrentChallenge:
+    """This week's challenge, from the in-process cache when possible.
+
+    The rotation job provisions and caches upcoming weeks ahead of time, so
+    the per-answer path does not query ``weekly_challenges``. On a miss the row
+    is read and cached. If the row is missing (scripts, a job that has not run
+    yet) it is provisioned in the caller's transaction and cached by a later
+    read once committed.
+    """
+    today = today or date.today()
+    week_start = current_week_window(today)[0]
+    cached = _challenge_cache.get(week_start)
+    if cached is not None:
+        return cached
+
+    slug = _challenge_slug(today)[0]
+    row = (
+        await db.execute(select(WeeklyChallenge).where(WeeklyChallenge.slug == slug))
+    ).scalar_one_or_none()
+    if row is not None:
+        challenge = CurrentChallenge.from_row(row)
+        if slug not in db.info.get(_PROVISIONED_KEY, ()):
+            cache_weekly_challenges([challenge])
+        return challenge
+    return (await provision_weekly_challenges(db, today, weeks_ahead=0))[0]
 
 
 def serialize_badge(definition: BadgeDefinition, unlocked_at: datetime | None = None) -> dict[str, Any]:
@@ -282,7 +401,7 @@ def serialize_badge(definition: BadgeDefinition, unlocked_at: datetime | None =
     }
 
 
-def serialize_challenge(challenge: WeeklyChallenge, progress: UserChallengeProgress | None) -> dict[str, Any]:
+def serialize_challenge(challenge: CurrentChallenge, progress: UserChallengeProgress | None) -> dict[str, Any]:
     progress_value = progress.progress if progress else 0
     return {
         "slug": challenge.slug,
@@ -433,7 +552,7 @@ async def track_weekly_metric(
     if delta <= 0:
         return None
 
-    challenge = await ensure_weekly_challenge(db)
+    challenge = await current_weekly_challenge(db)
     if challenge.metric_key != metric_key:
         existing = (
             await db.execute(
@@ -502,9 +621,8 @@ async def build_combo_reward(
 
 
 async def gamification_snapshot(db: AsyncSession, *, user: User, profile: UserProfile) -> dict[str, Any]:
-    await ensure_gamification_catalog(db)
     preference = await ensure_user_preference(db, user.id)
-    challenge = await ensure_weekly_challenge(db)
+    challenge = await current_weekly_challenge(db)
     challenge_progress = (
         await db.execute(
             select(UserChallengeProgress).where(
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import re
 import unicodedata
+from functools import lru_cache
 
 SPECIAL_REPLACEMENTS = {
     "ñ": "n",
@@ -9,17 +11,64 @@ SPECIAL_REPLACEMENTS = {
     "æ": "ae",
 }
 
+# Blocks the translate table covers: Latin (basic, Latin-1, Extended-A/B and
+# Additional), combining diacritics, Cyrillic (+ Supplement) and general
+# punctuation. Within them every decomposition yields a base letter plus Mn
+# marks, so per-character mapping equals the whole-string NFD pass exactly.
+_COVERED_RANGES = (
+    (0x0000, 0x024F),
+    (0x0300, 0x036F),
+    (0x0400, 0x052F),
+    (0x1E00, 0x1EFF),
+    (0x2000, 0x206F),
+)
+_UNCOVERED_RE = re.compile(
+    "[^" + "".join(f"\\U{start:08x}-\\U{end:08x}" for start, end in _COVERED_RANGES) + "]"
+)
+REFERENCE_CACHE_SIZE = 8192
 
-def normalize_for_comparison(text: str | None) -> str:
-    if not text:
-        return ""
 
-    lowered = text.strip().lower()
-    decomposed = unicodedata.normalize("NFD", lowered)
+def _strip_marks(text: str) -> str:
+    decomposed = unicodedata.normalize("NFD", text)
     no_marks = "".join(ch for ch in decomposed if unicodedata.category(ch) != "Mn")
 
     normalized = no_marks
     for source, target in SPECIAL_REPLACEMENTS.items():
         normalized = normalized.replace(source, target)
-
     return normalized
+
+
+def _build_translate_table() -> dict[int, str]:
+    table: dict[int, str] = {}
+    for start, end in _COVERED_RANGES:
+        for codepoint in range(start, end + 1):
+            char = chr(codepoint)
+            mapped = _strip_marks(char)
+            if mapped != char:
+                table[codepoint] = mapped
+    return table
+
+
+_TRANSLATE_TABLE = _build_translate_table()
+
+
+def normalize_for_comparison(text: str | None) -> str:
+    if not text:
+        return ""
+
+    lowered = text.strip().lower()
+    if lowered.isascii():
+        return lowered
+    if _UNCOVERED_RE.search(lowered):
+        return _strip_marks(lowered)
+    return lowered.translate(_TRANSLATE_TABLE)
+
+
+@lru_cache(maxsize=REFERENCE_CACHE_SIZE)
+def normalize_reference(text: str) -> str:
+    """Memoized ``normalize_for_comparison`` for stored answers and synonyms.
+
+    Reference strings repeat on every submission; learner input does not, so
+    it goes through the uncached function and cannot evict them.
+    """
+    return normalize_for_comparison(text)
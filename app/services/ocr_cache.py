@@ -0,0 +1,187 @@
+"""Content-addressed cache for OCR results.
+
+Keys are ``sha256(image bytes)`` plus the recognition model key, so re-uploading
+the same photo (a retry after a 503, or switching between languages that share
+a model) skips detection and recognition. A bounded in-process LRU with a TTL
+sits in front of an optional on-disk tier (``OCR_CACHE_DIR``) that survives
+restarts and is shared by workers on the same host. Payloads are plain JSON so
+this module stays independent of the OCR engine types.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from app.core.config import settings
+
+LOGGER = logging.getLogger(__name__)
+
+# On-disk entries are pruned inline every N writes rather than by a job.
+DISK_PRUNE_EVERY_WRITES = 50
+
+
+def ocr_cache_key(source: bytes | BinaryIO, model_key: str) -> str:
+    if isinstance(source, bytes):
+        digest = hashlib.sha256(source)
+    else:
+        source.seek(0)
+        digest = hashlib.file_digest(source, "sha256")
+        source.seek(0)
+    return f"{model_key}-{digest.hexdigest()}"
+
+
+class OcrResultCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        directory: str | os.PathLike[str] | None = None,
+        max_disk_entries: int = 2000,
+    ) -> None:
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.directory = Path(directory) if directory else None
+        self.max_disk_entries = max_disk_entries
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        # get/put run on the event loop and in worker threads (disk tier).
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _memory_get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, payload = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def _memory_put(self, key: str, payload: dict[str, Any], stored_at: float) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = (stored_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_get(self, key: str) -> tuple[float, dict[str, Any]] | None:
+        if self.directory is None:
+            return None
+        path = self.directory / f"{key}.json"
+        try:
+            stored_at = path.stat().st_mtime
+            if time.time() - stored_at > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            return stored_at, json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            LOGGER.warning("Discarding unreadable OCR cache entry %s", path.name)
+            path.unlink(missing_ok=True)
+            return None
+
+    def _disk_put(self, key: str, payload: dict[str, Any]) -> None:
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see half a file.
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False)
+            os.replace(tmp_name, self.directory / f"{key}.json")
+        except OSError:
+            LOGGER.warning("Could not write OCR cache entry to %s", self.directory, exc_info=True)
+            return
+        with self._lock:
+            self._disk_writes += 1
+            should_prune = self._disk_writes % DISK_PRUNE_EVERY_WRITES == 0
+        if should_prune:
+            self.prune_disk()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Look up memory, then disk (blocking I/O: call off the event loop if disk is on)."""
+        payload = self._memory_get(key)
+        if payload is None:
+            stored = self._disk_get(key)
+            if stored is not None:
+                stored_at, payload = stored
+                self._memory_put(key, payload, stored_at)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return payload
+
+    def put(self, key: str, payload: dict[str, Any]) -> None:
+        self._memory_put(key, payload, time.time())
+        self._disk_put(key, payload)
+
+    def prune_disk(self) -> int:
+        """Drop expired files, then the oldest beyond ``max_disk_entries``."""
+        if self.directory is None or not self.directory.is_dir():
+            return 0
+        now = time.time()
+        files: list[tuple[float, Path]] = []
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if now - mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                files.append((mtime, path))
+        files.sort()
+        for _, path in files[: max(0, len(files) - self.max_disk_entries)]:
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk": self.directory is not None,
+            }
+
+
+_CACHE: OcrResultCache | None = None
+
+
+def get_ocr_cache() -> OcrResultCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = OcrResultCache(
+            max_entries=settings.ocr_cache_max_entries,
+            ttl_seconds=settings.ocr_cache_ttl_seconds,
+            directory=settings.ocr_cache_dir or None,
+            max_disk_entries=settings.ocr_cache_max_disk_entries,
+        )
+    return _CACHE
@@ -1,10 +1,13 @@
 """Local OCR for photographed text, backed by RapidOCR (PP-OCR ONNX models).
 
-Engine init and inference are CPU-bound, so they run in a worker thread and a
-single-slot semaphore keeps concurrent requests from thrashing the
-low-resource host. Engines are cached per recognition model; the first request
-for a language downloads its model (~15 MB) into the rapidocr package cache,
-after which everything runs fully offline.
+Engine init and inference are CPU-bound, so they run on a small pool of worker
+threads (``OCR_WORKERS``, one by default so a low-resource host is not
+thrashed). Each worker owns its own engines, cached per recognition model, so
+ONNX sessions are never shared across threads. Requests beyond the free
+workers wait in a bounded queue (``OCR_QUEUE_LIMIT``); past that they fail
+fast with ``OcrBusyError``. The first request for a language downloads its
+model (~15 MB) into the rapidocr package cache, after which everything runs
+fully offline.
 """
 
 from __future__ import annotations
@@ -12,11 +15,19 @@ from __future__ import annotations
 import asyncio
 import io
 import logging
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from typing import BinaryIO
 
 import numpy as np
 from PIL import Image, ImageOps, UnidentifiedImageError
 
+from app.core.config import settings
+from app.services.ocr_cache import get_ocr_cache, ocr_cache_key
+
 # App language codes -> recognition model family. English rides the newest
 # PP-OCRv6 small stack; fr/es share the latin model and ru the cyrillic one
 # (both PP-OCRv5 mobile — v6 only ships ch/en).
@@ -27,8 +38,9 @@ _MAX_PIXELS = 40_000_000
 _MAX_DIMENSION = 1600
 _MIN_LINE_SCORE = 0.5
 
-_OCR_SEMAPHORE = asyncio.Semaphore(1)
-_ENGINES: dict[str, object] = {}
+OCR_STAGES = ("queue", "decode", "resize", "detect", "recognize")
+
+_ENGINES: dict[tuple[int, str], object] = {}
 
 logging.getLogger("RapidOCR").setLevel(logging.WARNING)
 
@@ -41,6 +53,10 @@ class OcrUnavailableError(OcrError):
     """RapidOCR or the requested recognition model is not available."""
 
 
+class OcrBusyError(OcrError):
+    """Every OCR worker is busy and the wait queue is full."""
+
+
 @dataclass(slots=True)
 class OcrBox:
     """Axis-aligned word bounds normalized to the processed image."""
@@ -64,10 +80,14 @@ class OcrResult:
     lines: list[str]
     mean_confidence: float | None
     words: list[OcrWord] = field(default_factory=list)
+    # Requests ahead of this one when it arrived (0 = a worker was free).
+    queue_position: int = 0
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    cached: bool = False
 
 
-def _get_engine(model_key: str):
-    engine = _ENGINES.get(model_key)
+def _get_engine(model_key: str, slot: int = 0):
+    engine = _ENGINES.get((slot, model_key))
     if engine is not None:
         return engine
     try:
@@ -94,25 +114,52 @@ def _get_engine(model_key: str):
         raise OcrUnavailableError(
             f"OCR model for '{model_key}' is unavailable: {exc}"
         ) from exc
-    _ENGINES[model_key] = engine
+    _ENGINES[(slot, model_key)] = engine
     return engine
 
 
-def _preprocess(data: bytes) -> np.ndarray:
+def _draft_size(size: tuple[int, int]) -> tuple[int, int]:
+    scale = _MAX_DIMENSION / max(size)
+    return max(1, math.ceil(size[0] * scale)), max(1, math.ceil(size[1] * scale))
+
+
+def _preprocess(
+    source: bytes | BinaryIO, timings: dict[str, float] | None = None
+) -> np.ndarray:
+    timings = {} if timings is None else timings
     try:
-        img = Image.open(io.BytesIO(data))
+        started = time.perf_counter()
+        # Spooled uploads are decoded straight from their file handle.
+        img = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
         if img.width * img.height > _MAX_PIXELS:
             raise OcrError("Image resolution too large.")
-        img = ImageOps.exif_transpose(img)
         if max(img.size) > _MAX_DIMENSION:
-            img.thumbnail((_MAX_DIMENSION, _MAX_DIMENSION), Image.LANCZOS)
-        img = img.convert("RGB")
+            # JPEGs decode straight to 1/2, 1/4 or 1/8 scale (never below the
+            # target), so a 12 MP phone photo is never materialized in full.
+            img.draft("RGB", _draft_size(img.size))
+        img.load()
+        decoded = time.perf_counter()
+        timings["decode"] = (decoded - started) * 1000
+        if max(img.size) > _MAX_DIMENSION:
+            # reducing_gap box-reduces by whole factors first, so LANCZOS only
+            # filters the last <3x step (non-JPEGs still arrive full size).
+            img.thumbnail((_MAX_DIMENSION, _MAX_DIMENSION), Image.LANCZOS, reducing_gap=3.0)
+        # The bounding box is square, so rotating after the resize is equivalent
+        # and touches far fewer pixels.
+        ImageOps.exif_transpose(img, in_place=True)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        # rapidocr follows the cv2 convention, so hand it BGR. The raw encoder
+        # swaps channels while copying out, giving one contiguous writable array
+        # instead of a reversed view that forces another copy downstream.
+        bgr = np.frombuffer(bytearray(img.tobytes("raw", "BGR")), dtype=np.uint8)
+        bgr = bgr.reshape(img.height, img.width, 3)
+        timings["resize"] = (time.perf_counter() - decoded) * 1000
     except OcrError:
         raise
     except (UnidentifiedImageError, OSError, ValueError) as exc:
         raise OcrError("Not a readable image.") from exc
-    # rapidocr follows the cv2 convention, so hand it BGR.
-    return np.asarray(img)[:, :, ::-1]
+    return bgr
 
 
 def _clean_word(value: str) -> str:
@@ -150,11 +197,17 @@ def _normalized_box(box: object, image_width: int, image_height: int) -> OcrBox
     )
 
 
-def _run(engine, img: np.ndarray) -> OcrResult:
+def _run(engine, img: np.ndarray, timings: dict[str, float] | None = None) -> OcrResult:
+    timings = {} if timings is None else timings
     try:
         output = engine(img)
     except Exception as exc:
         raise OcrError("OCR failed to process the image.") from exc
+    # RapidOCR reports seconds per stage as [detect, classify, recognize].
+    elapse = [value or 0.0 for value in getattr(output, "elapse_list", None) or ()]
+    if len(elapse) >= 3:
+        timings["detect"] = (elapse[0] + elapse[1]) * 1000
+        timings["recognize"] = elapse[2] * 1000
 
     lines: list[str] = []
     scores: list[float] = []
@@ -194,17 +247,182 @@ def _run(engine, img: np.ndarray) -> OcrResult:
         lines=lines,
         mean_confidence=mean_confidence,
         words=words,
+        timings_ms=timings,
     )
 
 
-def _extract_sync(data: bytes, lang_code: str) -> OcrResult:
+class _OcrPool:
+    """Worker slots plus a bounded FIFO of requests waiting for one."""
+
+    def __init__(self, workers: int, queue_limit: int) -> None:
+        self.workers = max(1, workers)
+        self.queue_limit = max(0, queue_limit)
+        self._free: deque[int] = deque(range(self.workers))
+        self._waiters: deque[asyncio.Future[int]] = deque()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="ocr"
+        )
+        self.completed = 0
+        self.rejected = 0
+        self._stage_totals_ms = dict.fromkeys(OCR_STAGES, 0.0)
+
+    @property
+    def busy(self) -> int:
+        return self.workers - len(self._free)
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> tuple[int, int]:
+        """Return ``(slot, queue position on arrival)``; raise when the queue is full."""
+        if self._free and not self.waiting:
+            return self._free.popleft(), 0
+        position = self.waiting + 1
+        if position > self.queue_limit:
+            self.rejected += 1
+            raise OcrBusyError("OCR is busy. Try again in a moment.")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await waiter, position
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(waiter.result())
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, slot: int) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(slot)
+                return
+        self._free.append(slot)
+
+    def record(self, timings_ms: dict[str, float]) -> None:
+        self.completed += 1
+        for stage in OCR_STAGES:
+            self._stage_totals_ms[stage] += timings_ms.get(stage, 0.0)
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "workers": self.workers,
+            "busy": self.busy,
+            "waiting": self.waiting,
+            "queue_limit": self.queue_limit,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "stage_avg_ms": {
+                stage: round(total / self.completed, 1) if self.completed else 0.0
+                for stage, total in self._stage_totals_ms.items()
+            },
+        }
+
+
+_POOL: _OcrPool | None = None
+
+
+def _pool() -> _OcrPool:
+    global _POOL
+    if _POOL is None:
+        _POOL = _OcrPool(settings.ocr_workers, settings.ocr_queue_limit)
+    return _POOL
+
+
+def ocr_pool_stats() -> dict[str, object]:
+    return {**_pool().stats(), "cache": get_ocr_cache().stats()}
+
+
+def _extract_sync(
+    source: bytes | BinaryIO,
+    lang_code: str,
+    slot: int = 0,
+    timings: dict[str, float] | None = None,
+) -> OcrResult:
     model_key = OCR_LANG_BY_CODE.get(lang_code)
     if model_key is None:
         raise OcrError(f"Unsupported OCR language: {lang_code}")
-    img = _preprocess(data)
-    return _run(_get_engine(model_key), img)
+    timings = {} if timings is None else timings
+    img = _preprocess(source, timings)
+    return _run(_get_engine(model_key, slot), img, timings)
+
+
+def _result_payload(result: OcrResult) -> dict[str, object]:
+    return {
+        "text": result.text,
+        "lines": result.lines,
+        "mean_confidence": result.mean_confidence,
+        "words": [
+            {
+                "text": word.text,
+                "confidence": word.confidence,
+                "box": [word.box.x, word.box.y, word.box.width, word.box.height],
+            }
+            for word in result.words
+        ],
+    }
+
+
+def _result_from_payload(payload: dict) -> OcrResult:
+    return OcrResult(
+        text=payload["text"],
+        lines=list(payload["lines"]),
+        mean_confidence=payload["mean_confidence"],
+        words=[
+            OcrWord(text=word["text"], confidence=word["confidence"], box=OcrBox(*word["box"]))
+            for word in payload["words"]
+        ],
+        cached=True,
+    )
+
+
+def _cache_lookup(source: bytes | BinaryIO, model_key: str) -> tuple[str, dict | None]:
+    key = ocr_cache_key(source, model_key)
+    return key, get_ocr_cache().get(key)
 
 
-async def extract_text(data: bytes, lang_code: str) -> OcrResult:
-    async with _OCR_SEMAPHORE:
-        return await asyncio.to_thread(_extract_sync, data, lang_code)
+async def extract_text(source: bytes | BinaryIO, lang_code: str) -> OcrResult:
+    """OCR raw bytes or a seekable binary file (read from its current start)."""
+    model_key = OCR_LANG_BY_CODE.get(lang_code)
+    if model_key is None:
+        raise OcrError(f"Unsupported OCR language: {lang_code}")
+    # Hashing 8 MB (and the optional disk tier) stays off the event loop.
+    lookup_started = time.perf_counter()
+    cache_key, payload = await asyncio.to_thread(_cache_lookup, source, model_key)
+    if payload is not None:
+        result = _result_from_payload(payload)
+        result.timings_ms = {"cache": round((time.perf_counter() - lookup_started) * 1000, 1)}
+        return result
+
+    pool = _pool()
+    queued_at = time.perf_counter()
+    slot, position = await pool.acquire()
+    timings = {"queue": (time.perf_counter() - queued_at) * 1000}
+    try:
+        # The worker keeps going if the client disconnects; the slot is only
+        # released once it is actually free again.
+        work = asyncio.get_running_loop().run_in_executor(
+            pool._executor, _extract_sync, source, lang_code, slot, timings
+        )
+        result = await asyncio.shield(work)
+    except asyncio.CancelledError:
+
+        def _release_when_done(done: asyncio.Future[OcrResult]) -> None:
+            if not done.cancelled():
+                done.exception()  # retrieved so the loop does not log it
+            pool.release(slot)
+
+        work.add_done_callback(_release_when_done)
+        raise
+    except BaseException:
+        pool.release(slot)
+        raise
+    pool.release(slot)
+    timings = {stage: round(timings.get(stage, 0.0), 1) for stage in OCR_STAGES}
+    pool.record(timings)
+    await asyncio.to_thread(get_ocr_cache().put, cache_key, _result_payload(result))
+    result.queue_position = position
+    result.timings_ms = timings
+    return result
@@ -149,24 +149,51 @@ class LocalSenseRanker:
         senses: list[WordSense],
         translations_by_sense: dict[int, list[WordSenseTranslation]],
     ) -> tuple[list[int], list[float], str]:
+        return self.rank_many([(context, senses, translations_by_sense)])[0]
+
+    def rank_many(
+        self,
+        requests: list[
+            tuple[str, list[WordSense], dict[int, list[WordSenseTranslation]]]
+        ],
+    ) -> list[tuple[list[int], list[float], str]]:
+        """Rank several (context, senses) requests with one batched encode each side."""
         candidate_texts = [
-            _sense_text(sense, translations_by_sense.get(sense.id, []))
-            for sense in senses
+            [
+                _sense_text(sense, translations_by_sense.get(sense.id, []))
+                for sense in senses
+            ]
+            for _, senses, translations_by_sense in requests
         ]
-        candidate_vectors = self.encode(candidate_texts, kind="passage")
-        query_vector = self.encode([context], kind="query")
-        if candidate_vectors is not None and query_vector is not None:
-            scores = (candidate_vectors @ query_vector[0]).tolist()
-            order = sorted(range(len(senses)), key=scores.__getitem__, reverse=True)
-            return order, [float(score) for score in scores], MODEL_NAME
-
-        scores = [_lexical_score(context, text) for text in candidate_texts]
-        order = sorted(
-            range(len(senses)),
-            key=lambda index: (scores[index], senses[index].is_primary, -senses[index].id),
-            reverse=True,
+        candidate_vectors = self.encode(
+            [text for texts in candidate_texts for text in texts], kind="passage"
         )
-        return order, scores, "lexical_overlap"
+        query_vectors = self.encode(
+            [context for context, _, _ in requests], kind="query"
+        )
+        rankings = []
+        offset = 0
+        for position, (context, senses, _) in enumerate(requests):
+            texts = candidate_texts[position]
+            if candidate_vectors is not None and query_vectors is not None:
+                vectors = candidate_vectors[offset : offset + len(texts)]
+                scores = [float(score) for score in (vectors @ query_vectors[position]).tolist()]
+                order = sorted(range(len(senses)), key=scores.__getitem__, reverse=True)
+                rankings.append((order, scores, MODEL_NAME))
+            else:
+                scores = [_lexical_score(context, text) for text in texts]
+                order = sorted(
+                    range(len(senses)),
+                    key=lambda index: (
+                        scores[index],
+                        senses[index].is_primary,
+                        -senses[index].id,
+                    ),
+                    reverse=True,
+                )
+                rankings.append((order, scores, "lexical_overlap"))
+            offset += len(texts)
+        return rankings
 
 
 def _sense_text(
@@ -199,21 +226,12 @@ def get_local_sense_ranker() -> LocalSenseRanker:
     return LocalSenseRanker(settings.offline_sense_model_dir)
 
 
-async def find_ranked_sense(
-    db: AsyncSession,
+def _trusted_senses(
+    all_senses: list[WordSense],
     *,
-    word: Word,
     target_language_id: int,
-    context: str | None,
-    require_translation: bool = True,
-) -> RankedSense | None:
-    result = await db.execute(
-        select(WordSense)
-        .options(selectinload(WordSense.translations))
-        .where(WordSense.word_id == word.id)
-        .order_by(WordSense.is_primary.desc(), WordSense.id.asc())
-    )
-    all_senses = list(result.scalars().unique().all())
+    require_translation: bool,
+) -> tuple[list[WordSense], dict[int, list[WordSenseTranslation]]]:
     translations_by_sense = {
         sense.id: sorted(
             [
@@ -231,27 +249,29 @@ async def find_ranked_sense(
         if sense.is_trusted
         and (not require_translation or translations_by_sense[sense.id])
     ]
-    cleaned_context = (context or "").strip()
-    senses = trusted_senses
-    if not senses:
-        return None
+    return trusted_senses, translations_by_sense
 
-    if not cleaned_context or len(senses) == 1:
-        selected = senses[0]
-        return RankedSense(
-            sense=selected,
-            translations=translations_by_sense[selected.id],
-            method="primary" if len(senses) > 1 else "single_sense",
-            alternatives=senses[1:],
-        )
 
-    ranker = get_local_sense_ranker()
-    order, scores, method = await asyncio.to_thread(
-        ranker.rank,
-        context=cleaned_context,
-        senses=senses,
-        translations_by_sense=translations_by_sense,
+def _unranked_sense(
+    senses: list[WordSense],
+    translations_by_sense: dict[int, list[WordSenseTranslation]],
+) -> RankedSense:
+    selected = senses[0]
+    return RankedSense(
+        sense=selected,
+        translations=translations_by_sense[selected.id],
+        method="primary" if len(senses) > 1 else "single_sense",
+        alternatives=senses[1:],
     )
+
+
+def _ranked_sense(
+    senses: list[WordSense],
+    translations_by_sense: dict[int, list[WordSenseTranslation]],
+    order: list[int],
+    scores: list[float],
+    method: str,
+) -> RankedSense:
     selected_index = order[0]
     runner_score = scores[order[1]] if len(order) > 1 else None
     selected = senses[selected_index]
@@ -269,6 +289,103 @@ async def find_ranked_sense(
     )
 
 
+async def find_ranked_sense(
+    db: AsyncSession,
+    *,
+    word: Word,
+    target_language_id: int,
+    context: str | None,
+    require_translation: bool = True,
+) -> RankedSense | None:
+    result = await db.execute(
+        select(WordSense)
+        .options(selectinload(WordSense.translations))
+        .where(WordSense.word_id == word.id)
+        .order_by(WordSense.is_primary.desc(), WordSense.id.asc())
+    )
+    senses, translations_by_sense = _trusted_senses(
+        list(result.scalars().unique().all()),
+        target_language_id=target_language_id,
+        require_translation=require_translation,
+    )
+    cleaned_context = (context or "").strip()
+    if not senses:
+        return None
+
+    if not cleaned_context or len(senses) == 1:
+        return _unranked_sense(senses, translations_by_sense)
+
+    ranker = get_local_sense_ranker()
+    order, scores, method = await asyncio.to_thread(
+        ranker.rank,
+        context=cleaned_context,
+        senses=senses,
+        translations_by_sense=translations_by_sense,
+    )
+    return _ranked_sense(senses, translations_by_sense, order, scores, method)
+
+
+async def find_ranked_senses(
+    db: AsyncSession,
+    *,
+    lookups: list[tuple[Word, str | None]],
+    target_language_id: int,
+    require_translation: bool = True,
+) -> list[RankedSense | None]:
+    """``find_ranked_sense`` for many (word, context) lookups at once.
+
+    Senses for every word come from one query, and all lookups that need
+    contextual ranking share one batched E5 pass.
+    """
+    if not lookups:
+        return []
+    result = await db.execute(
+        select(WordSense)
+        .options(selectinload(WordSense.translations))
+        .where(WordSense.word_id.in_({word.id for word, _ in lookups}))
+        .order_by(
+            WordSense.word_id, WordSense.is_primary.desc(), WordSense.id.asc()
+        )
+    )
+    senses_by_word: dict[int, list[WordSense]] = {}
+    for sense in result.scalars().unique().all():
+        senses_by_word.setdefault(sense.word_id, []).append(sense)
+
+    ranked: list[RankedSense | None] = []
+    pending: list[tuple[int, str, list[WordSense], dict[int, list[WordSenseTranslation]]]] = []
+    for position, (word, context) in enumerate(lookups):
+        senses, translations_by_sense = _trusted_senses(
+            senses_by_word.get(word.id, []),
+            target_language_id=target_language_id,
+            require_translation=require_translation,
+        )
+        cleaned_context = (context or "").strip()
+        if not senses:
+            ranked.append(None)
+        elif not cleaned_context or len(senses) == 1:
+            ranked.append(_unranked_sense(senses, translations_by_sense))
+        else:
+            ranked.append(None)
+            pending.append((position, cleaned_context, senses, translations_by_sense))
+
+    if pending:
+        ranker = get_local_sense_ranker()
+        rankings = await asyncio.to_thread(
+            ranker.rank_many,
+            [
+                (context, senses, translations_by_sense)
+                for _, context, senses, translations_by_sense in pending
+            ],
+        )
+        for (position, _, senses, translations_by_sense), (order, scores, method) in zip(
+            pending, rankings
+        ):
+            ranked[position] = _ranked_sense(
+                senses, translations_by_sense, order, scores, method
+            )
+    return ranked
+
+
 async def select_dictionary_sense(
     db: AsyncSession,
     *,
@@ -285,24 +402,11 @@ async def select_dictionary_sense(
         .where(WordSense.word_id == word.id)
         .order_by(WordSense.is_primary.desc(), WordSense.id.asc())
     )
-    all_senses = list(result.scalars().unique().all())
-    translations_by_sense = {
-        sense.id: sorted(
-            [
-                item
-                for item in sense.translations
-                if item.target_language_id == target_language_id
-            ],
-            key=lambda item: (item.priority, item.id),
-        )
-        for sense in all_senses
-    }
-    eligible = [
-        sense
-        for sense in all_senses
-        if sense.is_trusted
-        and (not require_translation or translations_by_sense[sense.id])
-    ]
+    eligible, translations_by_sense = _trusted_senses(
+        list(result.scalars().unique().all()),
+        target_language_id=target_language_id,
+        require_translation=require_translation,
+    )
     selected = next((sense for sense in eligible if sense.id == sense_id), None)
     if selected is None:
         return None
@@ -103,9 +103,13 @@ async def _derive_completed(db: AsyncSession, *, user_id: int) -> list[str]:
 
 
 async def load_state(
-    db: AsyncSession, *, user_id: int, preference: UserPreference | None
+    db: AsyncSession, *, user_id: int, preference: UserPreference | None, persist: bool = True
 ) -> dict[str, Any]:
-    """Return the user's onboarding state, seeding it from history on first read."""
+    """Return the user's onboarding state, seeding it from history on first read.
+
+    Read-only callers pass ``persist=False``: the inferred state is returned but
+    not stored, so the next writing caller seeds it instead.
+    """
     stored = preference.onboarding if preference else None
     if isinstance(stored, dict) and stored:
         return normalize(stored)
@@ -113,7 +117,7 @@ async def load_state(
     # Nothing stored yet: infer from what they have already done.
     state = empty_state()
     state["completed"] = await _derive_completed(db, user_id=user_id)
-    if preference is not None:
+    if persist and preference is not None:
         preference.onboarding = state
         await db.flush()
     return state
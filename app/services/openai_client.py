@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import importlib.util
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+
+# One pool for the whole process: every AI call used to build its own
+# AsyncOpenAI, paying a fresh TCP + TLS handshake per request.
+_http_client: httpx.AsyncClient | None = None
+_clients: dict[tuple[str | None, str | None], AsyncOpenAI] = {}
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _http_transport() -> httpx.AsyncBaseTransport:
+    return httpx.AsyncHTTPTransport(
+        http2=settings.openai_http2 and _http2_available(),
+        limits=httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+        ),
+    )
+
+
+def _shared_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            transport=_http_transport(),
+            timeout=httpx.Timeout(
+                settings.openai_timeout_seconds,
+                connect=settings.openai_connect_timeout_seconds,
+            ),
+        )
+        _clients.clear()
+    return _http_client
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Application-lifetime ``AsyncOpenAI`` sharing one keep-alive pool.
+
+    Retries (with the SDK's exponential backoff) and timeouts come from the
+    ``OPENAI_*`` settings; ``OPENAI_BASE_URL`` points it at a local stub.
+    """
+    http_client = _shared_http_client()
+    key = (settings.openai_api_key, settings.openai_base_url)
+    client = _clients.get(key)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url or None,
+            max_retries=settings.openai_max_retries,
+            timeout=http_client.timeout,
+            http_client=http_client,
+        )
+        _clients[key] = client
+    return client
+
+
+async def close_openai_client() -> None:
+    global _http_client
+    _clients.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
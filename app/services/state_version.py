@@ -0,0 +1,225 @@
+"""State versions behind the ETags of the SPA's polled JSON endpoints.
+
+``/api/bootstrap``, ``/api/dashboard``, ``/api/training/*``, ``/api/community``
+and ``/admin/api/live`` are polled by idle tabs, and each poll used to rebuild
+its whole payload. This module keeps one version counter per user plus a few
+shared counters, all bumped from committed ORM writes:
+
+- ``user``: that user's progress, XP, sessions, preferences, badges, friends,
+  chat and added words;
+- ``social``: any profile or XP change, which moves the shared leaderboards;
+- ``content``: catalog edits (words, verbs, conjugations, tags, sets,
+  challenges) and any bulk ``update()``/``delete()`` on tracked tables. Bulk
+  statements don't say which user they touch, so they invalidate everyone
+  unless they carry the ``STATE_VERSION_USER_OPTION`` execution option naming
+  the single user whose rows they change;
+- ``activity``: every tracked write, for the admin live monitor.
+
+An endpoint derives its ETag from the counters it depends on and can answer
+``If-None-Match`` with 304 before running any snapshot builder.
+
+Counters are process-local, like the tutor context cache: the app runs as one
+uvicorn process. Each process has a random epoch that goes into every ETag, so
+tags issued before a restart never match. Writes made outside the app, such
+as scripts or manual SQL, are not seen until the next restart or the next
+tracked write.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import secrets
+from dataclasses import dataclass, field
+from datetime import date
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+
+from app.db.models import (
+    BadgeDefinition,
+    ChatMessage,
+    FriendLink,
+    Language,
+    SessionItem,
+    Tag,
+    TrainingSession,
+    User,
+    UserAddedWord,
+    UserBadge,
+    UserChallengeProgress,
+    UserPreference,
+    UserProfile,
+    UserProgress,
+    Verb,
+    VerbConjugation,
+    VerbTag,
+    VerbTranslation,
+    WeeklyChallenge,
+    Word,
+    WordLexicalEntry,
+    WordNativeTranslation,
+    WordSense,
+    WordSenseTranslation,
+    WordSet,
+    WordSetMember,
+    WordTag,
+    WordTranslation,
+    XPEvent,
+)
+
+USER_STATE_MODELS = (
+    User,
+    UserProfile,
+    UserPreference,
+    UserProgress,
+    TrainingSession,
+    ChatMessage,
+    XPEvent,
+    UserBadge,
+    UserChallengeProgress,
+    FriendLink,
+    UserAddedWord,
+)
+# Rows read by the global, weekly and circle leaderboards.
+SOCIAL_MODELS = (User, UserProfile, XPEvent)
+CONTENT_MODELS = (
+    Language,
+    Word,
+    WordTranslation,
+    Verb,
+    VerbTranslation,
+    VerbConjugation,
+    BadgeDefinition,
+    WeeklyChallenge,
+    WordLexicalEntry,
+    WordNativeTranslation,
+    WordSense,
+    WordSenseTranslation,
+    Tag,
+    WordTag,
+    VerbTag,
+    WordSet,
+    WordSetMember,
+)
+# Answers also rewrite their session's config in the same flush, so session
+# items only need to count as admin-visible activity.
+ACTIVITY_MODELS = (*USER_STATE_MODELS, *CONTENT_MODELS, SessionItem)
+
+_PENDING_KEY = "state_version_changes"
+# Execution option for bulk statements limited to one user's rows, e.g.
+# ``delete(ChatMessage).where(ChatMessage.user_id == user_id)``.
+STATE_VERSION_USER_OPTION = "state_version_user"
+
+
+@dataclass(slots=True)
+class _PendingChanges:
+    users: set[int] = field(default_factory=set)
+    social: bool = False
+    content: bool = False
+
+
+class StateVersions:
+    def __init__(self) -> None:
+        self.epoch = secrets.token_hex(4)
+        self._users: dict[int, int] = {}
+        self.social = 0
+        self.content = 0
+        self.activity = 0
+
+    def user(self, user_id: int) -> int:
+        return self._users.get(user_id, 0)
+
+    def apply(self, changes: _PendingChanges) -> None:
+        for user_id in changes.users:
+            self._users[user_id] = self._users.get(user_id, 0) + 1
+        self.social += changes.social
+        self.content += changes.content
+        self.activity += 1
+
+    def etag(
+        self,
+        scope: str,
+        user_id: int | None = None,
+        *parts: object,
+        social: bool = False,
+        activity: bool = False,
+    ) -> str:
+        """Weak ETag for ``scope`` from the counters the payload depends on.
+
+        The date is always included because streaks, today's sessions and the
+        weekly challenge roll over without any write.
+        """
+        versions: list[object] = [self.epoch, date.today().isoformat(), self.content, scope]
+        if user_id is not None:
+            versions += [user_id, self.user(user_id)]
+        if social:
+            versions.append(self.social)
+        if activity:
+            versions.append(self.activity)
+        raw = "|".join(str(value) for value in (*versions, *parts))
+        return f'W/"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+    def clear(self) -> None:
+        self._users.clear()
+        self.social = self.content = self.activity = 0
+
+
+state_versions = StateVersions()
+
+
+def _pending(session: Session) -> _PendingChanges:
+    return session.info.setdefault(_PENDING_KEY, _PendingChanges())
+
+
+def _owner_id(obj: object) -> int | None:
+    owner = obj.id if isinstance(obj, User) else getattr(obj, "user_id", None)
+    return owner if isinstance(owner, int) else None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_state_changes(session: Session, flush_context) -> None:
+    changes: _PendingChanges | None = None
+    # ``dirty`` also lists objects whose attributes were set to the same value.
+    modified = [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in (*session.new, *session.deleted, *modified):
+        if not isinstance(obj, ACTIVITY_MODELS):
+            continue
+        if changes is None:
+            changes = _pending(session)
+        if isinstance(obj, USER_STATE_MODELS):
+            owner = _owner_id(obj)
+            if owner is not None:
+                changes.users.add(owner)
+        changes.social |= isinstance(obj, SOCIAL_MODELS)
+        changes.content |= isinstance(obj, CONTENT_MODELS)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(state: ORMExecuteState) -> None:
+    if not (state.is_update or state.is_delete):
+        return
+    mapper = state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, ACTIVITY_MODELS):
+        changes = _pending(state.session)
+        owner = state.execution_options.get(STATE_VERSION_USER_OPTION)
+        if isinstance(owner, int) and issubclass(mapper.class_, USER_STATE_MODELS):
+            changes.users.add(owner)
+        else:
+            changes.content = True
+        changes.social |= issubclass(mapper.class_, SOCIAL_MODELS)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_state_changes(session: Session) -> None:
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes is not None:
+        state_versions.apply(changes)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_state_changes(session: Session, transaction: SessionTransaction) -> None:
+    # ``after_rollback`` also fires for a rolled-back savepoint, which must not
+    # drop the outer transaction's changes. Only the outermost transaction
+    # ending without a commit (rollback or close) discards them.
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
@@ -4,7 +4,7 @@ import random
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
-from app.services.normalization import normalize_for_comparison
+from app.services.normalization import normalize_for_comparison, normalize_reference
 
 MIN_PROBABILITY = 20.0
 MAX_PROBABILITY = 100000.0
@@ -83,8 +83,8 @@ def grade_translation(
     synonym_answers: list[str] | None = None,
 ) -> GradeResult:
     normalized_answer = normalize_for_comparison(answer)
-    normalized_accepted = [normalize_for_comparison(val) for val in accepted if val.strip()]
-    normalized_synonyms = [normalize_for_comparison(val) for val in (synonym_answers or []) if val.strip()]
+    normalized_accepted = [normalize_reference(val) for val in accepted if val.strip()]
+    normalized_synonyms = [normalize_reference(val) for val in (synonym_answers or []) if val.strip()]
 
     expected_primary = accepted[0].strip() if accepted else ""
 
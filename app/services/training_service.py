@@ -38,7 +38,7 @@ from app.services.gamification import (
     unlock_badges,
     update_streak,
 )
-from app.services.normalization import normalize_for_comparison
+from app.services.normalization import normalize_reference
 from app.services.onboarding import (
     FEATURE_BY_TRAINING_MODE,
     mark_feature_complete as mark_onboarding_feature,
@@ -66,6 +66,9 @@ ITEM_TYPE_BY_MODE: dict[TrainingMode, ProgressItemType] = {
 
 FIRST_CORRECT_MULTIPLIER = 0.1
 
+_LANGUAGE_MEMO_KEY = "training_languages_by_code"
+_INVENTORY_LANGUAGE_MEMO_KEY = "training_inventory_language"
+
 
 def _is_monolingual_pair(language_pair: str) -> bool:
     source, separator, target = language_pair.lower().partition("_")
@@ -105,30 +108,46 @@ async def _resolve_inventory_language(
 
     Direction is "{source}_{target}" lowercase. Whichever side has inventory rows
     wins; if neither does, returns the source side (caller will see an empty set).
+    The answer is memoized on the session: one request resolves the same
+    direction for unlocks, eligibility, the question and the hint.
     """
+    memo = db.info.setdefault(_INVENTORY_LANGUAGE_MEMO_KEY, {})
+    memo_key = (mode, direction.lower())
+    if memo_key in memo:
+        return memo[memo_key]
+
     source_code, target_code = direction.upper().split("_")
     model = await _model_for_mode(mode)
     source_lang = await get_language_by_code(db, source_code)
     target_lang = await get_language_by_code(db, target_code)
 
-    source_count = await db.scalar(
-        select(func.count()).select_from(model).where(model.language_id == source_lang.id)
-    )
-    if source_count and source_count > 0:
-        return source_lang
-    target_count = await db.scalar(
-        select(func.count()).select_from(model).where(model.language_id == target_lang.id)
+    resolved = source_lang
+    if not await _has_inventory(db, model, source_lang.id) and await _has_inventory(
+        db, model, target_lang.id
+    ):
+        resolved = target_lang
+    memo[memo_key] = resolved
+    return resolved
+
+
+async def _has_inventory(db: AsyncSession, model, language_id: int) -> bool:
+    return bool(
+        await db.scalar(select(select(model.id).where(model.language_id == language_id).exists()))
     )
-    if target_count and target_count > 0:
-        return target_lang
-    return source_lang
 
 
 async def get_language_by_code(db: AsyncSession, code: str) -> Language:
+    # Language rows are reference data read many times per request, so the
+    # session keeps the ones it has already loaded.
+    memo = db.info.setdefault(_LANGUAGE_MEMO_KEY, {})
+    language = memo.get(code)
+    if language is not None:
+        return language
     result = await db.execute(select(Language).where(Language.code == code))
     language = result.scalar_one_or_none()
     if language is None:
         raise ValueError(f"Language not found: {code}")
+    memo[code] = language
     return language
 
 
@@ -1397,7 +1416,7 @@ def _conjugation_form_groups(
             accepted = tuple(
                 sorted(
                     {
-                        normalize_for_comparison(form)
+                        normalize_reference(form)
                         for form in accepted_conjugation_forms(expected, language_code)
                     }
                 )
@@ -0,0 +1,253 @@
+"""Per-user cache of the learner's weakest items for the AI tutor.
+
+The chat system prompt and the chat page both need the user's weakest
+unlocked items with readable labels. Instead of sorting ``user_progress`` and
+resolving word/verb labels on every message, each user's top items are loaded
+once and then kept current from committed ORM changes. Session listeners
+collect the ``UserProgress`` rows written in a transaction and fold them into
+the cached window on commit. Labels are looked up only for items that newly
+enter the window.
+
+The cache is process-local, like the OCR result cache: the app runs as one
+uvicorn process. Bulk ``delete(UserProgress)`` statements bypass the ORM, so
+their callers must call ``tutor_contexts.forget``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.db.models import ProgressItemType, UserProgress
+from app.services.dashboard_service import build_focus_items
+
+TUTOR_CONTEXT_SIZE = 6
+# Extra rows kept below the visible items so an improving item can drop out
+# of the top without reloading from the database.
+TUTOR_CONTEXT_HEADROOM = 10
+TUTOR_CONTEXT_MAX_USERS = 2048
+# Bounds staleness of labels and translations edited by admins.
+TUTOR_CONTEXT_TTL_SECONDS = 900.0
+
+_PENDING_KEY = "tutor_context_progress"
+_FORGET_KEY = "tutor_context_forget"
+
+ProgressKey = tuple[str, int, str]
+
+
+@dataclass(slots=True)
+class TutorItem:
+    item_type: ProgressItemType
+    item_id: int
+    language_pair: str
+    probability: float
+    times_seen: int
+    times_correct: int
+    streak: int
+    tense_scores: dict[str, float] = field(default_factory=dict)
+    label: str | None = None
+    translation: str | None = None
+
+    @property
+    def key(self) -> ProgressKey:
+        return (self.item_type.value, self.item_id, self.language_pair)
+
+    @property
+    def rank(self) -> tuple[float, int, int]:
+        # Same order as the dashboard focus list: weakest first.
+        return (-self.probability, self.times_seen, self.item_id)
+
+    @property
+    def accuracy(self) -> float | None:
+        return round((self.times_correct / self.times_seen) * 100, 1) if self.times_seen else None
+
+    def focus_item(self) -> dict[str, Any]:
+        """The ``build_focus_items`` shape used by the chat page."""
+        return {
+            "label": self.label,
+            "translation": self.translation,
+            "item_type": self.item_type.value,
+            "language_pair": self.language_pair,
+            "probability": round(self.probability),
+            "times_seen": self.times_seen,
+            "times_correct": self.times_correct,
+            "accuracy": self.accuracy,
+            "streak": self.streak,
+        }
+
+
+def _tutor_item(row: UserProgress) -> TutorItem:
+    tense_scores = (row.extra_data or {}).get("tense_scores") or {}
+    return TutorItem(
+        item_type=ProgressItemType(row.item_type),
+        item_id=row.item_id,
+        language_pair=row.language_pair,
+        probability=float(row.probability if row.probability is not None else 1000.0),
+        times_seen=row.times_seen or 0,
+        times_correct=row.times_correct or 0,
+        streak=row.streak or 0,
+        tense_scores={str(tense): float(score) for tense, score in tense_scores.items()},
+    )
+
+
+@dataclass(slots=True)
+class _UserWindow:
+    items: dict[ProgressKey, TutorItem]
+    # True when every unlocked row of the user fits in the window.
+    complete: bool
+    loaded_at: float
+
+    def ranked(self) -> list[TutorItem]:
+        return sorted(self.items.values(), key=lambda item: item.rank)
+
+
+class TutorContextCache:
+    def __init__(self, *, max_users: int = TUTOR_CONTEXT_MAX_USERS) -> None:
+        self.max_users = max_users
+        self._windows: OrderedDict[int, _UserWindow] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> _UserWindow | None:
+        window = self._windows.get(user_id)
+        if window is not None and time.monotonic() - window.loaded_at > TUTOR_CONTEXT_TTL_SECONDS:
+            del self._windows[user_id]
+            window = None
+        if window is None:
+            self.misses += 1
+            return None
+        self._windows.move_to_end(user_id)
+        self.hits += 1
+        return window
+
+    def put(self, user_id: int, window: _UserWindow) -> None:
+        self._windows[user_id] = window
+        self._windows.move_to_end(user_id)
+        while len(self._windows) > self.max_users:
+            self._windows.popitem(last=False)
+
+    def forget(self, user_id: int) -> None:
+        self._windows.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._windows.clear()
+
+    def apply(self, user_id: int, key: ProgressKey, item: TutorItem | None) -> None:
+        """Fold one committed progress row (``None`` when deleted or locked) into the window."""
+        window = self._windows.get(user_id)
+        if window is None:
+            return
+        previous = window.items.pop(key, None)
+        if item is not None:
+            if previous is not None:
+                item.label, item.translation = previous.label, previous.translation
+            floor = max((other.rank for other in window.items.values()), default=None)
+            # Rows outside the window rank below its floor, so an item above
+            # the floor has a known position; below it, it may not.
+            if window.complete or floor is None or item.rank < floor:
+                window.items[key] = item
+        limit = TUTOR_CONTEXT_SIZE + TUTOR_CONTEXT_HEADROOM
+        if len(window.items) > limit:
+            for extra in window.ranked()[limit:]:
+                del window.items[extra.key]
+            window.complete = False
+        if not window.complete and len(window.items) < TUTOR_CONTEXT_SIZE:
+            self.forget(user_id)
+
+    def stats(self) -> dict[str, int]:
+        return {"users": len(self._windows), "hits": self.hits, "misses": self.misses}
+
+
+tutor_contexts = TutorContextCache()
+
+
+async def _load_window(db: AsyncSession, user_id: int) -> _UserWindow:
+    limit = TUTOR_CONTEXT_SIZE + TUTOR_CONTEXT_HEADROOM
+    rows = (
+        await db.execute(
+            select(UserProgress)
+            .where(UserProgress.user_id == user_id, UserProgress.unlocked.is_(True))
+            .order_by(UserProgress.probability.desc(), UserProgress.times_seen.asc(), UserProgress.item_id.asc())
+            .limit(limit)
+        )
+    ).scalars().all()
+    items = [_tutor_item(row) for row in rows]
+    return _UserWindow(
+        items={item.key: item for item in items},
+        complete=len(items) < limit,
+        loaded_at=time.monotonic(),
+    )
+
+
+async def _resolve_labels(db: AsyncSession, items: list[TutorItem]) -> None:
+    # build_focus_items only reads the progress fields TutorItem mirrors.
+    for item, focus in zip(items, await build_focus_items(db, items)):
+        item.label, item.translation = focus["label"], focus["translation"]
+
+
+async def learner_weak_items(
+    db: AsyncSession, *, user_id: int, limit: int = TUTOR_CONTEXT_SIZE
+) -> list[TutorItem]:
+    """The user's weakest unlocked items with labels, served from the cache when warm."""
+    window = tutor_contexts.get(user_id)
+    if window is None:
+        window = await _load_window(db, user_id)
+        # Label the headroom too (same queries) so items moving up need no lookup.
+        await _resolve_labels(db, list(window.items.values()))
+        tutor_contexts.put(user_id, window)
+    top = window.ranked()[: min(limit, TUTOR_CONTEXT_SIZE)]
+    unlabeled = [item for item in top if item.label is None]
+    if unlabeled:
+        await _resolve_labels(db, unlabeled)
+    return top
+
+
+def _progress_key(row: UserProgress) -> ProgressKey:
+    return (ProgressItemType(row.item_type).value, row.item_id, row.language_pair)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_progress_changes(session: Session, flush_context) -> None:
+    pending: dict[tuple[int, ProgressKey], TutorItem | None] | None = None
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, UserProgress):
+            continue
+        if pending is None:
+            pending = session.info.setdefault(_PENDING_KEY, {})
+        alive = obj not in session.deleted and bool(obj.unlocked)
+        pending[(obj.user_id, _progress_key(obj))] = _tutor_item(obj) if alive else None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_progress_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    forget = session.info.pop(_FORGET_KEY, set())
+    for (user_id, key), item in (pending or {}).items():
+        if user_id not in forget:
+            tutor_contexts.apply(user_id, key, item)
+    for user_id in forget:
+        tutor_contexts.forget(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_savepoint_changes(session: Session, previous_transaction: SessionTransaction) -> None:
+    # A rolled-back savepoint undoes some of the collected rows, but not which
+    # ones; reload those users' windows after the commit instead of patching.
+    pending = session.info.get(_PENDING_KEY)
+    if previous_transaction.nested and pending:
+        session.info.setdefault(_FORGET_KEY, set()).update(user_id for user_id, _ in pending)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_progress_changes(session: Session, transaction: SessionTransaction) -> None:
+    # Only the outermost transaction ending without a commit drops the
+    # changes; ``after_rollback`` would also fire for a savepoint.
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_FORGET_KEY, None)
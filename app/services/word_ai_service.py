@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import json
 import re
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
+from functools import partial
 
 from openai import AsyncOpenAI
 from sqlalchemy import delete, select
@@ -11,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.cefr import CEFR_TAG_SLUGS, normalize_cefr_level
 from app.core.config import settings
 from app.core.languages import language_display_name
+from app.core.single_flight import SingleFlight, advisory_xact_lock
 from app.core.tags import (
     TAG_BY_SLUG,
     VERB_ITEM,
@@ -32,13 +35,21 @@ from app.db.models import (
     WordTag,
     WordTranslation,
 )
-from app.services.ai_usage import record_ai_usage
+from app.services.ai_cache import get_cached_response, store_cached_response
+from app.services.ai_usage import (
+    CACHE_HIT_STATUS,
+    estimate_cost_usd,
+    record_ai_usage,
+    token_counts,
+)
 from app.data.tutorial_content import tutorial_definition, tutorial_notes
 from app.services.offline_dictionary_service import (
     RankedSense,
     find_ranked_sense,
+    find_ranked_senses,
     select_dictionary_sense,
 )
+from app.services.openai_client import get_openai_client
 
 WORD_AI_MODEL = "gpt-5.6-luna"
 # Derived so the provenance tag follows the model instead of drifting from it.
@@ -52,6 +63,12 @@ class WordAIError(RuntimeError):
     pass
 
 
+# Plain (context-free) lookups of the same new word by concurrent requests
+# share one AI call; each request then persists/reuses the shared rows.
+_SHARED_LOOKUPS: SingleFlight[dict] = SingleFlight()
+MAX_BULK_WORDS = 50
+
+
 @dataclass(slots=True)
 class LexicalContent:
     id: int | None
@@ -283,24 +300,44 @@ def _expand_prompt(learning_lang: Language) -> str:
     )
 
 
-async def _call_openai_json(
+async def _call_openai(
     client: AsyncOpenAI,
     system: str,
     user: str,
     *,
-    db: AsyncSession | None = None,
-    user_id: int | None = None,
-    feature: str | None = None,
-    request_label: str | None = None,
-    extra_data: dict[str, object] | None = None,
-) -> dict:
+    json_mode: bool,
+    db: AsyncSession | None,
+    user_id: int | None,
+    feature: str | None,
+    request_label: str | None,
+    extra_data: dict[str, object] | None,
+    cache: bool,
+) -> str:
+    cacheable = cache and db is not None and feature is not None
+    if cacheable:
+        cached = await get_cached_response(
+            db, model=WORD_AI_MODEL, system=system, user=user
+        )
+        if cached is not None:
+            await record_ai_usage(
+                db,
+                user_id=user_id,
+                feature=feature,
+                model=WORD_AI_MODEL,
+                usage=None,
+                request_label=request_label,
+                extra_data=extra_data,
+                status=CACHE_HIT_STATUS,
+            )
+            return cached
+
     response = await client.chat.completions.create(
         model=WORD_AI_MODEL,
-        response_format={"type": "json_object"},
         messages=[
             {"role": "system", "content": system},
             {"role": "user", "content": user},
         ],
+        **({"response_format": {"type": "json_object"}} if json_mode else {}),
     )
     if db is not None and feature is not None:
         await record_ai_usage(
@@ -314,7 +351,51 @@ async def _call_openai_json(
         )
     if not response.choices:
         raise WordAIError("AI returned no choices")
-    content = response.choices[0].message.content or "{}"
+    content = response.choices[0].message.content or ("{}" if json_mode else "")
+    if cacheable:
+        if json_mode:
+            try:
+                json.loads(content)
+            except json.JSONDecodeError:
+                return content
+        await store_cached_response(
+            db,
+            feature=feature,
+            model=WORD_AI_MODEL,
+            system=system,
+            user=user,
+            content=content,
+            cost_usd=estimate_cost_usd(
+                WORD_AI_MODEL, *token_counts(response.usage)[:2]
+            )[2],
+        )
+    return content
+
+
+async def _call_openai_json(
+    client: AsyncOpenAI,
+    system: str,
+    user: str,
+    *,
+    db: AsyncSession | None = None,
+    user_id: int | None = None,
+    feature: str | None = None,
+    request_label: str | None = None,
+    extra_data: dict[str, object] | None = None,
+    cache: bool = False,
+) -> dict:
+    content = await _call_openai(
+        client,
+        system,
+        user,
+        json_mode=True,
+        db=db,
+        user_id=user_id,
+        feature=feature,
+        request_label=request_label,
+        extra_data=extra_data,
+        cache=cache,
+    )
     try:
         return json.loads(content)
     except json.JSONDecodeError as exc:
@@ -331,27 +412,20 @@ async def _call_openai_text(
     feature: str | None = None,
     request_label: str | None = None,
     extra_data: dict[str, object] | None = None,
+    cache: bool = False,
 ) -> str:
-    response = await client.chat.completions.create(
-        model=WORD_AI_MODEL,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
+    return await _call_openai(
+        client,
+        system,
+        user,
+        json_mode=False,
+        db=db,
+        user_id=user_id,
+        feature=feature,
+        request_label=request_label,
+        extra_data=extra_data,
+        cache=cache,
     )
-    if db is not None and feature is not None:
-        await record_ai_usage(
-            db,
-            user_id=user_id,
-            feature=feature,
-            model=WORD_AI_MODEL,
-            usage=response.usage,
-            request_label=request_label,
-            extra_data=extra_data,
-        )
-    if not response.choices:
-        raise WordAIError("AI returned no choices")
-    return response.choices[0].message.content or ""
 
 
 async def present_definitions(
@@ -419,7 +493,7 @@ async def present_definitions(
         "keys as the input."
     )
     payload = await _call_openai_json(
-        AsyncOpenAI(api_key=settings.openai_api_key),
+        get_openai_client(),
         system,
         json.dumps(
             {
@@ -445,6 +519,7 @@ async def present_definitions(
             "definition_language_code": definition_language.code.upper(),
             "definition_count": len(definitions),
         },
+        cache=True,
     )
     translated_raw = payload.get("definitions")
     if not isinstance(translated_raw, dict):
@@ -822,6 +897,7 @@ async def _answer_question_from_definition(
                 "has_context": bool((context or "").strip()),
                 "has_question": True,
             },
+            cache=True,
         )
     ).strip()
 
@@ -907,6 +983,273 @@ async def _is_legacy_manual_pseudo_definition(
     )
 
 
+async def _translated_from_offline(
+    db: AsyncSession,
+    *,
+    word: Word,
+    ranked: RankedSense,
+    learning_lang: Language,
+    mother_tongue: Language,
+    allow_global_write: bool,
+    question_answer: str | None = None,
+) -> TranslatedWord:
+    translated = _translated_from_ranked(
+        word=word,
+        ranked=ranked,
+        target_language_id=mother_tongue.id,
+        target_language_code=mother_tongue.code,
+        source_language_code=learning_lang.code,
+        question_answer=question_answer,
+    )
+    if allow_global_write:
+        tag_slugs = _classification_tags(
+            await _word_tag_slugs(db, word_id=word.id),
+            part_of_speech=translated.part_of_speech,
+            cefr_level=translated.cefr_level,
+        )
+        await _attach_word_tags(db, word_id=word.id, tag_slugs=tag_slugs)
+        if learning_lang.code.upper() != mother_tongue.code.upper():
+            await _sync_global_learning_inventory(
+                db,
+                word=word,
+                target_language_id=mother_tongue.id,
+                natives=translated.natives or [],
+                part_of_speech=translated.part_of_speech,
+                cefr_level=translated.cefr_level,
+                tag_slugs=tag_slugs,
+                source=ranked.sense.source,
+            )
+    return translated
+
+
+async def _store_translation_payload(
+    db: AsyncSession,
+    *,
+    payload: dict,
+    cleaned_input: str,
+    word_row: Word | None,
+    lexical: WordLexicalEntry | None,
+    repairable_manual_lexical: WordLexicalEntry | None,
+    learning_lang: Language,
+    mother_tongue: Language,
+    allow_global_write: bool,
+    force: bool,
+    cleaned_question: str | None,
+) -> TranslatedWord:
+    """Turn a full-lookup AI payload into a result, persisting shared rows.
+
+    Only a plain lookup (``allow_global_write``) writes the global cache;
+    contextual/question results stay private to the caller.
+    """
+    monolingual = learning_lang.code.upper() == mother_tongue.code.upper()
+    status = str(payload.get("status") or "exact").lower()
+
+    if status == "not_found":
+        suggestions_raw = payload.get("suggestions") or []
+        suggestions = [
+            str(s).strip() for s in suggestions_raw if isinstance(s, str) and s.strip()
+        ][:3]
+        return TranslatedWord(status="not_found", suggestions=suggestions)
+
+    if status not in ("exact", "corrected", "ambiguous"):
+        status = "exact"  # be forgiving with model deviations
+
+    canonical = str(payload.get("canonical_text") or cleaned_input).strip().lower()
+    definition = str(payload.get("definition") or "").strip()
+    synonyms = payload.get("synonyms") or []
+    examples = payload.get("examples") or []
+    general_note = str(payload.get("general_note") or "").strip() or None
+    if not _note_language_ok(general_note, mother_tongue.code):
+        general_note = None
+    natives_raw = _normalise_native_entries(
+        payload.get("native_translations"), mother_tongue.code
+    )
+    detected_lang = str(payload.get("detected_input_language") or "").strip().upper() or None
+    original_input = str(payload.get("original_input") or "").strip() or None
+    suggested_tags = _normalise_tags(payload.get("suggested_tags"))
+    part_of_speech = _normalise_part_of_speech(payload.get("part_of_speech"))
+    cefr_level = _normalise_ai_cefr(payload.get("cefr_level"))
+    question_answer = (
+        str(payload.get("question_answer") or "").strip() or None
+        if cleaned_question
+        else None
+    )
+
+    if not definition or (not monolingual and not natives_raw):
+        required = (
+            "definition"
+            if monolingual
+            else "definition, native_translations"
+        )
+        raise WordAIError(f"AI response missing required fields ({required})")
+
+    # Canonical text is authoritative. A cached conjugated/spelling variant
+    # must never receive the canonical headword's definition or verb row.
+    if word_row is None or word_row.text != canonical:
+        existing_lookup = await db.execute(
+            select(Word).where(
+                Word.text == canonical,
+                Word.language_id == learning_lang.id,
+            )
+        )
+        existing_word = existing_lookup.scalar_one_or_none()
+        if existing_word is not None:
+            word_row = existing_word
+            lex_lookup = await db.execute(
+                select(WordLexicalEntry).where(WordLexicalEntry.word_id == word_row.id)
+            )
+            lexical = lex_lookup.scalar_one_or_none()
+            if lexical is not None and await _is_legacy_manual_pseudo_definition(
+                db, lexical
+            ):
+                repairable_manual_lexical = lexical
+                lexical = None
+        else:
+            word_row = Word(text=canonical, language_id=learning_lang.id)
+            db.add(word_row)
+            await db.flush()
+            lexical = None
+
+    assert word_row is not None
+    if not allow_global_write:
+        suggested_tags = _classification_tags(
+            suggested_tags,
+            part_of_speech=part_of_speech,
+            cefr_level=cefr_level,
+        )
+        return TranslatedWord(
+            status=status,
+            word=word_row,
+            lexical=LexicalContent(
+                id=None,
+                word_id=word_row.id,
+                definition=definition,
+                synonyms=synonyms if isinstance(synonyms, list) else [],
+                examples=examples if isinstance(examples, list) else [],
+            ),
+            natives=(
+                []
+                if monolingual
+                else [
+                    NativeContent(
+                        id=None,
+                        word_id=word_row.id,
+                        native_language_id=mother_tongue.id,
+                        translation=entry["translation"],
+                        note=entry.get("note"),
+                    )
+                    for entry in natives_raw
+                ]
+            ),
+            general_note=general_note,
+            suggested_tags=suggested_tags,
+            detected_input_language=detected_lang,
+            original_input=original_input,
+            question_answer=question_answer,
+            ranking_method="private_ai",
+            reportable=False,
+            part_of_speech=part_of_speech,
+            cefr_level=cefr_level,
+        )
+
+    cefr_level = word_row.cefr_level or cefr_level
+    suggested_tags = _classification_tags(
+        suggested_tags,
+        part_of_speech=part_of_speech,
+        cefr_level=cefr_level,
+    )
+    fresh_lexical = False
+    if lexical is None:
+        if (
+            repairable_manual_lexical is not None
+            and repairable_manual_lexical.word_id == word_row.id
+        ):
+            lexical = repairable_manual_lexical
+            lexical.definition = definition
+            lexical.synonyms = synonyms if isinstance(synonyms, list) else []
+            lexical.examples = examples if isinstance(examples, list) else []
+            lexical.source = WORD_AI_SOURCE
+        else:
+            lexical = WordLexicalEntry(
+                word_id=word_row.id,
+                definition=definition,
+                synonyms=synonyms if isinstance(synonyms, list) else [],
+                examples=examples if isinstance(examples, list) else [],
+                source=WORD_AI_SOURCE,
+            )
+            db.add(lexical)
+        fresh_lexical = True
+    else:
+        lexical.definition = definition
+        lexical.synonyms = synonyms if isinstance(synonyms, list) else []
+        lexical.examples = examples if isinstance(examples, list) else []
+        lexical.source = WORD_AI_SOURCE
+
+    # A same-language lookup stores lexical knowledge only. Identity
+    # translations would leak into the translation trainer as copy drills.
+    if monolingual:
+        natives = []
+        fresh_natives = False
+    # Replace native translations for this (word, mother_tongue) when fresh/forced.
+    elif force or not await _has_natives(db, word_row.id, mother_tongue.id):
+        if force:
+            await db.execute(
+                delete(WordNativeTranslation).where(
+                    WordNativeTranslation.word_id == word_row.id,
+                    WordNativeTranslation.native_language_id == mother_tongue.id,
+                )
+            )
+        natives = await _insert_natives(
+            db,
+            word_id=word_row.id,
+            native_lang_id=mother_tongue.id,
+            entries=natives_raw,
+        )
+        fresh_natives = True
+    else:
+        natives = await _load_natives(db, word_row.id, mother_tongue.id)
+        fresh_natives = False
+
+    await db.flush()
+    await _attach_word_tags(db, word_id=word_row.id, tag_slugs=suggested_tags)
+    sense = await _sync_primary_sense(
+        db,
+        word=word_row,
+        lexical=lexical,
+        natives=natives,
+        part_of_speech=part_of_speech,
+    )
+    if not monolingual:
+        await _sync_global_learning_inventory(
+            db,
+            word=word_row,
+            target_language_id=mother_tongue.id,
+            natives=natives,
+            part_of_speech=part_of_speech,
+            cefr_level=cefr_level,
+            tag_slugs=suggested_tags,
+            source=WORD_AI_SOURCE,
+        )
+    return TranslatedWord(
+        status=status,
+        word=word_row,
+        lexical=lexical,
+        natives=natives,
+        general_note=general_note,
+        suggested_tags=suggested_tags,
+        detected_input_language=detected_lang,
+        original_input=original_input,
+        fresh_lexical=fresh_lexical,
+        fresh_natives=fresh_natives,
+        selected_sense_id=sense.id,
+        sense_candidates=[_sense_candidate(sense)],
+        ranking_method="global_ai_plain_lookup",
+        question_answer=question_answer,
+        part_of_speech=part_of_speech,
+        cefr_level=word_row.cefr_level,
+    )
+
+
 async def translate_word(
     db: AsyncSession,
     *,
@@ -917,6 +1260,37 @@ async def translate_word(
     question: str | None = None,
     force: bool = False,
     user_id: int | None = None,
+) -> TranslatedWord:
+    return await _translate_word(
+        db,
+        input_text=input_text,
+        learning_lang=learning_lang,
+        mother_tongue=mother_tongue,
+        context=context,
+        question=question,
+        force=force,
+        user_id=user_id,
+        shared_lookup_locked=False,
+    )
+
+
+def _shared_lookup_key(
+    cleaned_input: str, learning_lang: Language, mother_tongue: Language
+) -> tuple[str, int, int]:
+    return (cleaned_input.lower(), learning_lang.id, mother_tongue.id)
+
+
+async def _translate_word(
+    db: AsyncSession,
+    *,
+    input_text: str,
+    learning_lang: Language,
+    mother_tongue: Language,
+    context: str | None,
+    question: str | None,
+    force: bool,
+    user_id: int | None,
+    shared_lookup_locked: bool,
 ) -> TranslatedWord:
     cleaned_input = input_text.strip()
     if not cleaned_input:
@@ -972,7 +1346,7 @@ async def translate_word(
                         "translate this sense but cannot answer an open-ended question."
                     )
                 question_answer = await _answer_question_for_sense(
-                    AsyncOpenAI(api_key=settings.openai_api_key),
+                    get_openai_client(),
                     db=db,
                     user_id=user_id,
                     word=word_row,
@@ -982,35 +1356,15 @@ async def translate_word(
                     context=cleaned_context,
                     question=cleaned_question,
                 )
-            translated = _translated_from_ranked(
+            return await _translated_from_offline(
+                db,
                 word=word_row,
                 ranked=ranked,
-                target_language_id=mother_tongue.id,
-                target_language_code=mother_tongue.code,
-                source_language_code=learning_lang.code,
+                learning_lang=learning_lang,
+                mother_tongue=mother_tongue,
+                allow_global_write=allow_global_write,
                 question_answer=question_answer,
             )
-            if allow_global_write:
-                tag_slugs = _classification_tags(
-                    await _word_tag_slugs(db, word_id=word_row.id),
-                    part_of_speech=translated.part_of_speech,
-                    cefr_level=translated.cefr_level,
-                )
-                await _attach_word_tags(
-                    db, word_id=word_row.id, tag_slugs=tag_slugs
-                )
-                if not monolingual:
-                    await _sync_global_learning_inventory(
-                        db,
-                        word=word_row,
-                        target_language_id=mother_tongue.id,
-                        natives=translated.natives or [],
-                        part_of_speech=translated.part_of_speech,
-                        cefr_level=translated.cefr_level,
-                        tag_slugs=tag_slugs,
-                        source=ranked.sense.source,
-                    )
-            return translated
 
         # Compatibility path for databases created without running the
         # backfill migration: an existing one-sense cache still works offline.
@@ -1027,7 +1381,7 @@ async def translate_word(
                             "entry cannot answer an open-ended question."
                         )
                     question_answer = await _answer_question_from_definition(
-                        AsyncOpenAI(api_key=settings.openai_api_key),
+                        get_openai_client(),
                         db=db,
                         user_id=user_id,
                         word=word_row,
@@ -1078,12 +1432,37 @@ async def translate_word(
         raise WordAIError(
             "No offline dictionary entry was found and OPENAI_API_KEY is not configured"
         )
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    client = get_openai_client()
 
     # Full miss (or force): contextual/question results stay private. Only a
     # plain word lookup is allowed to populate the shared AI cache.
     if lexical is None or force or cleaned_context is not None:
-        payload = await _call_openai_json(
+        shared_key = (
+            _shared_lookup_key(cleaned_input, learning_lang, mother_tongue)
+            if allow_global_write and not force
+            else None
+        )
+        if (
+            shared_key is not None
+            and not shared_lookup_locked
+            and not _SHARED_LOOKUPS.pending(shared_key)
+            and await advisory_xact_lock(db, "word_lookup", *shared_key)
+        ):
+            # Another worker may have committed this entry while we waited
+            # for the lock; re-run the offline path before paying for AI.
+            return await _translate_word(
+                db,
+                input_text=input_text,
+                learning_lang=learning_lang,
+                mother_tongue=mother_tongue,
+                context=context,
+                question=question,
+                force=force,
+                user_id=user_id,
+                shared_lookup_locked=True,
+            )
+        call_ai = partial(
+            _call_openai_json,
             client,
             _system_prompt(learning_lang, mother_tongue),
             _user_message(cleaned_input, cleaned_context, cleaned_question),
@@ -1100,212 +1479,31 @@ async def translate_word(
                 "force": force,
                 "shared_cache_write": allow_global_write,
             },
+            # Shared lookups persist to the dictionary tables; only private
+            # (context/question) results need the response cache.
+            cache=not allow_global_write and not force,
         )
-        status = str(payload.get("status") or "exact").lower()
-
-        if status == "not_found":
-            suggestions_raw = payload.get("suggestions") or []
-            suggestions = [
-                str(s).strip() for s in suggestions_raw if isinstance(s, str) and s.strip()
-            ][:3]
-            return TranslatedWord(status="not_found", suggestions=suggestions)
-
-        if status not in ("exact", "corrected", "ambiguous"):
-            status = "exact"  # be forgiving with model deviations
-
-        canonical = str(payload.get("canonical_text") or cleaned_input).strip().lower()
-        definition = str(payload.get("definition") or "").strip()
-        synonyms = payload.get("synonyms") or []
-        examples = payload.get("examples") or []
-        general_note = str(payload.get("general_note") or "").strip() or None
-        if not _note_language_ok(general_note, mother_tongue.code):
-            general_note = None
-        natives_raw = _normalise_native_entries(
-            payload.get("native_translations"), mother_tongue.code
+        payload = (
+            await _SHARED_LOOKUPS.run(shared_key, call_ai)
+            if shared_key is not None
+            else await call_ai()
         )
-        detected_lang = str(payload.get("detected_input_language") or "").strip().upper() or None
-        original_input = str(payload.get("original_input") or "").strip() or None
-        suggested_tags = _normalise_tags(payload.get("suggested_tags"))
-        part_of_speech = _normalise_part_of_speech(payload.get("part_of_speech"))
-        cefr_level = _normalise_ai_cefr(payload.get("cefr_level"))
-        question_answer = (
-            str(payload.get("question_answer") or "").strip() or None
-            if cleaned_question
-            else None
-        )
-
-        if not definition or (not monolingual and not natives_raw):
-            required = (
-                "definition"
-                if monolingual
-                else "definition, native_translations"
-            )
-            raise WordAIError(f"AI response missing required fields ({required})")
-
-        # Canonical text is authoritative. A cached conjugated/spelling variant
-        # must never receive the canonical headword's definition or verb row.
-        if word_row is None or word_row.text != canonical:
-            existing_lookup = await db.execute(
-                select(Word).where(
-                    Word.text == canonical,
-                    Word.language_id == learning_lang.id,
-                )
-            )
-            existing_word = existing_lookup.scalar_one_or_none()
-            if existing_word is not None:
-                word_row = existing_word
-                lex_lookup = await db.execute(
-                    select(WordLexicalEntry).where(WordLexicalEntry.word_id == word_row.id)
-                )
-                lexical = lex_lookup.scalar_one_or_none()
-                if lexical is not None and await _is_legacy_manual_pseudo_definition(
-                    db, lexical
-                ):
-                    repairable_manual_lexical = lexical
-                    lexical = None
-            else:
-                word_row = Word(text=canonical, language_id=learning_lang.id)
-                db.add(word_row)
-                await db.flush()
-                lexical = None
-
-        assert word_row is not None
-        if not allow_global_write:
-            suggested_tags = _classification_tags(
-                suggested_tags,
-                part_of_speech=part_of_speech,
-                cefr_level=cefr_level,
-            )
-            return TranslatedWord(
-                status=status,
-                word=word_row,
-                lexical=LexicalContent(
-                    id=None,
-                    word_id=word_row.id,
-                    definition=definition,
-                    synonyms=synonyms if isinstance(synonyms, list) else [],
-                    examples=examples if isinstance(examples, list) else [],
-                ),
-                natives=(
-                    []
-                    if monolingual
-                    else [
-                        NativeContent(
-                            id=None,
-                            word_id=word_row.id,
-                            native_language_id=mother_tongue.id,
-                            translation=entry["translation"],
-                            note=entry.get("note"),
-                        )
-                        for entry in natives_raw
-                    ]
-                ),
-                general_note=general_note,
-                suggested_tags=suggested_tags,
-                detected_input_language=detected_lang,
-                original_input=original_input,
-                question_answer=question_answer,
-                ranking_method="private_ai",
-                reportable=False,
-                part_of_speech=part_of_speech,
-                cefr_level=cefr_level,
-            )
-
-        cefr_level = word_row.cefr_level or cefr_level
-        suggested_tags = _classification_tags(
-            suggested_tags,
-            part_of_speech=part_of_speech,
-            cefr_level=cefr_level,
-        )
-        fresh_lexical = False
-        if lexical is None:
-            if (
-                repairable_manual_lexical is not None
-                and repairable_manual_lexical.word_id == word_row.id
-            ):
-                lexical = repairable_manual_lexical
-                lexical.definition = definition
-                lexical.synonyms = synonyms if isinstance(synonyms, list) else []
-                lexical.examples = examples if isinstance(examples, list) else []
-                lexical.source = WORD_AI_SOURCE
-            else:
-                lexical = WordLexicalEntry(
-                    word_id=word_row.id,
-                    definition=definition,
-                    synonyms=synonyms if isinstance(synonyms, list) else [],
-                    examples=examples if isinstance(examples, list) else [],
-                    source=WORD_AI_SOURCE,
-                )
-                db.add(lexical)
-            fresh_lexical = True
-        else:
-            lexical.definition = definition
-            lexical.synonyms = synonyms if isinstance(synonyms, list) else []
-            lexical.examples = examples if isinstance(examples, list) else []
-            lexical.source = WORD_AI_SOURCE
-
-        # A same-language lookup stores lexical knowledge only. Identity
-        # translations would leak into the translation trainer as copy drills.
-        if monolingual:
-            natives = []
-            fresh_natives = False
-        # Replace native translations for this (word, mother_tongue) when fresh/forced.
-        elif force or not await _has_natives(db, word_row.id, mother_tongue.id):
-            if force:
-                await db.execute(
-                    delete(WordNativeTranslation).where(
-                        WordNativeTranslation.word_id == word_row.id,
-                        WordNativeTranslation.native_language_id == mother_tongue.id,
-                    )
-                )
-            natives = await _insert_natives(
-                db,
-                word_id=word_row.id,
-                native_lang_id=mother_tongue.id,
-                entries=natives_raw,
-            )
-            fresh_natives = True
-        else:
-            natives = await _load_natives(db, word_row.id, mother_tongue.id)
-            fresh_natives = False
-
-        await db.flush()
-        await _attach_word_tags(db, word_id=word_row.id, tag_slugs=suggested_tags)
-        sense = await _sync_primary_sense(
+        if shared_key is not None and not shared_lookup_locked:
+            # Joined an in-process flight: wait for the leader's commit so the
+            # canonical re-check below reuses its rows instead of racing them.
+            await advisory_xact_lock(db, "word_lookup", *shared_key)
+        return await _store_translation_payload(
             db,
-            word=word_row,
-            lexical=lexical,
-            natives=natives,
-            part_of_speech=part_of_speech,
-        )
-        if not monolingual:
-            await _sync_global_learning_inventory(
-                db,
-                word=word_row,
-                target_language_id=mother_tongue.id,
-                natives=natives,
-                part_of_speech=part_of_speech,
-                cefr_level=cefr_level,
-                tag_slugs=suggested_tags,
-                source=WORD_AI_SOURCE,
-            )
-        return TranslatedWord(
-            status=status,
-            word=word_row,
+            payload=payload,
+            cleaned_input=cleaned_input,
+            word_row=word_row,
             lexical=lexical,
-            natives=natives,
-            general_note=general_note,
-            suggested_tags=suggested_tags,
-            detected_input_language=detected_lang,
-            original_input=original_input,
-            fresh_lexical=fresh_lexical,
-            fresh_natives=fresh_natives,
-            selected_sense_id=sense.id,
-            sense_candidates=[_sense_candidate(sense)],
-            ranking_method="global_ai_plain_lookup",
-            question_answer=question_answer,
-            part_of_speech=part_of_speech,
-            cefr_level=word_row.cefr_level,
+            repairable_manual_lexical=repairable_manual_lexical,
+            learning_lang=learning_lang,
+            mother_tongue=mother_tongue,
+            allow_global_write=allow_global_write,
+            force=force,
+            cleaned_question=cleaned_question,
         )
 
     # Monolingual cache hits return above, and contextual/forced lookups take
@@ -1333,6 +1531,7 @@ async def translate_word(
             "has_question": cleaned_question is not None,
             "shared_cache_write": allow_global_write,
         },
+        cache=not allow_global_write,
     )
     natives_raw = _normalise_native_entries(
         native_payload.get("native_translations"), mother_tongue.code
@@ -1428,6 +1627,207 @@ async def translate_word(
     )
 
 
+@dataclass(slots=True)
+class BulkWordInput:
+    text: str
+    context: str | None = None
+
+
+@dataclass(slots=True)
+class BulkWordResult:
+    index: int
+    input_text: str
+    result: TranslatedWord | None = None
+    error: str | None = None
+
+
+def _bulk_system_prompt(learning_lang: Language, mother_tongue: Language) -> str:
+    return (
+        f"{_system_prompt(learning_lang, mother_tongue)}\n"
+        "\n"
+        "BATCH MODE: the user message is a JSON object whose 'entries' array holds "
+        "several independent lookups, each {id, word_or_phrase, context, "
+        "context_is_quoted_source_material}. Handle every entry exactly as a single "
+        "lookup described above. Return ONE strict JSON object "
+        '{"results": [...]} with one object per entry; each object carries the '
+        "entry's 'id' plus every field of a single-lookup response."
+    )
+
+
+def _bulk_user_message(entries: list[tuple[int, str, str | None]]) -> str:
+    return json.dumps(
+        {
+            "entries": [
+                {
+                    "id": entry_id,
+                    "word_or_phrase": text,
+                    "context": context or "",
+                    "context_is_quoted_source_material": True,
+                }
+                for entry_id, text, context in entries
+            ]
+        },
+        ensure_ascii=False,
+    )
+
+
+async def translate_words_bulk(
+    db: AsyncSession,
+    *,
+    inputs: list[BulkWordInput],
+    learning_lang: Language,
+    mother_tongue: Language,
+    user_id: int | None = None,
+) -> AsyncIterator[BulkWordResult]:
+    """Resolve a word list with one word query, one E5 pass and one AI request.
+
+    Offline hits are yielded first, then words that need the AI. Duplicate
+    (word, context) inputs are resolved once and yielded for every index.
+    """
+    if len(inputs) > MAX_BULK_WORDS:
+        raise WordAIError(f"At most {MAX_BULK_WORDS} words can be looked up at once")
+    monolingual = learning_lang.code.upper() == mother_tongue.code.upper()
+
+    groups: dict[tuple[str, str | None], list[tuple[int, str]]] = {}
+    for index, item in enumerate(inputs):
+        text = item.text.strip()
+        if not text:
+            yield BulkWordResult(index=index, input_text=item.text, error="Empty input")
+            continue
+        context = (item.context or "").strip() or None
+        groups.setdefault((text.lower(), context), []).append((index, text))
+
+    def results_for(
+        key: tuple[str, str | None],
+        result: TranslatedWord | None = None,
+        error: str | None = None,
+    ) -> list[BulkWordResult]:
+        return [
+            BulkWordResult(index=index, input_text=text, result=result, error=error)
+            for index, text in groups[key]
+        ]
+
+    if not groups:
+        return
+    word_lookup = await db.execute(
+        select(Word).where(
+            Word.text.in_({text for text, _ in groups}),
+            Word.language_id == learning_lang.id,
+        )
+    )
+    words_by_text = {word.text: word for word in word_lookup.scalars().all()}
+    known = [key for key in groups if key[0] in words_by_text]
+    misses = [key for key in groups if key[0] not in words_by_text]
+
+    ranked_senses = await find_ranked_senses(
+        db,
+        lookups=[(words_by_text[text], context) for text, context in known],
+        target_language_id=mother_tongue.id,
+        require_translation=not monolingual,
+    )
+    unresolved: list[tuple[str, str | None]] = []
+    for key, ranked in zip(known, ranked_senses):
+        if ranked is None:
+            unresolved.append(key)
+            continue
+        result = await _translated_from_offline(
+            db,
+            word=words_by_text[key[0]],
+            ranked=ranked,
+            learning_lang=learning_lang,
+            mother_tongue=mother_tongue,
+            allow_global_write=key[1] is None,
+        )
+        for item in results_for(key, result=result):
+            yield item
+
+    # Known words without a usable sense (legacy single-sense cache, or a
+    # missing target language) take the regular per-word path.
+    for key in unresolved:
+        try:
+            result = await translate_word(
+                db,
+                input_text=groups[key][0][1],
+                learning_lang=learning_lang,
+                mother_tongue=mother_tongue,
+                context=key[1],
+                user_id=user_id,
+            )
+        except WordAIError as exc:
+            batch = results_for(key, error=str(exc))
+        else:
+            batch = results_for(key, result=result)
+        for item in batch:
+            yield item
+
+    if not misses:
+        return
+    if not settings.openai_api_key:
+        for key in misses:
+            for item in results_for(
+                key,
+                error="No offline dictionary entry was found and OPENAI_API_KEY is not configured",
+            ):
+                yield item
+        return
+
+    entries = [
+        (entry_id, groups[key][0][1], key[1]) for entry_id, key in enumerate(misses)
+    ]
+    payload = await _call_openai_json(
+        get_openai_client(),
+        _bulk_system_prompt(learning_lang, mother_tongue),
+        _bulk_user_message(entries),
+        db=db,
+        user_id=user_id,
+        feature="word_translate_bulk",
+        request_label=f"{len(entries)} words {learning_lang.code}->{mother_tongue.code}",
+        extra_data={
+            "input_texts": [text for _, text, _ in entries],
+            "learning_language_code": learning_lang.code,
+            "mother_tongue_code": mother_tongue.code,
+            "contextual_count": sum(1 for _, _, context in entries if context),
+        },
+    )
+    payload_by_id: dict[int, dict] = {}
+    for item in payload.get("results") or []:
+        if isinstance(item, dict) and isinstance(item.get("id"), int):
+            payload_by_id.setdefault(item["id"], item)
+
+    for entry_id, text, context in entries:
+        key = misses[entry_id]
+        item_payload = payload_by_id.get(entry_id)
+        if item_payload is None:
+            batch = results_for(key, error="AI returned no result for this word")
+        else:
+            if context is None:
+                await advisory_xact_lock(
+                    db,
+                    "word_lookup",
+                    *_shared_lookup_key(text, learning_lang, mother_tongue),
+                )
+            try:
+                result = await _store_translation_payload(
+                    db,
+                    payload=item_payload,
+                    cleaned_input=text,
+                    word_row=None,
+                    lexical=None,
+                    repairable_manual_lexical=None,
+                    learning_lang=learning_lang,
+                    mother_tongue=mother_tongue,
+                    allow_global_write=context is None,
+                    force=False,
+                    cleaned_question=None,
+                )
+            except WordAIError as exc:
+                batch = results_for(key, error=str(exc))
+            else:
+                batch = results_for(key, result=result)
+        for item in batch:
+            yield item
+
+
 async def translate_selected_sense(
     db: AsyncSession,
     *,
@@ -1464,7 +1864,7 @@ async def translate_selected_sense(
                 "offline but the open-ended question cannot be answered."
             )
         question_answer = await _answer_question_for_sense(
-            AsyncOpenAI(api_key=settings.openai_api_key),
+            get_openai_client(),
             db=db,
             user_id=user_id,
             word=word,
@@ -1745,7 +2145,7 @@ async def expand_word(
     if lexical is None:
         raise WordAIError("Lexical entry not found")
 
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    client = get_openai_client()
     addition = await _call_openai_text(
         client,
         _expand_prompt(learning_lang),
@@ -0,0 +1,90 @@
+"""Offline corpora for the hot-path micro-benchmarks.
+
+Everything is read from the seed CSVs in ``app/data`` so the suite needs no
+database, network or model files.
+"""
+
+from __future__ import annotations
+
+import csv
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from app.core.languages import LANGUAGE_DEFINITIONS
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "app" / "data"
+WORD_SEED = DATA_DIR / "legacy_seed" / "words" / "es_fr_top1000.csv"
+CONJUGATION_BATCHES = DATA_DIR / "curated_conjugations" / "batches"
+
+WORD_COLUMNS = {"ES": "spanish", "FR": "french", "RU": "russian"}
+# The curated batches hold thousands of tables per language; the first few
+# hundred (batch order = frequency order) keep a round well under a second.
+MAX_TABLES_PER_LANGUAGE = 300
+
+
+@dataclass(slots=True)
+class WordEntry:
+    prompt: str
+    accepted: list[str]
+    synonyms: list[str]
+
+
+@dataclass(slots=True)
+class ConjugationTable:
+    language_code: str
+    infinitive: str
+    tense: str
+    forms: dict[str, str]
+
+
+def _split_synonyms(raw: str) -> list[str]:
+    return [value.strip() for value in raw.split(";") if value.strip()]
+
+
+@pytest.fixture(scope="session")
+def word_corpus() -> dict[str, list[WordEntry]]:
+    """ES→FR, FR→ES and ES→RU prompts with accepted answers and synonyms."""
+    with WORD_SEED.open(encoding="utf-8-sig", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    corpus: dict[str, list[WordEntry]] = {}
+    for source, target in (("ES", "FR"), ("FR", "ES"), ("ES", "RU")):
+        source_column = WORD_COLUMNS[source]
+        target_column = WORD_COLUMNS[target]
+        corpus[f"{source}_{target}"] = [
+            WordEntry(
+                prompt=row[source_column].strip(),
+                accepted=[value.strip() for value in row[target_column].split(",") if value.strip()],
+                synonyms=_split_synonyms(row.get(f"{target_column} synonyms") or ""),
+            )
+            for row in rows
+            if row[source_column].strip() and row[target_column].strip()
+        ]
+    return corpus
+
+
+@pytest.fixture(scope="session")
+def conjugation_tables() -> dict[str, list[ConjugationTable]]:
+    """Complete curated FR/ES/RU tense tables keyed by language code."""
+    grouped: dict[tuple[str, str, str], dict[str, str]] = defaultdict(dict)
+    for path in sorted(CONJUGATION_BATCHES.glob("batch_*_conjugations.csv")):
+        with path.open(encoding="utf-8", newline="") as handle:
+            for row in csv.DictReader(handle):
+                language_code = row["language_code"]
+                if language_code not in WORD_COLUMNS:
+                    continue
+                grouped[(language_code, row["infinitive"], row["tense"])][row["pronoun"]] = row[
+                    "conjugated_form"
+                ]
+    tables: dict[str, list[ConjugationTable]] = defaultdict(list)
+    for (language_code, infinitive, tense), forms in grouped.items():
+        pronouns = LANGUAGE_DEFINITIONS[language_code]["pronoun_set"]
+        if len(tables[language_code]) >= MAX_TABLES_PER_LANGUAGE:
+            continue
+        if all(pronoun in forms for pronoun in pronouns):
+            tables[language_code].append(
+                ConjugationTable(language_code, infinitive, tense, {p: forms[p] for p in pronouns})
+            )
+    return dict(tables)
@@ -0,0 +1,152 @@
+"""Micro-benchmarks for the pure functions on every answer path.
+
+Each round processes a whole seed corpus, so timings are per corpus pass, not
+per call. Run with ``make bench`` (autosaves a baseline tagged with the commit)
+and ``make bench-compare`` to diff against the latest saved baseline.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.languages import LANGUAGE_DEFINITIONS
+from app.services.conjugation_engine import accepted_conjugation_forms, conjugation_answer_is_correct
+from app.services.normalization import normalize_for_comparison
+from app.services.semantic_grading import (
+    _lexical_score,
+    _ordered_lexical_score,
+    normalize_exact_answer,
+)
+from app.services.training_engine import WeightedItem, grade_translation, weighted_sample_without_replacement
+from app.services.training_service import _conjugation_form_groups
+
+PAIRS = ["ES_FR", "FR_ES", "ES_RU"]
+LANGUAGES = ["FR", "ES", "RU"]
+
+
+def _answers_for(entry) -> list[str]:
+    """A learner-like mix: exact, unaccented/uppercased, synonym and wrong answers."""
+    primary = entry.accepted[0]
+    answers = [primary, primary.upper(), primary.replace("é", "e").replace("ñ", "n")]
+    if entry.synonyms:
+        answers.append(entry.synonyms[0])
+    answers.append(entry.prompt)
+    return answers
+
+
+@pytest.mark.parametrize("pair", PAIRS)
+def test_normalize_for_comparison(benchmark, word_corpus, pair):
+    benchmark.group = "normalize_for_comparison"
+    texts = [
+        text
+        for entry in word_corpus[pair]
+        for text in (entry.prompt, *entry.accepted, *entry.synonyms)
+    ]
+
+    result = benchmark(lambda: [normalize_for_comparison(text) for text in texts])
+    assert len(result) == len(texts)
+
+
+@pytest.mark.parametrize("pair", PAIRS)
+def test_grade_translation(benchmark, word_corpus, pair):
+    benchmark.group = "grade_translation"
+    cases = [
+        (answer, entry.accepted, entry.synonyms)
+        for entry in word_corpus[pair]
+        for answer in _answers_for(entry)
+    ]
+
+    results = benchmark(lambda: [grade_translation(*case) for case in cases])
+    assert any(result.is_correct for result in results)
+
+
+@pytest.mark.parametrize("language_code", LANGUAGES)
+def test_accepted_conjugation_forms(benchmark, conjugation_tables, language_code):
+    benchmark.group = "accepted_conjugation_forms"
+    forms = [form for table in conjugation_tables[language_code] for form in table.forms.values()]
+
+    result = benchmark(lambda: [accepted_conjugation_forms(form, language_code) for form in forms])
+    assert len(result) == len(forms)
+
+
+@pytest.mark.parametrize("language_code", LANGUAGES)
+def test_conjugation_answer_is_correct(benchmark, conjugation_tables, language_code):
+    benchmark.group = "conjugation_answer_is_correct"
+    cases = [
+        (answer, form)
+        for table in conjugation_tables[language_code]
+        for form in table.forms.values()
+        for answer in (form, form.upper(), "xyz")
+    ]
+
+    result = benchmark(
+        lambda: [conjugation_answer_is_correct(answer, form, language_code) for answer, form in cases]
+    )
+    assert any(result)
+
+
+@pytest.mark.parametrize("language_code", LANGUAGES)
+def test_conjugation_form_groups(benchmark, conjugation_tables, language_code):
+    benchmark.group = "_conjugation_form_groups"
+    pronouns = list(LANGUAGE_DEFINITIONS[language_code]["pronoun_set"])
+    tables = [
+        {table.tense: table.forms}
+        for table in conjugation_tables[language_code]
+    ]
+
+    def run():
+        return [
+            _conjugation_form_groups(
+                table=table,
+                selected_tenses=list(table),
+                pronouns=pronouns,
+                language_code=language_code,
+            )
+            for table in tables
+        ]
+
+    result = benchmark(run)
+    assert len(result) == len(tables)
+
+
+@pytest.mark.parametrize(("pool_size", "count"), [(50, 10), (1000, 10), (1000, 50)])
+def test_weighted_sample_without_replacement(benchmark, pool_size, count):
+    benchmark.group = "weighted_sample_without_replacement"
+    rng = random.Random(pool_size)
+    now = datetime.now(timezone.utc)
+    items = [
+        WeightedItem(
+            item_id=item_id,
+            probability=rng.uniform(20.0, 5000.0),
+            last_seen=None if item_id % 7 == 0 else now - timedelta(hours=rng.uniform(0, 240)),
+        )
+        for item_id in range(pool_size)
+    ]
+
+    result = benchmark(weighted_sample_without_replacement, items, count)
+    assert len(result) == count
+
+
+@pytest.mark.parametrize("pair", PAIRS)
+def test_semantic_lexical_helpers(benchmark, word_corpus, pair):
+    benchmark.group = "semantic_grading lexical"
+    pairs = [
+        (", ".join(entry.accepted), "; ".join([*entry.synonyms, entry.accepted[0]]))
+        for entry in word_corpus[pair]
+    ]
+
+    def run():
+        return [
+            (
+                normalize_exact_answer(answer),
+                _lexical_score(answer, candidate),
+                _ordered_lexical_score(answer, candidate),
+            )
+            for answer, candidate in pairs
+        ]
+
+    result = benchmark(run)
+    assert len(result) == len(pairs)
@@ -0,0 +1,148 @@
+"""Micro-benchmarks for JSON response rendering on the largest API payloads.
+
+Payloads are synthetic but shaped like the real ones: the admin monitor
+(users, sessions, answered items, progress rows, chat messages) and a full
+100-entry word history page.
+
+- ``stdlib`` is the old path: ``isoformat()`` in the route, then Starlette's
+  ``json.dumps`` render. The word history route used to return a dict, so on
+  this path it also went through FastAPI's ``jsonable_encoder``.
+- ``orjson`` is ``app.core.responses.JSONResponse``, returned directly with
+  native datetimes.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse as StdlibJSONResponse
+
+from app.core.responses import JSONResponse
+
+START = datetime(2026, 3, 2, 9, 30, tzinfo=timezone.utc)
+
+
+def _monitor_payload() -> dict:
+    def at(index: int) -> datetime:
+        return START + timedelta(seconds=index * 37, microseconds=index * 911)
+
+    return {
+        "viewer": "admin",
+        "totals": {"users": 250, "sessions": 9000, "items": 120000, "messages": 4000},
+        "users": [
+            {"id": index, "username": f"learner{index}", "level": index % 30, "xp": index * 137,
+             "streak_days": index % 40, "theme": "arcade"}
+            for index in range(250)
+        ],
+        "active_sessions": [
+            {"id": index, "user_id": index, "mode": "word_translation", "language_pair": "es_fr",
+             "started_at": at(index), "config": {"queue": list(range(10)), "index": index % 10, "combo": 2}}
+            for index in range(40)
+        ],
+        "recent_sessions": [
+            {"id": index, "user_id": index % 250, "mode": "conjugation", "language_pair": "fr_conj",
+             "score": index % 11, "started_at": at(index), "completed_at": at(index + 9)}
+            for index in range(120)
+        ],
+        "recent_items": [
+            {"id": index, "session_id": index // 10, "item_type": "word", "item_id": index * 3,
+             "prompt": f"palabra {index}", "answer": f"mot {index}", "expected": f"mot {index}",
+             "correct": index % 3 != 0, "multiplier_applied": 1.25, "timestamp": at(index),
+             "meta": {"hint_used": index % 5 == 0, "latency_ms": 1800 + index}}
+            for index in range(300)
+        ],
+        "progress_rows": [
+            {"user_id": index % 250, "item_type": "verb", "item_id": index, "language_pair": "fr_es",
+             "probability": 1000.0 - index * 1.5, "times_seen": index % 17, "times_correct": index % 9,
+             "streak": index % 4, "last_seen": at(index)}
+            for index in range(300)
+        ],
+        "recent_messages": [
+            {"id": index, "role": "assistant" if index % 2 else "user",
+             "content": "Très bien ! Essaie maintenant avec le passé composé. " * 4, "created_at": at(index)}
+            for index in range(120)
+        ],
+    }
+
+
+def _word_history_payload() -> dict:
+    return {
+        "entries": [
+            {
+                "added_id": index,
+                "word_id": index,
+                "text": f"palabra{index}",
+                "language_pair": "es_fr",
+                "learning_language_code": "ES",
+                "mother_tongue_code": "FR",
+                "added_at": START + timedelta(minutes=index),
+                "lexical": {
+                    "part_of_speech": "noun",
+                    "gender": "f",
+                    "definition": "Unidad léxica con significado propio. " * 3,
+                    "examples": [f"Ejemplo {n} con la palabra {index}." for n in range(4)],
+                    "forms": {"plural": f"palabras{index}", "diminutive": f"palabrita{index}"},
+                },
+                "definition_language_code": "es",
+                "display_definition": {"text": "Unidad léxica con significado propio.", "language_code": "es"},
+                "lookup_mode": "translation",
+                "practice_eligible": True,
+                "natives": [
+                    {"translation": f"mot{index}-{n}", "priority": n, "source": "kaikki", "sense_id": index * 10 + n}
+                    for n in range(5)
+                ],
+                "context": "Leí la palabra en un libro." if index % 3 == 0 else None,
+                "question": None,
+                "question_answer": None,
+                "selected_sense_id": index * 10,
+                "tags": ["a2", "food", "daily-life"],
+            }
+            for index in range(100)
+        ]
+    }
+
+
+def _iso_everywhere(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: _iso_everywhere(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_iso_everywhere(item) for item in value]
+    return value
+
+
+def _stdlib_monitor(payload: dict) -> bytes:
+    return StdlibJSONResponse(_iso_everywhere(payload)).body
+
+
+def _orjson(payload: dict) -> bytes:
+    return JSONResponse(payload).body
+
+
+def _stdlib_history(payload: dict) -> bytes:
+    return StdlibJSONResponse(jsonable_encoder(payload)).body
+
+
+CASES = {
+    "admin_monitor": (_monitor_payload, _stdlib_monitor),
+    "word_history": (_word_history_payload, _stdlib_history),
+}
+
+
+@pytest.mark.parametrize("payload_name", sorted(CASES))
+@pytest.mark.parametrize("variant", ["orjson", "stdlib"])
+def test_render_json_response(benchmark, payload_name, variant):
+    build, stdlib = CASES[payload_name]
+    payload = build()
+    render = _orjson if variant == "orjson" else stdlib
+    benchmark.group = f"json_{payload_name}"
+
+    body = benchmark(render, payload)
+
+    benchmark.extra_info["bytes"] = len(body)
+    # Same document either way; only the encoder differs.
+    assert orjson.loads(body) == orjson.loads(stdlib(payload))
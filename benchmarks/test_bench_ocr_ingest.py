@@ -0,0 +1,85 @@
+"""Micro-benchmarks for the OCR image ingest path (decode, resize, BGR).
+
+Inputs are synthetic phone-camera JPEGs: 12 MP and 8 MP sensor sizes, noisy
+"paper" with dark text strokes, quality 90 and a sideways EXIF orientation.
+Each case also records decoded pixels and peak Python/NumPy allocations in
+``extra_info`` (Pillow's own buffers are not traced; decoded pixels stand in for them).
+"""
+
+from __future__ import annotations
+
+import io
+import tracemalloc
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageOps
+
+from app.services.ocr_service import _MAX_DIMENSION, _preprocess
+
+PHONE_SIZES = {"12mp": (4032, 3024), "8mp": (3264, 2448)}
+
+
+def _phone_jpeg(size: tuple[int, int]) -> bytes:
+    rng = np.random.default_rng(7)
+    noise = rng.integers(170, 235, size=(size[1] // 8, size[0] // 8, 3), dtype=np.uint8)
+    img = Image.fromarray(noise).resize(size, Image.BILINEAR)
+    draw = ImageDraw.Draw(img)
+    for row in range(80, size[1] - 80, 110):
+        draw.line((120, row, size[0] - 120, row + 6), fill=(30, 30, 40), width=14)
+    exif = img.getexif()
+    exif[0x0112] = 6
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", quality=90, exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def _legacy_preprocess(data: bytes) -> np.ndarray:
+    """The pre-draft ingest: full decode, transpose, LANCZOS, reversed view."""
+    img = Image.open(io.BytesIO(data))
+    img = ImageOps.exif_transpose(img)
+    if max(img.size) > _MAX_DIMENSION:
+        img.thumbnail((_MAX_DIMENSION, _MAX_DIMENSION), Image.LANCZOS)
+    img = img.convert("RGB")
+    # Downstream cv2 calls copy the negative-stride view; count that copy too.
+    return np.ascontiguousarray(np.asarray(img)[:, :, ::-1])
+
+
+def _decoded_pixels(data: bytes, draft: bool) -> int:
+    img = Image.open(io.BytesIO(data))
+    if draft:
+        scale = _MAX_DIMENSION / max(img.size)
+        img.draft("RGB", (round(img.width * scale), round(img.height * scale)))
+    img.load()
+    return img.width * img.height
+
+
+def _peak_python_mb(func, data: bytes) -> float:
+    tracemalloc.start()
+    try:
+        func(data)
+        return round(tracemalloc.get_traced_memory()[1] / 1_000_000, 2)
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture(scope="module", params=sorted(PHONE_SIZES))
+def phone_photo(request) -> tuple[str, bytes]:
+    return request.param, _phone_jpeg(PHONE_SIZES[request.param])
+
+
+@pytest.mark.parametrize(
+    "variant,func", [("draft", _preprocess), ("legacy", _legacy_preprocess)], ids=["draft", "legacy"]
+)
+def test_ocr_preprocess(benchmark, phone_photo, variant, func):
+    label, data = phone_photo
+    benchmark.group = f"ocr_preprocess_{label}"
+    benchmark.extra_info["decoded_megapixels"] = round(
+        _decoded_pixels(data, draft=variant == "draft") / 1_000_000, 2
+    )
+    benchmark.extra_info["peak_python_mb"] = _peak_python_mb(func, data)
+
+    result = benchmark(func, data)
+
+    assert result.shape[0] == _MAX_DIMENSION  # portrait after the EXIF rotation
+    assert result.flags.c_contiguous
@@ -10,12 +10,15 @@ import type {
   AdminVerbRow,
   AdminWordRow,
   BootPayload,
+  BulkAddWordLine,
+  BulkAddWordSummary,
   ChatPayload,
   CommunityPayload,
   ConjugationState,
   ConjugationTenseReview,
   LanguageEntry,
   MonitorPayload,
+  OcrQueueStatus,
   OcrResponse,
   OnboardingPayload,
   PriorityQueueEntry,
@@ -174,6 +177,7 @@ export const api = {
       method: 'POST',
       body: JSON.stringify({ sense_id, csrf_token }),
     }),
+  ocrQueue: () => request<OcrQueueStatus>('/api/words/ocr/queue'),
   ocrExtract: (image: Blob, lang_code: string, csrf_token: string) => {
     const form = new FormData();
     form.append('image', image, 'subtitle.jpg');
@@ -268,7 +272,12 @@ export const api = {
       body: JSON.stringify(payload),
     }),
   adminMonitor: () => request<MonitorPayload>('/api/admin/monitor'),
-  adminAiUsage: (limit = 50) => request<AdminAiUsagePayload>(`/api/admin/ai/usage?limit=${limit}`),
+  adminAiUsage: (limit = 50, range: { start?: string; end?: string } = {}) =>
+    request<AdminAiUsagePayload>(
+      `/api/admin/ai/usage?${new URLSearchParams(
+        Object.entries({ limit: String(limit), ...range }).filter(([, value]) => Boolean(value)) as [string, string][],
+      ).toString()}`,
+    ),
   adminContentSummary: () => request<AdminContentSummaryPayload>('/api/admin/content/summary'),
   adminWords: (params: { search?: string; verified?: string; limit?: number } = {}) =>
     request<{ rows: AdminWordRow[] }>(
@@ -375,3 +384,52 @@ export async function streamChat(
     }
   }
 }
+
+export async function streamAddWords(
+  payload: {
+    entries: { text: string; context?: string }[];
+    context_source?: 'manual' | 'photo';
+    learning_lang_code?: string;
+    mother_lang_code?: string;
+    csrf_token: string;
+  },
+  onWord: (line: BulkAddWordLine) => void,
+): Promise<BulkAddWordSummary> {
+  const response = await fetch('/api/words/add-bulk', {
+    method: 'POST',
+    credentials: 'same-origin',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(payload),
+  });
+
+  if (!response.ok || !response.body) {
+    await parseResponse(response);
+    throw new ApiError('Bulk add failed', response.status);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) {
+      throw new ApiError('Bulk add ended early', 502);
+    }
+
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop() || '';
+
+    for (const line of lines) {
+      if (!line.trim()) {
+        continue;
+      }
+      const parsed = JSON.parse(line) as BulkAddWordLine | BulkAddWordSummary;
+      if ('done' in parsed) {
+        return parsed;
+      }
+      onWord(parsed);
+    }
+  }
+}
@@ -35,6 +35,20 @@ export interface BootPayload {
   entry_path: string;
 }
 
+/** Set by the server-rendered /app shell (app/templates/spa_shell.html). */
+export interface ShellBoot {
+  csrfToken: string;
+  initialTheme: ThemeName;
+  spaPath: string;
+  bootstrap: BootPayload | null;
+}
+
+declare global {
+  interface Window {
+    __LEXARENA_BOOT__?: ShellBoot;
+  }
+}
+
 export interface FocusItem {
   label: string;
   translation?: string | null;
@@ -386,9 +400,23 @@ export interface ChatPayload {
   api_enabled: boolean;
 }
 
+export interface OcrQueueStatus {
+  workers: number;
+  busy: number;
+  waiting: number;
+  queue_limit: number;
+}
+
 export interface MonitorPayload {
   viewer: string;
   totals: Record<string, number>;
+  ocr: OcrQueueStatus & {
+    completed: number;
+    rejected: number;
+    stage_avg_ms: Record<'queue' | 'decode' | 'resize' | 'detect' | 'recognize', number>;
+    cache: { entries: number; hits: number; misses: number; disk: boolean };
+  };
+  tutor_context: { users: number; hits: number; misses: number };
   users: Array<{
     id: number;
     username: string;
@@ -439,6 +467,7 @@ export interface AdminContentSummaryPayload {
 
 export interface AdminAiUsagePayload {
   viewer: string;
+  range: { start: string | null; end: string | null };
   financials: {
     total_cost_usd: number;
     translation_cost_usd: number;
@@ -449,6 +478,8 @@ export interface AdminAiUsagePayload {
     completion_tokens: number;
     total_tokens: number;
     translation_tokens: number;
+    cache_hits: number;
+    cache_hit_rate: number;
   };
   by_feature: Array<{
     feature: string;
@@ -459,7 +490,19 @@ export interface AdminAiUsagePayload {
     completion_tokens: number;
     total_tokens: number;
     average_cost_usd: number;
+    cache_hits: number;
+    cache_hit_rate: number;
   }>;
+  timeline: {
+    granularity: 'hour' | 'day';
+    points: Array<{
+      bucket_start: string;
+      calls: number;
+      cache_hits: number;
+      cost_usd: number;
+      total_tokens: number;
+    }>;
+  };
   by_model: Array<{
     model: string;
     calls: number;
@@ -704,6 +747,25 @@ export interface AddedWordNotFound {
 
 export type AddWordResponse = AddedWordResult | AddedWordNotFound;
 
+interface BulkAddWordLineBase {
+  index: number;
+  input_text: string;
+}
+
+export type BulkAddWordLine = BulkAddWordLineBase &
+  (
+    | AddedWordResult
+    | { status: 'not_found'; suggestions: string[] }
+    | { status: 'error'; detail: string }
+  );
+
+export interface BulkAddWordSummary {
+  done: true;
+  added: number;
+  failed: number;
+  error?: string;
+}
+
 export interface OcrWordResult {
   text: string;
   confidence: number;
@@ -721,6 +783,8 @@ export interface OcrResponse {
   mean_confidence: number | null;
   ocr_lang: string;
   words: OcrWordResult[];
+  queue_position: number;
+  cached: boolean;
 }
 
 export interface UserWordEntry {
@@ -1,13 +1,61 @@
-import { resolve } from 'node:path';
-import { defineConfig } from 'vite';
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs';
+import { extname, join, resolve } from 'node:path';
+import { brotliCompressSync, constants as zlib, gzipSync } from 'node:zlib';
+import { defineConfig, type Plugin } from 'vite';
 import { svelte } from '@sveltejs/vite-plugin-svelte';
 import tailwindcss from '@tailwindcss/vite';
 
 const spaOutDir = resolve(__dirname, 'static/spa');
 
+const COMPRESSIBLE = new Set(['.js', '.css', '.html', '.svg', '.json', '.map']);
+// Below this, headers outweigh the savings.
+const MIN_COMPRESS_BYTES = 1024;
+
+function listFiles(dir: string): string[] {
+  return readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+    const path = join(dir, entry.name);
+    return entry.isDirectory() ? listFiles(path) : [path];
+  });
+}
+
+// Writes .br and .gz siblings next to every compressible asset once per build,
+// at maximum levels, so FastAPI (app/core/static_files.py) serves them without
+// spending CPU per request. A variant is skipped when it would not be smaller.
+function precompress(dir: string): Plugin {
+  return {
+    name: 'verbpractice-precompress',
+    apply: 'build',
+    closeBundle() {
+      for (const file of listFiles(dir)) {
+        if (!COMPRESSIBLE.has(extname(file)) || statSync(file).size < MIN_COMPRESS_BYTES) {
+          continue;
+        }
+        const source = readFileSync(file);
+        const variants: [string, Buffer][] = [
+          [
+            '.br',
+            brotliCompressSync(source, {
+              params: {
+                [zlib.BROTLI_PARAM_QUALITY]: zlib.BROTLI_MAX_QUALITY,
+                [zlib.BROTLI_PARAM_SIZE_HINT]: source.length
+              }
+            })
+          ],
+          ['.gz', gzipSync(source, { level: zlib.Z_BEST_COMPRESSION })]
+        ];
+        for (const [suffix, compressed] of variants) {
+          if (compressed.length < source.length) {
+            writeFileSync(file + suffix, compressed);
+          }
+        }
+      }
+    }
+  };
+}
+
 export default defineConfig({
   base: '/static/spa/',
-  plugins: [tailwindcss(), svelte()],
+  plugins: [tailwindcss(), svelte(), precompress(spaOutDir)],
   build: {
     outDir: spaOutDir,
     emptyOutDir: true,
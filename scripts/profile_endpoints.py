@@ -2,17 +2,24 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import random
 import statistics
-from dataclasses import dataclass
+from collections import defaultdict
+from dataclasses import dataclass, field
 from time import perf_counter
+from types import SimpleNamespace
+from uuid import uuid4
 
 import httpx
 from sqlalchemy import select
 
+from app.core.config import settings
+from app.core.rate_limit import limiter
 from app.core.security import hash_password
 from app.db.models import User, UserProfile
-from app.db.session import AsyncSessionLocal
+from app.db.session import AsyncSessionLocal, engine
 from app.main import app
+from app.services import chat_service
 
 PROFILE_USERNAME = "qa_profile"
 PROFILE_PASSWORD = "profile12345"
@@ -26,6 +33,22 @@ class ProfileResult:
     samples_ms: list[float]
 
 
+@dataclass(slots=True)
+class RouteStats:
+    samples_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+@dataclass(slots=True)
+class LoadReport:
+    routes: dict[str, RouteStats] = field(default_factory=lambda: defaultdict(RouteStats))
+    sessions_completed: int = 0
+    elapsed_s: float = 0.0
+    pool_samples: list[int] = field(default_factory=list)
+    pool_capacity: int | None = None
+    sse_frames: list[int] = field(default_factory=list)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Profile the main app endpoints.")
     parser.add_argument("--iterations", type=int, default=12, help="How many timing samples to collect per endpoint.")
@@ -39,6 +62,31 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Only profile public endpoints.",
     )
+    load = parser.add_argument_group("load test", "Concurrent virtual learners instead of sequential timing.")
+    load.add_argument("--load", action="store_true", help="Run the concurrent load generator.")
+    load.add_argument("--users", type=int, default=10, help="Number of concurrent virtual learners.")
+    load.add_argument("--sessions", type=int, default=3, help="Training sessions each learner runs.")
+    load.add_argument("--session-length", type=int, default=10, help="Questions per training session.")
+    load.add_argument(
+        "--accuracy",
+        type=float,
+        default=0.7,
+        help="Probability (0-1) that a virtual learner answers a question correctly.",
+    )
+    load.add_argument("--direction", default="es_fr", help="Word training direction the learners practice.")
+    load.add_argument("--seed", type=int, default=7, help="Random seed for answer accuracy.")
+    load.add_argument(
+        "--chat-messages",
+        type=int,
+        default=0,
+        help="Tutor chat messages each learner streams after training (POST /api/chat/stream).",
+    )
+    load.add_argument(
+        "--chat-stream-seconds",
+        type=float,
+        default=2.0,
+        help="In-process runs: how long the simulated tutor model takes to stream each reply.",
+    )
     return parser.parse_args()
 
 
@@ -63,12 +111,16 @@ async def ensure_profile_user() -> None:
         await session.commit()
 
 
+def percentile(ordered: list[float], fraction: float) -> float:
+    index = min(len(ordered) - 1, max(0, round((len(ordered) - 1) * fraction)))
+    return ordered[index]
+
+
 def summarize(samples_ms: list[float]) -> tuple[float, float, float]:
     ordered = sorted(samples_ms)
     avg = statistics.fmean(ordered)
     p50 = ordered[len(ordered) // 2]
-    p95_index = min(len(ordered) - 1, max(0, round((len(ordered) - 1) * 0.95)))
-    p95 = ordered[p95_index]
+    p95 = percentile(ordered, 0.95)
     return avg, p50, p95
 
 
@@ -147,8 +199,221 @@ def print_report(results: list[ProfileResult]) -> None:
         print(f"{result.name:24} {result.method:6} {result.path:32} {avg:9.1f} {p50:9.1f} {p95:9.1f}")
 
 
+async def load_request(
+    client: httpx.AsyncClient,
+    report: LoadReport,
+    route: str,
+    method: str,
+    path: str,
+    *,
+    json: dict | None = None,
+) -> dict | None:
+    started = perf_counter()
+    try:
+        response = await client.request(method, path, json=json)
+    except httpx.HTTPError:
+        report.routes[route].errors += 1
+        return None
+    report.routes[route].samples_ms.append((perf_counter() - started) * 1000)
+    if response.status_code >= 400:
+        report.routes[route].errors += 1
+        return None
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        return {"events": response.text.count("\n\n")}
+    return response.json()
+
+
+async def run_virtual_learner(base_url: str, args: argparse.Namespace, report: LoadReport, index: int) -> None:
+    rng = random.Random(args.seed + index)
+    async with await build_client(base_url) as client:
+        bootstrap = await load_request(client, report, "GET /api/bootstrap", "GET", "/api/bootstrap")
+        if bootstrap is None:
+            return
+        csrf_token = bootstrap["csrf_token"]
+        registered = await load_request(
+            client,
+            report,
+            "POST /api/auth/register",
+            "POST",
+            "/api/auth/register",
+            json={
+                "username": f"load_{uuid4().hex[:12]}",
+                "password": PROFILE_PASSWORD,
+                "confirm_password": PROFILE_PASSWORD,
+                "csrf_token": csrf_token,
+            },
+        )
+        if registered is None:
+            return
+
+        for _ in range(args.sessions):
+            state = await load_request(
+                client,
+                report,
+                "POST /api/training/words/start",
+                "POST",
+                "/api/training/words/start",
+                json={"length": args.session_length, "direction": args.direction, "csrf_token": csrf_token},
+            )
+            while state is not None and not state.get("setup"):
+                question = state["question"]
+                correct = rng.random() < args.accuracy and question["accepted_answers"]
+                state = await load_request(
+                    client,
+                    report,
+                    "POST /api/training/words/answer",
+                    "POST",
+                    "/api/training/words/answer",
+                    json={
+                        "answer": question["accepted_answers"][0] if correct else "zzz",
+                        "csrf_token": csrf_token,
+                    },
+                )
+            if state is not None and not state.get("finished"):
+                await load_request(
+                    client,
+                    report,
+                    "POST /api/training/words/finish",
+                    "POST",
+                    "/api/training/words/finish",
+                    json={"csrf_token": csrf_token},
+                )
+            if await load_request(client, report, "GET /api/dashboard", "GET", "/api/dashboard") is not None:
+                report.sessions_completed += 1
+
+        for index in range(args.chat_messages):
+            streamed = await load_request(
+                client,
+                report,
+                "POST /api/chat/stream",
+                "POST",
+                "/api/chat/stream",
+                json={"message": f"Give me drill number {index + 1}.", "csrf_token": csrf_token},
+            )
+            if streamed is not None:
+                report.sse_frames.append(streamed["events"])
+
+
+class SimulatedStream:
+    def __init__(self, chunks) -> None:
+        self._chunks = chunks
+
+    def __aiter__(self):
+        return self._chunks
+
+    async def close(self) -> None:
+        await self._chunks.aclose()
+
+
+class SimulatedTutor:
+    """Stands in for the OpenAI client: streams one token per delta over a fixed duration."""
+
+    def __init__(self, seconds: float, chunks: int = 200) -> None:
+        self.delay = seconds / chunks
+        self.chunks = chunks
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, **kwargs):
+        return SimulatedStream(self._stream())
+
+    async def _stream(self):
+        for index in range(self.chunks):
+            await asyncio.sleep(self.delay)
+            delta = SimpleNamespace(content=f"t{index} ")
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        usage = SimpleNamespace(prompt_tokens=200, completion_tokens=self.chunks, total_tokens=200 + self.chunks)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+def install_simulated_tutor(seconds: float) -> None:
+    # In-process only: every learner shares one client address, so the
+    # per-IP rate limit would turn the chat scenario into a stream of 429s.
+    settings.openai_api_key = settings.openai_api_key or "simulated"
+    chat_service.get_openai_client = lambda: SimulatedTutor(seconds)
+    limiter.enabled = False
+
+
+def pool_capacity() -> int | None:
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    return pool.size() + max(0, getattr(pool, "_max_overflow", 0))
+
+
+async def sample_pool(report: LoadReport, stop: asyncio.Event) -> None:
+    pool = engine.pool
+    while not stop.is_set():
+        report.pool_samples.append(pool.checkedout())
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.05)
+        except TimeoutError:
+            pass
+
+
+async def run_load(args: argparse.Namespace) -> LoadReport:
+    report = LoadReport()
+    # Pool occupancy is only visible when the app runs in this process.
+    report.pool_capacity = None if args.base_url else pool_capacity()
+    if args.chat_messages and not args.base_url:
+        install_simulated_tutor(args.chat_stream_seconds)
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_pool(report, stop)) if report.pool_capacity else None
+    started = perf_counter()
+    await asyncio.gather(
+        *(run_virtual_learner(args.base_url, args, report, index) for index in range(args.users))
+    )
+    report.elapsed_s = perf_counter() - started
+    stop.set()
+    if sampler is not None:
+        await sampler
+    return report
+
+
+def print_load_report(report: LoadReport, args: argparse.Namespace) -> None:
+    total_requests = sum(len(stats.samples_ms) + stats.errors for stats in report.routes.values())
+    total_errors = sum(stats.errors for stats in report.routes.values())
+    print(f"Load test: {args.users} learners x {args.sessions} sessions, accuracy {args.accuracy:.0%}")
+    if args.chat_messages:
+        simulated = "" if args.base_url else f", simulated {args.chat_stream_seconds:.1f}s replies"
+        print(f"Chat: {args.chat_messages} streamed messages per learner{simulated}")
+    print(
+        f"{total_requests} requests in {report.elapsed_s:.1f}s "
+        f"-> {total_requests / max(report.elapsed_s, 1e-9):.1f} req/s, "
+        f"{report.sessions_completed / max(report.elapsed_s, 1e-9):.2f} sessions/s, "
+        f"errors {total_errors} ({total_errors / max(total_requests, 1):.1%})"
+    )
+    print()
+    print(f"{'Route':34} {'Count':>6} {'Err %':>6} {'P50':>9} {'P95':>9} {'P99':>9} {'Max':>9}")
+    print("-" * 86)
+    for route, stats in sorted(report.routes.items()):
+        count = len(stats.samples_ms) + stats.errors
+        error_rate = stats.errors / max(count, 1)
+        if stats.samples_ms:
+            ordered = sorted(stats.samples_ms)
+            p50, p95, p99 = (percentile(ordered, q) for q in (0.5, 0.95, 0.99))
+            peak = ordered[-1]
+        else:
+            p50 = p95 = p99 = peak = float("nan")
+        print(f"{route:34} {count:6d} {error_rate:6.1%} {p50:9.1f} {p95:9.1f} {p99:9.1f} {peak:9.1f}")
+    print()
+    if report.sse_frames:
+        print(f"Chat: {statistics.fmean(report.sse_frames):.1f} SSE frames per streamed reply")
+    if report.pool_capacity is None:
+        print("DB pool: not sampled (NullPool or remote server)")
+    elif report.pool_samples:
+        saturated = sum(1 for value in report.pool_samples if value >= report.pool_capacity)
+        print(
+            f"DB pool: peak {max(report.pool_samples)}/{report.pool_capacity} connections checked out, "
+            f"mean {statistics.fmean(report.pool_samples):.1f}, "
+            f"saturated in {saturated / len(report.pool_samples):.1%} of samples"
+        )
+
+
 async def main() -> None:
     args = parse_args()
+    if args.load:
+        print_load_report(await run_load(args), args)
+        return
     async with await build_client(args.base_url) as client:
         results = await collect_public_samples(client, args.iterations)
         if not args.skip_auth:
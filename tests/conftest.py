@@ -5,6 +5,8 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import select
 
+from app.core.config import settings
+from app.core.query_metrics import QUERY_COUNT_HEADER, QUERY_REPEATS_HEADER, QUERY_TIME_HEADER
 from app.core.security import hash_password
 from app.db.base import Base
 from app.db.models import Language, User, UserProfile, Verb, VerbConjugation, VerbTranslation, Word, WordTranslation
@@ -225,3 +227,55 @@ def circle_user():
 def client():
     with TestClient(app) as test_client:
         yield test_client
+
+
+_QUERY_BUDGET_RECORDS: list[tuple[str, int, int, float, float]] = []
+
+
+@pytest.fixture()
+def query_budget(monkeypatch):
+    """Assert a response stayed within ``max_queries`` SQL statements.
+
+    Enables the per-request DB metrics headers for the test, so the count is the
+    one the app measured for that single request. Every checked response is
+    recorded and listed in the terminal summary.
+    """
+    monkeypatch.setattr(settings, "sql_metrics_header", True)
+
+    def check(
+        response,
+        max_queries: int,
+        *,
+        max_repeated: int | None = None,
+        label: str | None = None,
+    ) -> int:
+        request = response.request
+        name = label or f"{request.method} {request.url.path}"
+        count = int(response.headers[QUERY_COUNT_HEADER])
+        _QUERY_BUDGET_RECORDS.append(
+            (
+                name,
+                count,
+                max_queries,
+                float(response.headers[QUERY_TIME_HEADER]),
+                response.elapsed.total_seconds() * 1000,
+            )
+        )
+        assert count <= max_queries, f"{name} ran {count} SQL statements (budget {max_queries})"
+        if max_repeated is not None:
+            repeated = int(response.headers[QUERY_REPEATS_HEADER])
+            assert repeated <= max_repeated, (
+                f"{name} repeated {repeated} statement shapes (allowed {max_repeated})"
+            )
+        return count
+
+    return check
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _QUERY_BUDGET_RECORDS:
+        return
+    terminalreporter.section("query budgets")
+    terminalreporter.write_line(f"{'Endpoint':28} {'Queries':>8} {'Budget':>7} {'DB ms':>8} {'Wall ms':>8}")
+    for name, count, budget, db_ms, wall_ms in _QUERY_BUDGET_RECORDS:
+        terminalreporter.write_line(f"{name:28} {count:8d} {budget:7d} {db_ms:8.1f} {wall_ms:8.1f}")
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models import AIResponseCache, AIUsageLog
+from app.services.ai_cache import (
+    get_cached_response,
+    prompt_fingerprint,
+    prune_ai_cache,
+    store_cached_response,
+)
+from app.services import ai_usage
+from app.services.ai_usage import CACHE_HIT_STATUS, AIUsageBuffer, ai_usage_report
+from app.services.word_ai_service import WORD_AI_MODEL, _call_openai_json
+
+
+@pytest_asyncio.fixture()
+async def sqlite_session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+class _StubCompletions:
+    def __init__(self, content: str) -> None:
+        self.content = content
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+            usage=SimpleNamespace(
+                prompt_tokens=1000, completion_tokens=500, total_tokens=1500
+            ),
+        )
+
+
+def _stub_client(content: str):
+    completions = _StubCompletions(content)
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions)), completions
+
+
+def test_fingerprint_covers_model_system_and_user_message():
+    base = prompt_fingerprint("m", "system", '{"word": "bank"}')
+    assert base == prompt_fingerprint("m", "system", '{"word": "bank"}')
+    assert base != prompt_fingerprint("other", "system", '{"word": "bank"}')
+    assert base != prompt_fingerprint("m", "system v2", '{"word": "bank"}')
+    assert base != prompt_fingerprint("m", "system", '{"word": "banks"}')
+    assert len(base) == 64
+
+
+@pytest.mark.asyncio
+async def test_cached_response_round_trip_counts_hits(sqlite_session):
+    assert await get_cached_response(sqlite_session, model="m", system="s", user="u") is None
+
+    await store_cached_response(
+        sqlite_session, feature="word_question", model="m", system="s", user="u", content="answer"
+    )
+
+    assert await get_cached_response(sqlite_session, model="m", system="s", user="u") == "answer"
+    assert await get_cached_response(sqlite_session, model="m", system="s", user="other") is None
+    row = (await sqlite_session.execute(select(AIResponseCache))).scalar_one()
+    await sqlite_session.refresh(row)
+    assert row.hit_count == 1
+    assert row.last_hit_at is not None
+
+
+@pytest.mark.asyncio
+async def test_buffered_hits_skip_the_request_transaction(sqlite_session, monkeypatch):
+    await store_cached_response(
+        sqlite_session, feature="word_question", model="m", system="s", user="u", content="answer"
+    )
+    await sqlite_session.commit()
+    buffer = AIUsageBuffer(
+        async_sessionmaker(sqlite_session.bind, expire_on_commit=False),
+        batch_size=100,
+        flush_interval=60,
+    )
+    monkeypatch.setattr(ai_usage, "usage_buffer", buffer)
+    buffer.start()
+
+    statements: list[str] = []
+    event.listen(
+        sqlite_session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    for _ in range(3):
+        assert await get_cached_response(sqlite_session, model="m", system="s", user="u") == "answer"
+    await sqlite_session.rollback()
+    assert not [statement for statement in statements if statement.startswith("UPDATE")]
+
+    await buffer.stop()
+
+    row = (await sqlite_session.execute(select(AIResponseCache))).scalar_one()
+    assert row.hit_count == 3
+    assert row.last_hit_at is not None
+
+
+@pytest.mark.asyncio
+async def test_expired_rows_are_ignored_and_refreshed(sqlite_session):
+    await store_cached_response(
+        sqlite_session, feature="word_question", model="m", system="s", user="u", content="old"
+    )
+    row = (await sqlite_session.execute(select(AIResponseCache))).scalar_one()
+    row.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    await sqlite_session.flush()
+
+    assert await get_cached_response(sqlite_session, model="m", system="s", user="u") is None
+
+    await store_cached_response(
+        sqlite_session, feature="word_question", model="m", system="s", user="u", content="new"
+    )
+    assert await get_cached_response(sqlite_session, model="m", system="s", user="u") == "new"
+    assert await sqlite_session.scalar(select(func.count(AIResponseCache.id))) == 1
+
+
+@pytest.mark.asyncio
+async def test_prune_drops_expired_then_least_recently_used(sqlite_session):
+    for index in range(4):
+        await store_cached_response(
+            sqlite_session,
+            feature="word_question",
+            model="m",
+            system="s",
+            user=f"u{index}",
+            content=str(index),
+        )
+    expired = (
+        await sqlite_session.execute(
+            select(AIResponseCache).where(AIResponseCache.content == "0")
+        )
+    ).scalar_one()
+    expired.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    await sqlite_session.flush()
+    # u1 is older than u2/u3 but was just used, so it survives the size cap.
+    assert await get_cached_response(sqlite_session, model="m", system="s", user="u1") == "1"
+    await sqlite_session.flush()
+
+    removed = await prune_ai_cache(sqlite_session, max_entries=2)
+
+    assert removed == 2
+    remaining = (
+        await sqlite_session.execute(select(AIResponseCache.content).order_by(AIResponseCache.content))
+    ).scalars().all()
+    assert remaining == ["1", "3"]
+
+
+@pytest.mark.asyncio
+async def test_cacheable_call_pays_once_and_reports_hit_rate(sqlite_session):
+    client, completions = _stub_client('{"answer": "rive"}')
+
+    for _ in range(3):
+        payload = await _call_openai_json(
+            client,
+            "system",
+            '{"word": "bank", "context": "river"}',
+            db=sqlite_session,
+            user_id=None,
+            feature="word_translate",
+            cache=True,
+        )
+        assert payload == {"answer": "rive"}
+
+    assert completions.calls == 1
+    statuses = (
+        await sqlite_session.execute(select(AIUsageLog.status).order_by(AIUsageLog.id))
+    ).scalars().all()
+    assert statuses == ["success", CACHE_HIT_STATUS, CACHE_HIT_STATUS]
+    row = (await sqlite_session.execute(select(AIResponseCache))).scalar_one()
+    assert row.model == WORD_AI_MODEL
+    assert row.cost_usd > 0
+
+    report = await ai_usage_report(sqlite_session)
+    assert report["financials"]["total_calls"] == 1
+    assert report["financials"]["cache_hits"] == 2
+    feature = report["by_feature"][0]
+    assert feature["calls"] == 1
+    assert feature["cache_hits"] == 2
+    assert feature["cache_hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+@pytest.mark.asyncio
+async def test_uncached_call_and_disabled_cache_always_call_the_model(
+    sqlite_session, monkeypatch
+):
+    client, completions = _stub_client('{"answer": "rive"}')
+    for cache in (False, True):
+        monkeypatch.setattr(settings, "ai_cache_enabled", cache is False)
+        for _ in range(2):
+            await _call_openai_json(
+                client,
+                "system",
+                "user",
+                db=sqlite_session,
+                feature="word_translate",
+                cache=cache,
+            )
+
+    assert completions.calls == 4
+    assert await sqlite_session.scalar(select(func.count(AIResponseCache.id))) == 0
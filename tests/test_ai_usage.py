@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.base import Base
+from app.db.models import AIUsageLog, AIUsageRollup
+from app.services import ai_usage
+from app.services.ai_usage import (
+    CACHE_HIT_STATUS,
+    AIUsageBuffer,
+    _UsageRecord,
+    _apply_rollups,
+    _usage_values,
+    ai_usage_report,
+    record_ai_usage,
+)
+
+USAGE = SimpleNamespace(prompt_tokens=1000, completion_tokens=500, total_tokens=1500)
+
+
+@pytest_asyncio.fixture()
+async def session_factory(tmp_path):
+    # A file database with real separate connections: the buffer writes on its
+    # own session while the test reads on another.
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'usage.db'}", poolclass=NullPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _logged_rows(session_factory) -> int:
+    async with session_factory() as db:
+        return int(await db.scalar(select(func.count(AIUsageLog.id))) or 0)
+
+
+async def _record(db, feature: str = "word_translate") -> None:
+    await record_ai_usage(db, user_id=None, feature=feature, model="gpt-4o-mini", usage=USAGE)
+
+
+@pytest.mark.asyncio
+async def test_record_writes_inline_when_buffer_is_not_running(session_factory):
+    async with session_factory() as db:
+        await _record(db)
+        row = (await db.execute(select(AIUsageLog))).scalar_one()
+
+    assert row.cost_usd == pytest.approx(0.00045)
+    assert row.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_buffered_records_skip_request_session_until_flush(session_factory, monkeypatch):
+    buffer = AIUsageBuffer(session_factory, batch_size=100, flush_interval=60)
+    monkeypatch.setattr(ai_usage, "usage_buffer", buffer)
+    buffer.start()
+
+    async with session_factory() as db:
+        for _ in range(3):
+            await _record(db)
+        assert not db.new
+        await db.rollback()
+    assert buffer.pending == 3
+    assert await _logged_rows(session_factory) == 0
+
+    await buffer.stop()
+
+    assert buffer.pending == 0
+    assert await _logged_rows(session_factory) == 3
+    async with session_factory() as db:
+        costs = (await db.execute(select(AIUsageLog.cost_usd))).scalars().all()
+    assert costs == [pytest.approx(0.00045)] * 3
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_before_interval(session_factory, monkeypatch):
+    buffer = AIUsageBuffer(session_factory, batch_size=2, flush_interval=60)
+    monkeypatch.setattr(ai_usage, "usage_buffer", buffer)
+    buffer.start()
+
+    async with session_factory() as db:
+        await _record(db)
+        await _record(db)
+    for _ in range(50):
+        if await _logged_rows(session_factory) == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert await _logged_rows(session_factory) == 2
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_drops_batch_and_keeps_running(session_factory, monkeypatch):
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    buffer = AIUsageBuffer(broken_session, batch_size=1, flush_interval=60)
+    monkeypatch.setattr(ai_usage, "usage_buffer", buffer)
+    buffer.start()
+
+    async with session_factory() as db:
+        await _record(db)
+    await asyncio.sleep(0.01)
+
+    assert buffer.running
+    assert buffer.pending == 0
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_an_in_flight_flush(session_factory, monkeypatch):
+    inserting = asyncio.Event()
+
+    def slow_session():
+        session = session_factory()
+        commit = session.commit
+
+        async def slow_commit():
+            inserting.set()
+            await asyncio.sleep(0.05)
+            await commit()
+
+        session.commit = slow_commit
+        return session
+
+    buffer = AIUsageBuffer(slow_session, batch_size=1, flush_interval=60)
+    monkeypatch.setattr(ai_usage, "usage_buffer", buffer)
+    buffer.start()
+
+    async with session_factory() as db:
+        await _record(db)
+    await asyncio.wait_for(inserting.wait(), timeout=1)
+    assert buffer.pending == 0
+
+    await buffer.stop()
+
+    assert not buffer.running
+    assert await _logged_rows(session_factory) == 1
+
+
+def _usage_record(created_at: datetime, *, feature: str = "word_translate", status: str = "success"):
+    return _UsageRecord(
+        user_id=None,
+        feature=feature,
+        model="gpt-4o-mini",
+        prompt_tokens=0 if status == CACHE_HIT_STATUS else 1000,
+        completion_tokens=0 if status == CACHE_HIT_STATUS else 500,
+        total_tokens=0 if status == CACHE_HIT_STATUS else 1500,
+        status=status,
+        request_label=None,
+        extra_data={},
+        created_at=created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_rollups_merge_buckets_across_flushes(session_factory):
+    buffer = AIUsageBuffer(session_factory)
+    morning = datetime(2026, 10, 1, 9, 15, tzinfo=timezone.utc)
+    for moment in (morning, morning.replace(minute=45)):
+        buffer.enqueue(_usage_record(moment))
+        await buffer.flush()
+    buffer.enqueue(_usage_record(morning.replace(hour=10), status=CACHE_HIT_STATUS))
+    await buffer.flush()
+
+    async with session_factory() as db:
+        rows = (
+            await db.execute(
+                select(AIUsageRollup).order_by(AIUsageRollup.granularity, AIUsageRollup.bucket_start)
+            )
+        ).scalars().all()
+
+    assert [(row.granularity, row.calls, row.cache_hits) for row in rows] == [
+        ("day", 2, 1),
+        ("hour", 2, 0),
+        ("hour", 0, 1),
+    ]
+    assert rows[0].total_tokens == 3000
+    assert rows[0].cost_usd == pytest.approx(0.0009)
+
+
+@pytest.mark.asyncio
+async def test_rollup_key_is_unique_and_upserts_add_in_place(session_factory):
+    moment = datetime(2026, 10, 1, 9, 15, tzinfo=timezone.utc)
+    record = _usage_values(_usage_record(moment))
+    async with session_factory() as db:
+        for _ in range(2):
+            await _apply_rollups(db, [record, record])
+        await db.commit()
+
+        rows = (await db.execute(select(AIUsageRollup))).scalars().all()
+        assert sorted((row.granularity, row.calls, row.total_tokens) for row in rows) == [
+            ("day", 4, 6000),
+            ("hour", 4, 6000),
+        ]
+
+        # Anonymous calls share one key, so a second row for it is rejected.
+        db.add(
+            AIUsageRollup(
+                granularity="day",
+                bucket_start=rows[0].bucket_start,
+                feature=record["feature"],
+                model=record["model"],
+                user_id=None,
+            )
+        )
+        with pytest.raises(IntegrityError):
+            await db.flush()
+
+
+@pytest.mark.asyncio
+async def test_report_reads_rollups_for_requested_range(session_factory):
+    buffer = AIUsageBuffer(session_factory)
+    first = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+    second = datetime(2026, 10, 3, 18, 30, tzinfo=timezone.utc)
+    buffer.enqueue(_usage_record(first))
+    buffer.enqueue(_usage_record(first, feature="chat_stream"))
+    buffer.enqueue(_usage_record(second))
+    buffer.enqueue(_usage_record(second, status=CACHE_HIT_STATUS))
+    await buffer.flush()
+
+    async with session_factory() as db:
+        everything = await ai_usage_report(db)
+        third = await ai_usage_report(db, start=date(2026, 10, 3), end=date(2026, 10, 3))
+
+    assert everything["financials"]["total_calls"] == 3
+    assert everything["financials"]["translation_calls"] == 2
+    assert everything["timeline"]["granularity"] == "day"
+    assert [point["bucket_start"][:10] for point in everything["timeline"]["points"]] == [
+        "2026-10-01",
+        "2026-10-03",
+    ]
+
+    assert third["range"] == {"start": "2026-10-03", "end": "2026-10-03"}
+    assert third["financials"]["total_calls"] == 1
+    assert third["financials"]["cache_hits"] == 1
+    assert [row["feature"] for row in third["by_feature"]] == ["word_translate"]
+    assert third["timeline"]["granularity"] == "hour"
+    assert [point["bucket_start"] for point in third["timeline"]["points"]] == [
+        "2026-10-03T18:00:00+00:00"
+    ]
+    assert len(third["recent"]) == 2
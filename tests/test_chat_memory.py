@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models import AIUsageLog, ChatMemory, ChatMessage, ChatMessageArchive, ChatRole, User
+from app.services import chat_memory, chat_service
+from app.services.chat_memory import estimate_tokens, load_chat_history, refresh_chat_memory
+from app.services.chat_service import prepare_chat_turn
+from app.services.state_version import state_versions
+
+
+@pytest_asyncio.fixture()
+async def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(settings, "chat_recent_messages", 4)
+    monkeypatch.setattr(settings, "chat_summary_batch", 6)
+    monkeypatch.setattr(settings, "chat_hot_messages", 8)
+    monkeypatch.setattr(settings, "chat_history_max_tokens", 1200)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'memory.db'}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as db:
+        db.add(User(id=1, username="learner", password_hash="x"))
+        await db.commit()
+    yield factory
+    await engine.dispose()
+
+
+async def _add_turns(factory, count: int, *, start: int = 1) -> None:
+    async with factory() as db:
+        for index in range(start, start + count):
+            role = ChatRole.USER if index % 2 else ChatRole.ASSISTANT
+            db.add(ChatMessage(user_id=1, role=role, content=f"message {index}"))
+        await db.commit()
+
+
+class _Summarizer:
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, **kwargs):
+        self.prompts.append(kwargs["messages"][-1]["content"])
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f"summary v{len(self.prompts)}"))],
+            usage=SimpleNamespace(prompt_tokens=400, completion_tokens=60, total_tokens=460),
+        )
+
+
+@pytest.mark.asyncio
+async def test_history_keeps_recent_turns_within_token_budget(session_factory, monkeypatch):
+    await _add_turns(session_factory, 5)
+    async with session_factory() as db:
+        history = await load_chat_history(db, user_id=1)
+
+    assert [message["content"] for message in history.messages] == [f"message {index}" for index in range(2, 6)]
+    assert history.messages[-1]["role"] == "user"
+    assert not history.needs_summary
+
+    per_message = estimate_tokens("message 5") + chat_memory.MESSAGE_OVERHEAD_TOKENS
+    monkeypatch.setattr(settings, "chat_history_max_tokens", per_message * 2)
+    async with session_factory() as db:
+        history = await load_chat_history(db, user_id=1)
+    assert [message["content"] for message in history.messages] == ["message 4", "message 5"]
+    assert history.tokens <= settings.chat_history_max_tokens
+
+
+@pytest.mark.asyncio
+async def test_refresh_folds_old_turns_and_archives_beyond_hot_window(session_factory, monkeypatch):
+    summarizer = _Summarizer()
+    monkeypatch.setattr(chat_memory, "get_openai_client", lambda: summarizer)
+    await _add_turns(session_factory, 9)
+    assert await refresh_chat_memory(1, session_factory=session_factory) is False
+
+    await _add_turns(session_factory, 3, start=10)
+    async with session_factory() as db:
+        assert (await load_chat_history(db, user_id=1)).needs_summary
+
+    content_version, user_version = state_versions.content, state_versions.user(1)
+    assert await refresh_chat_memory(1, session_factory=session_factory) is True
+    # Archiving deletes only this user's messages: other users' ETags stay valid.
+    assert state_versions.content == content_version
+    assert state_versions.user(1) > user_version
+
+    assert "message 1\n" in summarizer.prompts[0] and "message 8" in summarizer.prompts[0]
+    assert "message 9" not in summarizer.prompts[0]
+    async with session_factory() as db:
+        memory = await db.get(ChatMemory, 1)
+        hot_ids = (await db.execute(select(ChatMessage.id).order_by(ChatMessage.id))).scalars().all()
+        archived = await db.scalar(select(func.count(ChatMessageArchive.id)))
+        usage = (await db.execute(select(AIUsageLog))).scalar_one()
+        history = await load_chat_history(db, user_id=1)
+
+    assert memory.summary == "summary v1"
+    assert memory.summarized_through_id == 8
+    assert hot_ids == list(range(5, 13))
+    assert archived == 4
+    assert usage.feature == "chat_summary"
+    assert history.summary == "summary v1"
+    assert [message["content"] for message in history.messages] == [f"message {index}" for index in range(9, 13)]
+    assert not history.needs_summary
+
+
+@pytest.mark.asyncio
+async def test_prompt_includes_summary_and_recent_turns(session_factory, monkeypatch):
+    await _add_turns(session_factory, 3)
+    async with session_factory() as db:
+        db.add(ChatMemory(user_id=1, summary="Learner keeps mixing ser and estar.", summarized_through_id=0))
+        await db.commit()
+
+    captured = {}
+
+    class _EmptyStream:
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            raise StopAsyncIteration
+
+        async def close(self):
+            return None
+
+    async def create(**kwargs):
+        captured.update(kwargs)
+        return _EmptyStream()
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(chat_service, "get_openai_client", lambda: client)
+
+    async with session_factory() as db:
+        turn = await prepare_chat_turn(db, user_id=1, user_message="And now?")
+        await db.commit()
+    assert [piece async for piece in chat_service.stream_chat_turn(turn)] == []
+
+    messages = captured["messages"]
+    assert "Learner keeps mixing ser and estar." in messages[0]["content"]
+    assert [message["content"] for message in messages[1:]] == ["message 1", "message 2", "message 3", "And now?"]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_refreshes_in_flight(session_factory, monkeypatch):
+    summarizing = asyncio.Event()
+
+    class _StuckSummarizer(_Summarizer):
+        async def create(self, **kwargs):
+            summarizing.set()
+            await asyncio.sleep(60)
+
+    monkeypatch.setattr(chat_memory, "get_openai_client", lambda: _StuckSummarizer())
+    monkeypatch.setattr(chat_memory, "AsyncSessionLocal", session_factory)
+    await _add_turns(session_factory, 12)
+
+    chat_memory.schedule_memory_refresh(1)
+    await asyncio.wait_for(summarizing.wait(), timeout=1)
+    await chat_memory.stop_memory_refreshes()
+
+    assert not chat_memory._refresh_tasks
+    assert not chat_memory._refreshing
+    async with session_factory() as db:
+        assert await db.get(ChatMemory, 1) is None
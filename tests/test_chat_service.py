@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models import AIUsageLog, ChatMessage, ChatRole, User
+from app.services import chat_service
+from app.services.chat_service import (
+    SSE_DONE_FRAME,
+    chat_event_stream,
+    coalesce_chunks,
+    finish_chat_turn,
+    prepare_chat_turn,
+    stream_chat_turn,
+)
+
+
+@pytest_asyncio.fixture()
+async def small_pool(tmp_path):
+    # One pooled connection and no overflow: a turn that held its session while
+    # streaming would starve the others until pool_timeout.
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'chat.db'}", pool_size=1, max_overflow=0, pool_timeout=1
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        db.add(User(username="chatter", password_hash="x"))
+        await db.commit()
+    yield engine, session_factory
+    await engine.dispose()
+
+
+class _Stream:
+    def __init__(self, chunks) -> None:
+        self._chunks = chunks
+        self.closed = False
+
+    def __aiter__(self):
+        return self._chunks
+
+    async def close(self) -> None:
+        self.closed = True
+        await self._chunks.aclose()
+
+
+def _delta(text: str) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+
+
+class _GatedTutor:
+    """Streams two chunks, then waits on ``release`` before reporting usage."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.streaming = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, **kwargs):
+        return _Stream(self._stream())
+
+    async def _stream(self):
+        for text in ("Bonjour", " !"):
+            yield _delta(text)
+        self.streaming += 1
+        await self.release.wait()
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+async def _chat(session_factory, message: str) -> str:
+    async with session_factory() as db:
+        turn = await prepare_chat_turn(db, user_id=1, user_message=message)
+        await db.commit()
+    reply = "".join([chunk async for chunk in stream_chat_turn(turn)])
+    await finish_chat_turn(turn, reply, session_factory=session_factory)
+    return reply
+
+
+@pytest.mark.asyncio
+async def test_streaming_turns_hold_no_connection(small_pool, monkeypatch):
+    engine, session_factory = small_pool
+    tutor = _GatedTutor()
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(chat_service, "get_openai_client", lambda: tutor)
+
+    chats = [asyncio.create_task(_chat(session_factory, f"drill {index}")) for index in range(3)]
+    for _ in range(200):
+        if tutor.streaming == 3:
+            break
+        await asyncio.sleep(0.01)
+
+    assert tutor.streaming == 3
+    assert engine.pool.checkedout() == 0
+    tutor.release.set()
+    assert await asyncio.gather(*chats) == ["Bonjour !"] * 3
+
+    async with session_factory() as db:
+        roles = (await db.execute(select(ChatMessage.role))).scalars().all()
+        usage = (await db.execute(select(AIUsageLog))).scalars().all()
+    assert sorted(role.value for role in roles) == sorted(
+        [ChatRole.USER.value] * 3 + [ChatRole.ASSISTANT.value] * 3
+    )
+    assert [row.feature for row in usage] == ["chat_stream"] * 3
+    assert {row.total_tokens for row in usage} == {120}
+
+
+@pytest.mark.asyncio
+async def test_user_message_is_kept_when_stream_fails(small_pool, monkeypatch):
+    _, session_factory = small_pool
+
+    def broken_client():
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(chat_service, "get_openai_client", broken_client)
+
+    with pytest.raises(RuntimeError):
+        await _chat(session_factory, "hello")
+
+    async with session_factory() as db:
+        messages = (await db.execute(select(ChatMessage))).scalars().all()
+    assert [(message.role, message.content) for message in messages] == [(ChatRole.USER, "hello")]
+
+
+async def _deltas(*steps: tuple[float, str]):
+    for delay, text in steps:
+        await asyncio.sleep(delay)
+        yield text
+
+
+@pytest.mark.asyncio
+async def test_coalescer_sends_first_delta_then_merges_by_size_and_time():
+    steps = [(0, "a"), (0, "b"), (0, "c"), (0, "dd"), (0, "e"), (0.05, "f")]
+
+    pieces = [piece async for piece in coalesce_chunks(_deltas(*steps), max_delay=0.02, max_chars=4)]
+
+    # "a" goes out at once, "bcdd" hits the size cap, "e" waits out the delay.
+    assert pieces == ["a", "bcdd", "e", "f"]
+
+
+@pytest.mark.asyncio
+async def test_closing_the_coalescer_cancels_the_upstream_stream():
+    upstream_closed = asyncio.Event()
+
+    async def endless():
+        try:
+            while True:
+                await asyncio.sleep(0.001)
+                yield "x"
+        finally:
+            upstream_closed.set()
+
+    pieces = coalesce_chunks(endless(), max_delay=0.01, max_chars=1000)
+    assert await anext(pieces) == "x"
+    await pieces.aclose()
+
+    assert upstream_closed.is_set()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_stops_the_model_and_keeps_the_sent_part(small_pool, monkeypatch):
+    _, session_factory = small_pool
+    streams: list[_Stream] = []
+
+    async def endless():
+        index = 0
+        while True:
+            await asyncio.sleep(0.001)
+            index += 1
+            yield _delta(f"w{index} ")
+
+    async def create(**kwargs):
+        streams.append(_Stream(endless()))
+        return streams[-1]
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(chat_service, "get_openai_client", lambda: client)
+    monkeypatch.setattr(chat_service, "AsyncSessionLocal", session_factory)
+
+    polls = 0
+
+    async def is_disconnected() -> bool:
+        nonlocal polls
+        polls += 1
+        return polls > 2
+
+    async with session_factory() as db:
+        turn = await prepare_chat_turn(db, user_id=1, user_message="hi")
+        await db.commit()
+    frames = [frame async for frame in chat_event_stream(turn, is_disconnected=is_disconnected)]
+
+    assert len(frames) == 2
+    assert SSE_DONE_FRAME not in frames
+    assert streams[0].closed
+    async with session_factory() as db:
+        reply = await db.scalar(select(ChatMessage.content).where(ChatMessage.role == ChatRole.ASSISTANT))
+    assert reply == "".join(orjson.loads(frame.removeprefix(b"data: "))["chunk"] for frame in frames)
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_mid_reply_saves_the_sent_part(small_pool, monkeypatch):
+    # Starlette closes the generator at its yield when a send fails: the piece
+    # it was sending never arrived, everything before it did.
+    _, session_factory = small_pool
+
+    async def words():
+        for index in range(50):
+            await asyncio.sleep(0.001)
+            yield _delta(f"w{index} ")
+
+    async def create(**kwargs):
+        return _Stream(words())
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(chat_service, "get_openai_client", lambda: client)
+    monkeypatch.setattr(chat_service, "AsyncSessionLocal", session_factory)
+
+    async with session_factory() as db:
+        turn = await prepare_chat_turn(db, user_id=1, user_message="hi")
+        await db.commit()
+    stream = chat_event_stream(turn)
+    delivered = await anext(stream)
+    await anext(stream)
+    await stream.aclose()
+
+    async with session_factory() as db:
+        reply = await db.scalar(select(ChatMessage.content).where(ChatMessage.role == ChatRole.ASSISTANT))
+    assert reply == orjson.loads(delivered.removeprefix(b"data: "))["chunk"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_response_task_still_saves_the_sent_part(small_pool, monkeypatch):
+    _, session_factory = small_pool
+    first_sent = asyncio.Event()
+
+    async def slow_words():
+        yield _delta("Bonjour")
+        await asyncio.sleep(10)
+        yield _delta(" jamais")
+
+    async def create(**kwargs):
+        return _Stream(slow_words())
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(chat_service, "get_openai_client", lambda: client)
+    monkeypatch.setattr(chat_service, "AsyncSessionLocal", session_factory)
+
+    async with session_factory() as db:
+        turn = await prepare_chat_turn(db, user_id=1, user_message="hi")
+        await db.commit()
+
+    async def respond():
+        async for _ in chat_event_stream(turn):
+            first_sent.set()
+
+    task = asyncio.create_task(respond())
+    await first_sent.wait()
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.gather(*chat_service._finish_tasks)
+
+    async with session_factory() as db:
+        reply = await db.scalar(select(ChatMessage.content).where(ChatMessage.role == ChatRole.ASSISTANT))
+    assert reply == "Bonjour"
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.base import Base
+from app.db.models import User, UserPreference
+from app.services.state_version import state_versions
+from tests.conftest import TEST_PASSWORD
+
+POLLED = ["/api/bootstrap", "/api/dashboard", "/api/training/words", "/api/community"]
+
+
+def _register(client: TestClient) -> str:
+    csrf_token = client.get("/api/bootstrap").json()["csrf_token"]
+    response = client.post(
+        "/api/auth/register",
+        json={
+            "username": f"etag_{uuid4().hex[:10]}",
+            "password": TEST_PASSWORD,
+            "confirm_password": TEST_PASSWORD,
+            "csrf_token": csrf_token,
+        },
+    )
+    assert response.status_code == 200
+    return csrf_token
+
+
+@contextmanager
+def _other_session(client: TestClient):
+    # A second TestClient would start a second app lifespan; swap cookies instead.
+    saved = dict(client.cookies)
+    client.cookies.clear()
+    try:
+        yield client
+    finally:
+        client.cookies.clear()
+        client.cookies.update(saved)
+
+
+def _revalidate(client: TestClient, path: str, etag: str):
+    return client.get(path, headers={"If-None-Match": etag})
+
+
+@pytest.fixture()
+def learner(client: TestClient, smoke_user) -> str:
+    return _register(client)
+
+
+@pytest.mark.parametrize("path", POLLED)
+def test_unchanged_state_returns_304_without_building(client: TestClient, learner: str, query_budget, path: str):
+    client.get(path)  # first load may create preference rows
+    first = client.get(path)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    cached = _revalidate(client, path, first.headers["etag"])
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == first.headers["etag"]
+    # Only the session/auth lookups run; no snapshot builder.
+    query_budget(cached, 3, label=f"304 {path}")
+
+
+def test_own_writes_change_the_tag(client: TestClient, learner: str):
+    etags = {path: client.get(path).headers["etag"] for path in POLLED}
+
+    response = client.post("/api/preferences/sound", json={"sound_enabled": True, "csrf_token": learner})
+    assert response.status_code == 200
+
+    for path in POLLED:
+        refreshed = _revalidate(client, path, etags[path])
+        assert refreshed.status_code == 200, path
+        assert refreshed.headers["etag"] != etags[path]
+
+
+def test_other_users_only_invalidate_shared_leaderboards(client: TestClient, learner: str):
+    training = client.get("/api/training/words").headers["etag"]
+    community = client.get("/api/community").headers["etag"]
+
+    with _other_session(client) as other:
+        other_csrf = _register(other)
+        assert other.post("/api/preferences/theme", json={"theme": "dark", "csrf_token": other_csrf}).status_code == 200
+
+    assert _revalidate(client, "/api/training/words", training).status_code == 304
+    assert _revalidate(client, "/api/community", community).status_code == 200
+
+
+def test_tag_belongs_to_the_session(client: TestClient, learner: str):
+    etag = client.get("/api/bootstrap").headers["etag"]
+
+    with _other_session(client) as anonymous:
+        assert _revalidate(anonymous, "/api/bootstrap", etag).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_savepoint_rollback_keeps_the_outer_changes(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'versions.db'}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with factory() as db:
+            user = User(username=f"etag_{uuid4().hex[:10]}", password_hash="x")
+            db.add(user)
+            await db.flush()
+            before = state_versions.user(user.id)
+            try:
+                async with db.begin_nested():
+                    db.add(UserPreference(user_id=user.id))
+                    await db.flush()
+                    raise RuntimeError("undo the savepoint")
+            except RuntimeError:
+                pass
+            await db.commit()
+
+        assert state_versions.user(user.id) == before + 1
+    finally:
+        await engine.dispose()
@@ -1,4 +1,37 @@
-from app.services.normalization import normalize_for_comparison
+import csv
+import unicodedata
+from pathlib import Path
+
+from app.services.normalization import normalize_for_comparison, normalize_reference
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "app" / "data"
+
+
+def _legacy_normalize(text: str | None) -> str:
+    """The original NFD + category scan, kept as the equivalence oracle."""
+    if not text:
+        return ""
+    lowered = text.strip().lower()
+    decomposed = unicodedata.normalize("NFD", lowered)
+    no_marks = "".join(ch for ch in decomposed if unicodedata.category(ch) != "Mn")
+    for source, target in {"ñ": "n", "ç": "c", "œ": "oe", "æ": "ae"}.items():
+        no_marks = no_marks.replace(source, target)
+    return no_marks
+
+
+def _seeded_strings() -> set[str]:
+    values: set[str] = set()
+    paths = [
+        *(DATA_DIR / "legacy_seed").rglob("*.csv"),
+        *(DATA_DIR / "curated_conjugations").rglob("*.csv"),
+    ]
+    for path in paths:
+        with path.open(encoding="utf-8-sig", newline="") as handle:
+            for row in csv.reader(handle):
+                for cell in row:
+                    values.add(cell)
+                    values.update(part for part in cell.replace(";", ",").split(",") if part)
+    return values
 
 
 def test_normalize_removes_accents_and_special_chars():
@@ -6,3 +39,34 @@ def test_normalize_removes_accents_and_special_chars():
     assert normalize_for_comparison("niño") == "nino"
     assert normalize_for_comparison("façade") == "facade"
     assert normalize_for_comparison("œuvre") == "oeuvre"
+
+
+def test_normalize_matches_legacy_for_all_seeded_vocabulary():
+    values = _seeded_strings()
+    assert len(values) > 10_000
+    mismatches = [value for value in values if normalize_for_comparison(value) != _legacy_normalize(value)]
+    assert mismatches == []
+
+
+def test_normalize_matches_legacy_for_every_bmp_character():
+    for codepoint in range(0x10000):
+        if 0xD800 <= codepoint <= 0xDFFF:
+            continue
+        char = chr(codepoint)
+        for text in (char, f"A{char}b", f"É {char}й"):
+            assert normalize_for_comparison(text) == _legacy_normalize(text), hex(codepoint)
+
+
+def test_normalize_handles_mixed_scripts_and_whitespace():
+    for text in ["  Ёлка И ЙОД ", "Ça va", "İstanbul", "ǅemal", "한국어", "naïve’s", None, ""]:
+        assert normalize_for_comparison(text) == _legacy_normalize(text)
+    assert normalize_for_comparison("Йогурт") == "иогурт"
+
+
+def test_normalize_reference_is_memoized():
+    normalize_reference.cache_clear()
+    assert normalize_reference("Éléphant") == "elephant"
+    assert normalize_reference("Éléphant") == "elephant"
+    info = normalize_reference.cache_info()
+    assert info.hits == 1
+    assert info.maxsize is not None
@@ -7,6 +7,7 @@ from PIL import Image
 from app.services.ocr_service import (
     MAX_UPLOAD_BYTES,
     OcrBox,
+    OcrBusyError,
     OcrResult,
     OcrUnavailableError,
     OcrWord,
@@ -52,6 +53,8 @@ async def _fake_extract(data: bytes, lang: str) -> OcrResult:
                 box=OcrBox(x=0.4, y=0.2, width=0.32, height=0.12),
             ),
         ],
+        queue_position=2,
+        timings_ms={"queue": 120.0, "decode": 8.5},
     )
 
 
@@ -69,6 +72,8 @@ def test_ocr_endpoint_returns_extracted_text(client, smoke_user, monkeypatch):
     assert payload["lines"] == ["hola mundo"]
     assert payload["mean_confidence"] == 91.5
     assert payload["ocr_lang"] == "es"
+    assert payload["queue_position"] == 2
+    assert response.headers["server-timing"] == "ocr-queue;dur=120.0, ocr-decode;dur=8.5"
     assert payload["words"] == [
         {
             "text": "hola",
@@ -125,6 +130,63 @@ def test_ocr_endpoint_rejects_oversized_upload(client, smoke_user):
     assert response.status_code == 413
 
 
+def test_ocr_endpoint_hands_the_spooled_file_to_ocr(client, smoke_user, monkeypatch):
+    seen = {}
+
+    async def _capture(source, lang: str) -> OcrResult:
+        seen["bytes"] = source.read()
+        seen["is_file"] = not isinstance(source, bytes)
+        return await _fake_extract(b"", lang)
+
+    monkeypatch.setattr("app.routers.words.extract_text", _capture)
+    csrf_token = _login(client, smoke_user)
+    photo = _jpeg_bytes()
+    response = client.post(
+        "/api/words/ocr",
+        files={"image": ("subtitle.jpg", photo, "image/jpeg")},
+        data={"csrf_token": csrf_token, "lang_code": "ES"},
+    )
+    assert response.status_code == 200
+    assert seen == {"bytes": photo, "is_file": True}
+
+
+def test_ocr_endpoint_rejects_declared_oversized_body_before_reading(client, smoke_user):
+    csrf_token = _login(client, smoke_user)
+    response = client.post(
+        "/api/words/ocr",
+        content=b"--x--",
+        headers={
+            "content-type": "multipart/form-data; boundary=x",
+            "content-length": str(MAX_UPLOAD_BYTES * 2),
+            "x-csrf-token": csrf_token,
+        },
+    )
+    assert response.status_code == 413
+
+
+def test_ocr_endpoint_caps_streamed_body_without_content_length(client, smoke_user):
+    csrf_token = _login(client, smoke_user)
+    boundary = "ocrboundary"
+    head = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"csrf_token\"\r\n\r\n{csrf_token}\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"image\"; filename=\"a.jpg\"\r\n"
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode()
+
+    def chunked_body():
+        yield head
+        for _ in range(MAX_UPLOAD_BYTES // (1024 * 1024) + 2):
+            yield b"\xff" * (1024 * 1024)
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    response = client.post(
+        "/api/words/ocr",
+        content=chunked_body(),
+        headers={"content-type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert response.status_code == 413
+
+
 def test_ocr_endpoint_maps_missing_engine_to_503(client, smoke_user, monkeypatch):
     async def _unavailable(data: bytes, lang: str) -> OcrResult:
         raise OcrUnavailableError("RapidOCR is not installed.")
@@ -139,6 +201,25 @@ def test_ocr_endpoint_maps_missing_engine_to_503(client, smoke_user, monkeypatch
     assert response.status_code == 503
 
 
+def test_ocr_endpoint_maps_full_queue_to_503_with_retry_after(client, smoke_user, monkeypatch):
+    async def _busy(data: bytes, lang: str) -> OcrResult:
+        raise OcrBusyError("OCR is busy. Try again in a moment.")
+
+    monkeypatch.setattr("app.routers.words.extract_text", _busy)
+    csrf_token = _login(client, smoke_user)
+    response = client.post(
+        "/api/words/ocr",
+        files={"image": ("subtitle.jpg", _jpeg_bytes(), "image/jpeg")},
+        data={"csrf_token": csrf_token, "lang_code": "es"},
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+
+    queue = client.get("/api/words/ocr/queue")
+    assert queue.status_code == 200
+    assert set(queue.json()) == {"workers", "busy", "waiting", "queue_limit"}
+
+
 def test_ocr_endpoint_requires_auth(client, smoke_user):
     response = client.post(
         "/api/words/ocr",
@@ -1,16 +1,23 @@
 import asyncio
 import importlib.util
 import io
+import threading
 from types import SimpleNamespace
 
 import numpy as np
 import pytest
 from PIL import Image, ImageDraw, ImageFont
 
+from app.services import ocr_cache, ocr_service
+from app.services.ocr_cache import OcrResultCache
 from app.services.ocr_service import (
     OCR_LANG_BY_CODE,
+    OCR_STAGES,
+    OcrBusyError,
     OcrError,
+    OcrResult,
     OcrUnavailableError,
+    _OcrPool,
     _preprocess,
     _run,
     extract_text,
@@ -40,11 +47,12 @@ def _text_image(text: str) -> bytes:
 
 
 class _FakeEngine:
-    def __init__(self, txts, scores, word_results=None):
+    def __init__(self, txts, scores, word_results=None, elapse_list=None):
         self._output = SimpleNamespace(
             txts=txts,
             scores=scores,
             word_results=word_results,
+            elapse_list=elapse_list,
         )
 
     def __call__(self, img):
@@ -63,6 +71,26 @@ def test_preprocess_downscales_and_returns_bgr_array():
     assert max(processed.shape[:2]) <= 1600
 
 
+def test_preprocess_applies_exif_orientation_and_contiguous_bgr():
+    photo = Image.new("RGB", (4000, 2000), (220, 30, 10))
+    exif = photo.getexif()
+    exif[0x0112] = 6  # camera held sideways: display rotated 90° clockwise
+    buffer = io.BytesIO()
+    photo.save(buffer, "JPEG", quality=90, exif=exif.tobytes())
+
+    processed = _preprocess(buffer.getvalue())
+
+    assert processed.shape == (1600, 800, 3)
+    assert processed.flags.c_contiguous and processed.flags.writeable
+    blue, green, red = processed[800, 400].tolist()
+    assert red > 200 and blue < 40
+
+
+def test_preprocess_converts_grayscale_png():
+    processed = _preprocess(_to_bytes(Image.new("L", (2400, 300), 90), fmt="PNG"))
+    assert processed.shape == (200, 1600, 3)
+
+
 def test_preprocess_rejects_garbage_bytes():
     with pytest.raises(OcrError):
         _preprocess(b"definitely not an image")
@@ -82,6 +110,16 @@ def test_run_filters_low_score_lines_and_scales_confidence():
     assert result.mean_confidence == 96.0
 
 
+def test_preprocess_and_run_report_stage_timings():
+    timings: dict[str, float] = {}
+    img = _preprocess(_to_bytes(Image.new("RGB", (2400, 1200), (90, 90, 90))), timings)
+    _run(_FakeEngine(["x"], [0.9], elapse_list=[0.02, None, 0.05]), img, timings)
+
+    assert set(timings) == {"decode", "resize", "detect", "recognize"}
+    assert timings["detect"] == pytest.approx(20.0)
+    assert timings["recognize"] == pytest.approx(50.0)
+
+
 def test_run_handles_empty_output():
     engine = _FakeEngine(None, None)
     result = _run(engine, np.zeros((10, 10, 3), dtype=np.uint8))
@@ -136,3 +174,128 @@ def test_extract_reads_text_image():
 def test_extract_garbage_raises_ocr_error():
     with pytest.raises(OcrError):
         asyncio.run(extract_text(b"not an image", "en"))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_ocr_cache(monkeypatch):
+    monkeypatch.setattr(ocr_cache, "_CACHE", OcrResultCache(max_entries=8, ttl_seconds=60))
+
+
+def _stub_pool(monkeypatch, *, workers: int, queue_limit: int, work) -> _OcrPool:
+    pool = _OcrPool(workers, queue_limit)
+    monkeypatch.setattr(ocr_service, "_POOL", pool)
+
+    def fake_extract(data, lang_code, slot=0, timings=None):
+        work(slot)
+        timings["decode"] = 1.0
+        return OcrResult(text=str(slot), lines=[str(slot)], mean_confidence=90.0)
+
+    monkeypatch.setattr(ocr_service, "_extract_sync", fake_extract)
+    return pool
+
+
+def test_pool_queues_then_rejects_beyond_the_limit(monkeypatch):
+    gate = threading.Event()
+    pool = _stub_pool(monkeypatch, workers=1, queue_limit=1, work=lambda slot: gate.wait(5))
+
+    async def scenario():
+        first = asyncio.create_task(extract_text(b"a", "en"))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(extract_text(b"b", "en"))
+        await asyncio.sleep(0.05)
+        assert (pool.busy, pool.waiting) == (1, 1)
+        with pytest.raises(OcrBusyError):
+            await extract_text(b"c", "en")
+        gate.set()
+        return await first, await second
+
+    first, second = asyncio.run(scenario())
+
+    assert (first.queue_position, second.queue_position) == (0, 1)
+    assert second.timings_ms["queue"] > 0
+    assert set(second.timings_ms) == set(OCR_STAGES)
+    stats = pool.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert (stats["busy"], stats["waiting"]) == (0, 0)
+
+
+def test_pool_runs_workers_in_parallel_with_their_own_slots(monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+    _stub_pool(monkeypatch, workers=2, queue_limit=0, work=lambda slot: barrier.wait())
+
+    async def scenario():
+        return await asyncio.gather(extract_text(b"a", "en"), extract_text(b"b", "en"))
+
+    results = asyncio.run(scenario())
+
+    assert sorted(result.text for result in results) == ["0", "1"]
+
+
+def test_cancelled_waiter_leaves_the_queue(monkeypatch):
+    gate = threading.Event()
+    pool = _stub_pool(monkeypatch, workers=1, queue_limit=2, work=lambda slot: gate.wait(5))
+
+    async def scenario():
+        running = asyncio.create_task(extract_text(b"a", "en"))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(extract_text(b"b", "en"))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.sleep(0)
+        assert pool.waiting == 0
+        gate.set()
+        await running
+
+    asyncio.run(scenario())
+    assert (pool.busy, pool.waiting) == (0, 0)
+
+
+def test_repeat_upload_is_served_from_cache_for_a_shared_model(monkeypatch):
+    calls = []
+    pool = _stub_pool(monkeypatch, workers=1, queue_limit=0, work=calls.append)
+
+    first = asyncio.run(extract_text(b"same photo", "es"))
+    again = asyncio.run(extract_text(b"same photo", "fr"))  # es and fr share the latin model
+    other_model = asyncio.run(extract_text(b"same photo", "ru"))
+
+    assert len(calls) == 2
+    assert pool.stats()["completed"] == 2
+    assert not first.cached and not other_model.cached
+    assert again.cached
+    assert (again.text, again.lines, again.mean_confidence) == (first.text, first.lines, 90.0)
+    assert set(again.timings_ms) == {"cache"}
+
+
+def test_cache_round_trips_words_through_disk_tier(tmp_path):
+    result = OcrResult(
+        text="hola",
+        lines=["hola"],
+        mean_confidence=96.0,
+        words=[ocr_service.OcrWord("hola", 96.0, ocr_service.OcrBox(0.1, 0.2, 0.3, 0.1))],
+    )
+    writer = OcrResultCache(max_entries=4, ttl_seconds=60, directory=tmp_path)
+    writer.put("latin-abc", ocr_service._result_payload(result))
+
+    # A fresh process (empty memory tier) reads it back from disk.
+    reader = OcrResultCache(max_entries=4, ttl_seconds=60, directory=tmp_path)
+    restored = ocr_service._result_from_payload(reader.get("latin-abc"))
+
+    assert restored.words == result.words
+    assert restored.cached
+    assert reader.stats()["entries"] == 1
+
+
+def test_cache_enforces_lru_size_and_ttl(tmp_path, monkeypatch):
+    cache = OcrResultCache(max_entries=2, ttl_seconds=60, directory=tmp_path, max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"key": key})
+
+    assert cache.get("a") == {"key": "a"}  # evicted from memory, still on disk
+    assert cache.prune_disk() == 1
+    assert sorted(path.stem for path in tmp_path.glob("*.json")) == ["b", "c"]
+
+    later = ocr_cache.time.time() + 120
+    monkeypatch.setattr(ocr_cache.time, "time", lambda: later)
+    assert cache.get("c") is None
+    assert not (tmp_path / "c.json").exists()
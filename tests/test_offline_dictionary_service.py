@@ -31,8 +31,10 @@ from app.db.models import (
     WordTranslation,
 )
 from app.core.security import AuthContext
+from app.routers import words as words_router
 from app.routers.words import (
     add_word,
+    add_words_bulk,
     add_word_offline,
     delete_user_word,
     list_user_words,
@@ -43,12 +45,14 @@ from app.routers.words import (
 from app.schemas.spa import (
     AddWordOfflinePayload,
     AddWordPayload,
+    AddWordsBulkPayload,
     DeleteUserWordPayload,
     SelectWordSensePayload,
 )
-from app.services.offline_dictionary_service import find_ranked_sense
+from app.services.offline_dictionary_service import find_ranked_sense, find_ranked_senses
 from app.services.word_ai_service import (
     WORD_AI_SOURCE,
+    BulkWordInput,
     DefinitionPresentation,
     LexicalContent,
     NativeContent,
@@ -59,6 +63,7 @@ from app.services.word_ai_service import (
     present_definitions,
     translate_selected_sense,
     translate_word,
+    translate_words_bulk,
 )
 
 
@@ -1129,7 +1134,8 @@ async def test_add_word_same_language_is_saved_definition_not_practice(
 
     queue = await priority_queue(auth=auth, db=sqlite_session)
     assert queue["entries"] == []
-    history = await word_history(limit=20, auth=auth, db=sqlite_session)
+    history_response = await word_history(limit=20, auth=auth, db=sqlite_session)
+    history = json.loads(history_response.body)
     assert history["entries"][0]["lookup_mode"] == "definition"
     assert history["entries"][0]["practice_eligible"] is False
     managed = await list_user_words(
@@ -1243,11 +1249,12 @@ async def test_add_endpoint_snapshots_target_language_definition(
     assert lookup.result_data["lexical"]["definition"] == "land beside a river"
     assert lookup.result_data["display_definition"] == response["display_definition"]
 
-    history = await word_history(
+    history_response = await word_history(
         limit=20,
         auth=AuthContext(user=user, profile=profile),
         db=sqlite_session,
     )
+    history = json.loads(history_response.body)
     assert history["entries"][0]["definition_language_code"] == "FR"
     assert (
         history["entries"][0]["display_definition"]
@@ -1377,11 +1384,12 @@ async def test_offline_add_does_not_cache_translation_as_definition(
         await sqlite_session.execute(select(WordNativeTranslation))
     ).scalar_one()
     assert native.translation == "banque"
-    history = await word_history(
+    history_response = await word_history(
         limit=20,
         auth=AuthContext(user=user, profile=profile),
         db=sqlite_session,
     )
+    history = json.loads(history_response.body)
     assert history["entries"][0]["display_definition"]["text"] == ""
     assert history["entries"][0]["natives"][0]["translation"] == "banque"
 
@@ -1483,11 +1491,12 @@ async def test_history_repairs_legacy_private_pseudo_definition_from_trusted_sen
     )
     await sqlite_session.flush()
 
-    history = await word_history(
+    history_response = await word_history(
         limit=20,
         auth=AuthContext(user=user, profile=profile),
         db=sqlite_session,
     )
+    history = json.loads(history_response.body)
 
     entry = history["entries"][0]
     assert entry["definition_language_code"] == "EN"
@@ -1724,3 +1733,349 @@ async def test_user_can_replace_ranked_sense_on_private_lookup(
     assert lookup.result_data["definition_language_code"] == "FR"
     assert lookup.ranking_method == "user_selected"
     assert added.selected_sense_id == river.id
+
+
+@pytest.mark.asyncio
+async def test_concurrent_plain_lookups_share_one_ai_call(monkeypatch):
+    import asyncio
+
+    engines = [
+        create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        for _ in range(2)
+    ]
+    sessions = []
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions.append(async_sessionmaker(engine, expire_on_commit=False)())
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    calls = []
+
+    async def fake_json(*args, **kwargs):
+        calls.append(kwargs["user_id"])
+        await asyncio.sleep(0.05)
+        return {
+            "status": "exact",
+            "canonical_text": "ephemeral",
+            "part_of_speech": "adjective",
+            "definition": "lasting for only a very short time",
+            "synonyms": [],
+            "examples": [],
+            "native_translations": [{"translation": "éphémère"}],
+            "suggested_tags": [],
+        }
+
+    monkeypatch.setattr(
+        "app.services.word_ai_service._call_openai_json", fake_json
+    )
+
+    async def lookup(db, user_id):
+        en, fr = await _languages(db)
+        return await translate_word(
+            db,
+            input_text=" Ephemeral ",
+            learning_lang=en,
+            mother_tongue=fr,
+            user_id=user_id,
+        )
+
+    try:
+        results = await asyncio.gather(
+            lookup(sessions[0], 1), lookup(sessions[1], 2)
+        )
+    finally:
+        for session in sessions:
+            await session.close()
+        for engine in engines:
+            await engine.dispose()
+
+    assert len(calls) == 1
+    assert [result.lexical.definition for result in results] == [
+        "lasting for only a very short time"
+    ] * 2
+    assert [
+        [native.translation for native in result.natives] for result in results
+    ] == [["éphémère"]] * 2
+
+
+async def _bank_with_two_senses(db, en, fr) -> Word:
+    word = Word(text="bank", language_id=en.id)
+    db.add(word)
+    await db.flush()
+    financial = WordSense(
+        word_id=word.id,
+        sense_key="test:financial",
+        definition="an institution for money, deposits, and loans",
+        synonyms=[],
+        examples=[],
+        source="test_dictionary",
+        is_trusted=True,
+        is_primary=True,
+    )
+    river = WordSense(
+        word_id=word.id,
+        sense_key="test:river",
+        definition="sloping land beside a river and water",
+        synonyms=[],
+        examples=[],
+        source="test_dictionary",
+        is_trusted=True,
+    )
+    db.add_all([financial, river])
+    await db.flush()
+    db.add_all(
+        [
+            WordSenseTranslation(
+                sense_id=financial.id,
+                target_language_id=fr.id,
+                translation="banque",
+                source="test_dictionary",
+            ),
+            WordSenseTranslation(
+                sense_id=river.id,
+                target_language_id=fr.id,
+                translation="rive",
+                source="test_dictionary",
+            ),
+        ]
+    )
+    await db.flush()
+    return word
+
+
+@pytest.mark.asyncio
+async def test_find_ranked_senses_batches_words_and_contexts(sqlite_session):
+    en, fr = await _languages(sqlite_session)
+    bank = await _bank_with_two_senses(sqlite_session, en, fr)
+    unknown = Word(text="zzz", language_id=en.id)
+    sqlite_session.add(unknown)
+    await sqlite_session.flush()
+
+    ranked = await find_ranked_senses(
+        sqlite_session,
+        lookups=[
+            (bank, "The children sat beside the river and watched the water."),
+            (bank, None),
+            (unknown, None),
+        ],
+        target_language_id=fr.id,
+    )
+
+    assert ranked[0] is not None and ranked[0].sense.sense_key == "test:river"
+    assert ranked[1] is not None and ranked[1].sense.sense_key == "test:financial"
+    assert ranked[1].method == "primary"
+    assert ranked[2] is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_translation_resolves_offline_then_one_ai_request(
+    sqlite_session, monkeypatch
+):
+    en, fr = await _languages(sqlite_session)
+    await _bank_with_two_senses(sqlite_session, en, fr)
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    requests = []
+
+    async def fake_json(_client, system, user, **kwargs):
+        requests.append(json.loads(user))
+        assert "BATCH MODE" in system
+        assert kwargs["feature"] == "word_translate_bulk"
+        return {
+            "results": [
+                {
+                    "id": 0,
+                    "status": "exact",
+                    "canonical_text": "ephemeral",
+                    "part_of_speech": "adjective",
+                    "definition": "lasting for only a very short time",
+                    "synonyms": [],
+                    "examples": [],
+                    "native_translations": [{"translation": "éphémère"}],
+                    "suggested_tags": [],
+                },
+                {"id": 1, "status": "not_found", "suggestions": ["bank"]},
+            ]
+        }
+
+    monkeypatch.setattr(
+        "app.services.word_ai_service._call_openai_json", fake_json
+    )
+    results = [
+        item
+        async for item in translate_words_bulk(
+            sqlite_session,
+            inputs=[
+                BulkWordInput(text="Ephemeral"),
+                BulkWordInput(text="bank", context="We walked along the river water."),
+                BulkWordInput(text="  "),
+                BulkWordInput(text="bnak"),
+                BulkWordInput(text="ephemeral"),
+            ],
+            learning_lang=en,
+            mother_tongue=fr,
+            user_id=3,
+        )
+    ]
+
+    by_index = {item.index: item for item in results}
+    assert [item.index for item in results][:2] == [2, 1]
+    assert by_index[2].error == "Empty input"
+    assert by_index[1].result.natives[0].translation == "rive"
+    assert by_index[1].result.ranking_method in {
+        "lexical_overlap",
+        "intfloat/multilingual-e5-small",
+    }
+    assert len(requests) == 1
+    assert [entry["word_or_phrase"] for entry in requests[0]["entries"]] == [
+        "Ephemeral",
+        "bnak",
+    ]
+    assert by_index[0].result.natives[0].translation == "éphémère"
+    assert by_index[4].result is by_index[0].result
+    assert by_index[3].result.status == "not_found"
+    assert by_index[3].result.suggestions == ["bank"]
+    assert (
+        await sqlite_session.scalar(
+            select(func.count(Word.id)).where(Word.text == "ephemeral")
+        )
+    ) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_translation_without_api_key_reports_misses(
+    sqlite_session, monkeypatch
+):
+    en, fr = await _languages(sqlite_session)
+    await _bank_with_two_senses(sqlite_session, en, fr)
+    monkeypatch.setattr(settings, "openai_api_key", None)
+
+    results = [
+        item
+        async for item in translate_words_bulk(
+            sqlite_session,
+            inputs=[BulkWordInput(text="bank"), BulkWordInput(text="ephemeral")],
+            learning_lang=en,
+            mother_tongue=fr,
+        )
+    ]
+
+    assert results[0].result.natives[0].translation == "banque"
+    assert results[1].index == 1
+    assert "OPENAI_API_KEY" in results[1].error
+
+
+@pytest.mark.asyncio
+async def test_add_words_bulk_streams_one_line_per_word(sqlite_session, monkeypatch):
+    en, fr = await _languages(sqlite_session)
+    await _bank_with_two_senses(sqlite_session, en, fr)
+    user = User(username="bulk-lookup-owner", password_hash="x")
+    sqlite_session.add(user)
+    await sqlite_session.flush()
+    profile = UserProfile(
+        user_id=user.id,
+        xp=0,
+        level=1,
+        streak_days=0,
+        theme_preference="light",
+    )
+    preference = UserPreference(
+        user_id=user.id,
+        learning_language_id=en.id,
+        mother_tongue_language_id=fr.id,
+    )
+    sqlite_session.add_all([profile, preference])
+    await sqlite_session.flush()
+    monkeypatch.setattr(settings, "openai_api_key", None)
+    monkeypatch.setattr("app.routers.words.validate_csrf", lambda *args: None)
+
+    response = await add_words_bulk.__wrapped__(
+        request=object(),
+        payload=AddWordsBulkPayload(
+            csrf_token="x",
+            entries=[{"text": "bank"}, {"text": "ephemeral"}],
+            context_source="photo",
+        ),
+        auth=AuthContext(user=user, profile=profile),
+        db=sqlite_session,
+    )
+    lines = [json.loads(chunk) async for chunk in response.body_iterator]
+
+    assert response.media_type == "application/x-ndjson"
+    assert lines[0]["index"] == 0
+    assert lines[0]["natives"][0]["translation"] == "banque"
+    assert lines[0]["definition_language_code"] == "EN"
+    assert lines[1]["status"] == "error"
+    assert lines[-1] == {"done": True, "added": 1, "failed": 1}
+    lookup = (
+        await sqlite_session.execute(
+            select(UserWordLookup).where(UserWordLookup.user_id == user.id)
+        )
+    ).scalar_one()
+    assert lookup.context_source == "photo"
+
+
+@pytest.mark.asyncio
+async def test_add_words_bulk_reports_unexpected_failures_and_still_summarises(
+    sqlite_session, monkeypatch
+):
+    en, fr = await _languages(sqlite_session)
+    await _bank_with_two_senses(sqlite_session, en, fr)
+    user = User(username="bulk-lookup-crash", password_hash="x")
+    sqlite_session.add(user)
+    await sqlite_session.flush()
+    profile = UserProfile(user_id=user.id, xp=0, level=1, streak_days=0, theme_preference="light")
+    sqlite_session.add_all(
+        [
+            profile,
+            UserPreference(user_id=user.id, learning_language_id=en.id, mother_tongue_language_id=fr.id),
+        ]
+    )
+    await sqlite_session.flush()
+    monkeypatch.setattr(settings, "openai_api_key", None)
+    monkeypatch.setattr("app.routers.words.validate_csrf", lambda *args: None)
+    real_record = words_router._record_word_lookup
+    calls = []
+
+    async def flaky_record(db, **kwargs):
+        calls.append(kwargs["input_text"])
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return await real_record(db, **kwargs)
+
+    monkeypatch.setattr(words_router, "_record_word_lookup", flaky_record)
+
+    async def bulk(entries):
+        response = await add_words_bulk.__wrapped__(
+            request=object(),
+            payload=AddWordsBulkPayload(csrf_token="x", entries=entries),
+            auth=AuthContext(user=user, profile=profile),
+            db=sqlite_session,
+        )
+        return [json.loads(chunk) async for chunk in response.body_iterator]
+
+    lines = await bulk([{"text": "bank"}, {"text": "bank"}])
+    assert lines[0] == {
+        "index": 0,
+        "input_text": "bank",
+        "status": "error",
+        "detail": "Could not add this word.",
+    }
+    assert lines[1]["natives"][0]["translation"] == "banque"
+    assert lines[-1] == {"done": True, "added": 1, "failed": 1}
+    lookups = (
+        await sqlite_session.execute(select(UserWordLookup).where(UserWordLookup.user_id == user.id))
+    ).scalars().all()
+    assert len(lookups) == 1
+
+    async def broken_stream(*args, **kwargs):
+        raise RuntimeError("upstream")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(words_router, "translate_words_bulk", broken_stream)
+    assert await bulk([{"text": "bank"}]) == [
+        {"done": True, "added": 0, "failed": 0, "error": "Bulk lookup failed."}
+    ]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import openai_client
+from app.services.openai_client import close_openai_client, get_openai_client
+
+
+def _completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "stub",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+    }
+
+
+@pytest.fixture
+def stub_openai(monkeypatch):
+    requests: list[httpx.Request] = []
+    transports: list[httpx.MockTransport] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=_completion("bonjour"))
+
+    def transport() -> httpx.MockTransport:
+        transports.append(httpx.MockTransport(handler))
+        return transports[-1]
+
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(settings, "openai_base_url", "http://stub.local/v1")
+    monkeypatch.setattr(openai_client, "_http_transport", transport)
+    monkeypatch.setattr(openai_client, "_http_client", None)
+    monkeypatch.setattr(openai_client, "_clients", {})
+    yield requests, transports
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_and_reuses_one_transport(stub_openai):
+    requests, transports = stub_openai
+
+    client = get_openai_client()
+    assert get_openai_client() is client
+    for _ in range(3):
+        response = await client.chat.completions.create(
+            model="stub", messages=[{"role": "user", "content": "hi"}]
+        )
+        assert response.choices[0].message.content == "bonjour"
+
+    assert len(transports) == 1
+    assert [str(request.url) for request in requests] == [
+        "http://stub.local/v1/chat/completions"
+    ] * 3
+    assert json.loads(requests[0].content)["model"] == "stub"
+    assert requests[0].headers["authorization"] == "Bearer test-key"
+    await close_openai_client()
+
+
+@pytest.mark.asyncio
+async def test_client_applies_configured_policy(stub_openai, monkeypatch):
+    monkeypatch.setattr(settings, "openai_max_retries", 5)
+    monkeypatch.setattr(settings, "openai_timeout_seconds", 12.0)
+    monkeypatch.setattr(settings, "openai_connect_timeout_seconds", 2.0)
+
+    client = get_openai_client()
+
+    assert client.max_retries == 5
+    assert client.timeout.read == 12.0
+    assert client.timeout.connect == 2.0
+    assert openai_client._http_client.follow_redirects is False
+    await close_openai_client()
+
+
+@pytest.mark.asyncio
+async def test_api_key_change_shares_the_pool(stub_openai, monkeypatch):
+    _, transports = stub_openai
+    first = get_openai_client()
+    monkeypatch.setattr(settings, "openai_api_key", "rotated-key")
+
+    second = get_openai_client()
+
+    assert second is not first
+    assert second.api_key == "rotated-key"
+    assert len(transports) == 1
+    await close_openai_client()
+
+
+@pytest.mark.asyncio
+async def test_close_releases_pool_and_next_call_rebuilds(stub_openai):
+    _, transports = stub_openai
+    client = get_openai_client()
+    http_client = openai_client._http_client
+
+    await close_openai_client()
+
+    assert http_client.is_closed
+    assert openai_client._http_client is None
+    assert get_openai_client() is not client
+    assert len(transports) == 2
+    await close_openai_client()
@@ -0,0 +1,189 @@
+"""Query-count budgets for the hot SPA/API endpoints.
+
+Each step drives one real request through the app and fails when it runs more
+SQL statements than its budget. The budgets sit a little above today's counts:
+a failure here almost always means a loop started issuing one query per item
+(N+1) in training_service, dashboard_service or gamification. When a change
+legitimately needs more queries, raise the budget in the same commit and say
+why. Counts and wall times for every step are printed in the pytest summary.
+"""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.session import engine
+from tests.conftest import TEST_PASSWORD, VERB_TRANSLATIONS, WORD_TRANSLATIONS
+
+# Statement budgets per endpoint for a freshly registered learner.
+BUDGETS: dict[str, int] = {
+    "bootstrap": 4,
+    "register": 6,
+    "dashboard": 32,
+    "community": 19,
+    "words_state": 8,
+    "words_start": 27,
+    "words_answer": 38,
+    "words_hint": 20,
+    "words_finish": 14,
+    "verbs_start": 27,
+    "verbs_answer": 38,
+    "verbs_hint": 20,
+    "verbs_finish": 14,
+    "conjugation_start": 25,
+    "conjugation_check": 9,
+    "conjugation_submit": 52,
+    "conjugation_finish": 17,
+    "word_add": 12,
+    "word_history": 12,
+    "priority_queue": 6,
+}
+
+# Statement shapes a single request may repeat SQL_REPEAT_THRESHOLD+ times.
+MAX_REPEATED_SHAPES = 0
+
+CONJUGATION_ANSWERS = {
+    "je": "vais",
+    "tu": "vas",
+    "il": "va",
+    "nous": "allons",
+    "vous": "allez",
+    "ils": "vont",
+}
+
+
+@pytest.fixture()
+def learner(client: TestClient, smoke_user: dict[str, str], query_budget) -> str:
+    bootstrap = client.get("/api/bootstrap")
+    query_budget(bootstrap, BUDGETS["bootstrap"], label="bootstrap")
+    csrf_token = bootstrap.json()["csrf_token"]
+    register = client.post(
+        "/api/auth/register",
+        json={
+            "username": f"budget_{uuid4().hex[:10]}",
+            "password": TEST_PASSWORD,
+            "confirm_password": TEST_PASSWORD,
+            "csrf_token": csrf_token,
+        },
+    )
+    assert register.status_code == 200
+    query_budget(register, BUDGETS["register"], label="register")
+    return csrf_token
+
+
+def _check(query_budget, response, name: str) -> None:
+    assert response.status_code == 200, f"{name}: {response.status_code} {response.text[:200]}"
+    query_budget(response, BUDGETS[name], max_repeated=MAX_REPEATED_SHAPES, label=name)
+
+
+def test_bootstrap_is_read_only(client: TestClient, learner: str):
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/api/bootstrap").status_code == 200
+        assert client.get("/app/dashboard").status_code == 200
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert statements
+    assert all(statement.lstrip().upper().startswith("SELECT") for statement in statements), statements
+
+
+def test_dashboard_and_community_budgets(client: TestClient, learner: str, query_budget):
+    _check(query_budget, client.get("/api/bootstrap"), "bootstrap")
+    _check(query_budget, client.get("/api/dashboard"), "dashboard")
+    _check(query_budget, client.get("/api/community"), "community")
+
+
+@pytest.mark.parametrize(
+    ("slug", "direction", "answers"),
+    [
+        ("words", "es_fr", WORD_TRANSLATIONS),
+        ("verbs", "fr_es", VERB_TRANSLATIONS),
+    ],
+)
+def test_translation_flow_budgets(
+    client: TestClient,
+    learner: str,
+    query_budget,
+    slug: str,
+    direction: str,
+    answers: dict[str, str],
+):
+    csrf = {"csrf_token": learner}
+    if slug == "words":
+        _check(query_budget, client.get("/api/training/words"), "words_state")
+
+    start = client.post(f"/api/training/{slug}/start", json={"length": 5, "direction": direction, **csrf})
+    _check(query_budget, start, f"{slug}_start")
+
+    _check(query_budget, client.post(f"/api/training/{slug}/hint", json=csrf), f"{slug}_hint")
+
+    prompt = client.get(f"/api/training/{slug}").json()["question"]["prompt"]
+    answer = client.post(
+        f"/api/training/{slug}/answer",
+        json={"answer": answers.get(prompt, "wrong"), **csrf},
+    )
+    _check(query_budget, answer, f"{slug}_answer")
+
+    _check(query_budget, client.post(f"/api/training/{slug}/finish", json=csrf), f"{slug}_finish")
+
+
+def _start_conjugation(client: TestClient, csrf_token: str):
+    return client.post(
+        "/api/training/conjugation/start",
+        json={
+            "language": "FR",
+            "level": "custom",
+            "fill_level": "hard",
+            "selected_tenses": ["Présent"],
+            "length": 3,
+            "csrf_token": csrf_token,
+        },
+    )
+
+
+def test_conjugation_flow_budgets(client: TestClient, learner: str, query_budget):
+    csrf = {"csrf_token": learner}
+    _check(query_budget, _start_conjugation(client, learner), "conjugation_start")
+
+    check = client.post(
+        "/api/training/conjugation/check-tense",
+        json={"tense": "Présent", "answers": CONJUGATION_ANSWERS, **csrf},
+    )
+    _check(query_budget, check, "conjugation_check")
+
+    submit = client.post(
+        "/api/training/conjugation/submit",
+        json={"answers": {"Présent": CONJUGATION_ANSWERS}, **csrf},
+    )
+    _check(query_budget, submit, "conjugation_submit")
+
+    # The seeded inventory holds a single complete table, so submitting it ends
+    # the round; finish is measured on a fresh one.
+    assert _start_conjugation(client, learner).status_code == 200
+    _check(query_budget, client.post("/api/training/conjugation/finish", json=csrf), "conjugation_finish")
+
+
+def test_word_add_and_history_budgets(client: TestClient, learner: str, query_budget):
+    add = client.post(
+        "/api/words/add-offline",
+        json={
+            "learning_text": "ventana",
+            "native_text": "fenêtre",
+            "learning_lang_code": "ES",
+            "mother_lang_code": "FR",
+            "csrf_token": learner,
+        },
+    )
+    _check(query_budget, add, "word_add")
+    _check(query_budget, client.get("/api/words/history"), "word_history")
+    _check(query_budget, client.get("/api/words/priority-queue"), "priority_queue")
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.query_metrics import (
+    QUERY_COUNT_HEADER,
+    QUERY_TIME_HEADER,
+    QueryStats,
+    install_query_metrics,
+    statement_shape,
+    track_queries,
+)
+
+
+def test_statement_shape_collapses_parameters_and_in_lists():
+    first = statement_shape("SELECT words.id FROM words\n WHERE words.id IN ($1, $2, $3) LIMIT $4")
+    second = statement_shape("SELECT words.id FROM words WHERE words.id IN ($1, $2) LIMIT $3")
+    assert first == second
+    assert statement_shape("SELECT * FROM t WHERE id = ?") == statement_shape("SELECT * FROM t WHERE id = ?")
+
+
+def test_repeated_flags_shapes_at_threshold():
+    stats = QueryStats()
+    for item_id in range(6):
+        stats.record(f"SELECT * FROM verbs WHERE id = {item_id}", 0.1)
+    stats.record("SELECT 1", 0.1)
+    assert stats.count == 7
+    assert stats.repeated(5) == [("SELECT * FROM verbs WHERE id = N", 6)]
+    assert stats.repeated(7) == []
+
+
+@pytest.mark.asyncio
+async def test_track_queries_counts_statements_in_context_only():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    install_query_metrics(engine)
+    install_query_metrics(engine)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            with track_queries() as stats:
+                for value in range(3):
+                    await conn.execute(text("SELECT :value"), {"value": value})
+            await conn.execute(text("SELECT 2"))
+    finally:
+        await engine.dispose()
+
+    assert stats.count == 3
+    assert stats.total_ms >= 0
+    assert stats.repeated(3) == [("SELECT ?", 3)]
+
+
+def test_readyz_reports_query_metrics(client, smoke_user, query_budget):
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert float(response.headers[QUERY_TIME_HEADER]) >= 0
+    assert query_budget(response, 1) == int(response.headers[QUERY_COUNT_HEADER])
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.single_flight import SingleFlight, advisory_lock_key, advisory_xact_lock
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight: SingleFlight[str] = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "done"
+
+    tasks = [asyncio.create_task(flight.run("k", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert flight.pending("k")
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["done"] * 5
+    assert calls == 1
+    assert not flight.pending("k")
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_every_waiter_and_is_not_cached():
+    flight: SingleFlight[str] = SingleFlight()
+    attempts = 0
+
+    async def fail() -> str:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        flight.run("k", fail), flight.run("k", fail), return_exceptions=True
+    )
+    assert [str(result) for result in results] == ["upstream down"] * 2
+    assert attempts == 1
+
+    async def succeed() -> str:
+        return "ok"
+
+    assert await flight.run("k", succeed) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_follower_takes_over_when_leader_is_cancelled():
+    flight: SingleFlight[str] = SingleFlight()
+    started = asyncio.Event()
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.01)
+        return "follower result"
+
+    leader = asyncio.create_task(flight.run("k", work))
+    await started.wait()
+    follower = asyncio.create_task(flight.run("k", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "follower result"
+    assert calls == 2
+
+
+def test_advisory_lock_key_is_stable_signed_bigint():
+    key = advisory_lock_key("word_lookup", "banco", 1, 2)
+    assert key == advisory_lock_key("word_lookup", "banco", 1, 2)
+    assert key != advisory_lock_key("word_lookup", "banco", 2, 1)
+    assert -(2**63) <= key < 2**63
+
+
+@pytest.mark.asyncio
+async def test_advisory_lock_is_a_noop_off_postgres():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with AsyncSession(engine) as db:
+        assert await advisory_xact_lock(db, "word_lookup", "banco") is False
+    await engine.dispose()
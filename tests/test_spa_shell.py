@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import re
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.routers import spa
+from tests.conftest import TEST_PASSWORD
+
+BOOT_RE = re.compile(r"bootstrap: (.*)\n    \};")
+
+
+def _embedded_boot(html: str) -> dict:
+    return json.loads(BOOT_RE.search(html).group(1))
+
+
+def test_shell_embeds_the_bootstrap_payload(client: TestClient, smoke_user):
+    anonymous = client.get("/app/login")
+    assert anonymous.headers["cache-control"] == "no-cache"
+    boot = _embedded_boot(anonymous.text)
+    assert boot["authenticated"] is False
+    assert f'<meta name="csrf-token" content="{boot["csrf_token"]}">' in anonymous.text
+
+    register = client.post(
+        "/api/auth/register",
+        json={
+            "username": f"shell_{uuid4().hex[:10]}",
+            "password": TEST_PASSWORD,
+            "confirm_password": TEST_PASSWORD,
+            "csrf_token": boot["csrf_token"],
+        },
+    )
+    assert register.status_code == 200
+
+    page = client.get("/app/training/words")
+    boot = _embedded_boot(page.text)
+    assert boot["authenticated"] is True
+    assert boot["user"]["username"] == register.json()["user"]["username"]
+    assert f'data-theme="{boot["theme"]}"' in page.text
+    assert 'spaPath: "training/words"' in page.text
+    assert client.get("/api/bootstrap").json() == boot
+
+
+def test_shell_is_rendered_once_per_bundle(monkeypatch):
+    renders = []
+    original = spa.templates.get_template
+
+    def counting_get_template(name):
+        renders.append(name)
+        return original(name)
+
+    monkeypatch.setattr(spa, "_shell_cache", None)
+    monkeypatch.setattr(spa.templates, "get_template", counting_get_template)
+    first = spa._shell_parts(("app-one.js", "app-one.css"))
+    assert spa._shell_parts(("app-one.js", "app-one.css")) is first
+    spa._shell_parts(("app-two.js", None))
+    assert renders == [spa.SHELL_TEMPLATE, spa.SHELL_TEMPLATE]
+    assert set(first[1::2]) == set(spa.SHELL_SLOTS)
+
+
+def test_embedded_json_cannot_close_the_script():
+    encoded = spa._script_json({"label": "</script><script>alert(1)</script> & <!--"})
+    assert "<" not in encoded and ">" not in encoded
+    assert json.loads(encoded)["label"].startswith("</script>")
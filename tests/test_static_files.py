@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.core.static_files import IMMUTABLE_CACHE_CONTROL, PrecompressedStaticFiles, accepted_encodings
+
+BUNDLE = b"console.log('verbpractice');\n" * 200
+
+
+@pytest.fixture()
+def static_client(tmp_path):
+    (tmp_path / "app-abc123.js").write_bytes(BUNDLE)
+    (tmp_path / "app-abc123.js.gz").write_bytes(gzip.compress(BUNDLE))
+    # Stands in for brotli output; the test client has no brotli decoder.
+    (tmp_path / "app-abc123.js.br").write_bytes(b"brotli-bytes")
+    (tmp_path / "plain.txt").write_bytes(b"no siblings")
+    (tmp_path / "index.html").write_bytes(b"<!doctype html>")
+    app = Starlette(
+        routes=[Mount("/static/spa", PrecompressedStaticFiles(directory=str(tmp_path), immutable=True))]
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+def _raw(client: TestClient, path: str, accept_encoding: str, **headers: str):
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding, **headers}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_accept_encoding_honours_quality_values():
+    assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("br;q=0, gzip;q=0.5") == {"gzip"}
+    assert {"br", "gzip"} <= accepted_encodings("*")
+    assert accepted_encodings("gzip;q=0, *") == {"*", "br"}
+    assert accepted_encodings("*;q=0") == set()
+    assert accepted_encodings("") == set()
+
+
+def test_serves_brotli_then_gzip_then_identity(static_client):
+    path = "/static/spa/app-abc123.js"
+
+    response, body = _raw(static_client, path, "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert body == b"brotli-bytes"
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    response, body = _raw(static_client, path, "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == BUNDLE
+
+    response, body = _raw(static_client, path, "identity")
+    assert "content-encoding" not in response.headers
+    assert body == BUNDLE
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_variants_revalidate_with_their_own_etag(static_client):
+    path = "/static/spa/app-abc123.js"
+    brotli, _ = _raw(static_client, path, "br")
+    identity, _ = _raw(static_client, path, "identity")
+    assert brotli.headers["etag"] != identity.headers["etag"]
+
+    cached, _ = _raw(static_client, path, "br", **{"If-None-Match": brotli.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.headers["vary"] == "Accept-Encoding"
+
+    stale, _ = _raw(static_client, path, "identity", **{"If-None-Match": brotli.headers["etag"]})
+    assert stale.status_code == 200
+
+
+def test_files_without_siblings_and_html_are_left_alone(static_client):
+    response, body = _raw(static_client, "/static/spa/plain.txt", "br, gzip")
+    assert body == b"no siblings"
+    assert "vary" not in response.headers
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    response, _ = _raw(static_client, "/static/spa/index.html", "br, gzip")
+    assert "cache-control" not in response.headers
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.query_metrics import install_query_metrics, track_queries
+from app.db.base import Base
+from app.db.models import Language, ProgressItemType, User, UserProgress, Verb, Word, WordTranslation
+from app.services.chat_service import weak_items_context
+from app.services.tutor_context import TUTOR_CONTEXT_SIZE, learner_weak_items, tutor_contexts
+
+
+@pytest.fixture(autouse=True)
+def fresh_tutor_contexts():
+    tutor_contexts.clear()
+    yield
+    tutor_contexts.clear()
+
+
+@pytest_asyncio.fixture()
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'tutor.db'}", poolclass=NullPool)
+    install_query_metrics(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as db:
+        spanish = Language(code="ES", name="Spanish")
+        french = Language(code="FR", name="French")
+        db.add_all([User(id=1, username="learner", password_hash="x"), spanish, french])
+        await db.flush()
+        words = [Word(id=index, text=f"palabra{index}", language_id=spanish.id) for index in range(1, 21)]
+        db.add_all(words)
+        db.add(Verb(id=1, infinitive="ir", language_id=french.id))
+        await db.flush()
+        db.add(WordTranslation(word_id=1, target_language_id=french.id, translation="mot1"))
+        for word in words:
+            db.add(
+                UserProgress(
+                    user_id=1,
+                    item_type=ProgressItemType.WORD,
+                    item_id=word.id,
+                    language_pair="es_fr",
+                    # word 1 is the weakest, word 20 the strongest.
+                    probability=1000.0 - word.id * 10,
+                    times_seen=4,
+                    times_correct=1,
+                    unlocked=word.id <= 18,
+                )
+            )
+        await db.commit()
+    yield factory
+    await engine.dispose()
+
+
+async def _weak_labels(factory) -> list[str]:
+    async with factory() as db:
+        return [item.label for item in await learner_weak_items(db, user_id=1)]
+
+
+async def _set_probability(factory, word_id: int, probability: float, *, commit: bool = True) -> None:
+    async with factory() as db:
+        row = (
+            await db.execute(select(UserProgress).where(UserProgress.item_id == word_id))
+        ).scalar_one()
+        row.probability = probability
+        row.unlocked = True
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
+            await db.rollback()
+
+
+@pytest.mark.asyncio
+async def test_warm_context_is_served_without_queries(session_factory):
+    labels = await _weak_labels(session_factory)
+    assert labels == [f"palabra{index}" for index in range(1, TUTOR_CONTEXT_SIZE + 1)]
+
+    with track_queries() as stats:
+        assert await _weak_labels(session_factory) == labels
+    assert stats.count == 0
+
+
+@pytest.mark.asyncio
+async def test_committed_progress_updates_the_cached_order(session_factory):
+    await _weak_labels(session_factory)
+
+    # palabra1 improves past the visible window; palabra12 gets much weaker.
+    await _set_probability(session_factory, 1, 600.0)
+    await _set_probability(session_factory, 12, 990.0)
+    with track_queries() as stats:
+        labels = await _weak_labels(session_factory)
+
+    assert labels == ["palabra12", "palabra2", "palabra3", "palabra4", "palabra5", "palabra6"]
+    assert stats.count == 0
+
+
+@pytest.mark.asyncio
+async def test_newly_unlocked_item_only_loads_its_label(session_factory):
+    await _weak_labels(session_factory)
+
+    await _set_probability(session_factory, 20, 999.0)
+    with track_queries() as stats:
+        labels = await _weak_labels(session_factory)
+
+    assert labels[0] == "palabra20"
+    assert 0 < stats.count <= 3
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_changes_are_ignored(session_factory):
+    before = await _weak_labels(session_factory)
+
+    await _set_probability(session_factory, 6, 1000.0, commit=False)
+
+    assert await _weak_labels(session_factory) == before
+
+
+@pytest.mark.asyncio
+async def test_prompt_lines_use_labels_instead_of_ids(session_factory):
+    async with session_factory() as db:
+        db.add(
+            UserProgress(
+                user_id=1,
+                item_type=ProgressItemType.CONJUGATION,
+                item_id=1,
+                language_pair="fr_conj",
+                probability=1000.0,
+                unlocked=True,
+                extra_data={"tense_scores": {"Présent": 300.0, "Imparfait": 900.0, "Futur": 700.0}},
+            )
+        )
+        await db.commit()
+        items = await learner_weak_items(db, user_id=1)
+
+    lines = weak_items_context(items).splitlines()
+    assert lines[0] == '- conjugation "ir" (fr_conj): weakest tenses: Imparfait, Futur'
+    assert lines[1] == '- word "palabra1" = "mot1" (es_fr): 1/4 correct'
+    assert "item_id" not in weak_items_context(items)
+
+
+@pytest.mark.asyncio
+async def test_savepoint_rollback_keeps_the_outer_changes(session_factory):
+    await _weak_labels(session_factory)
+
+    async with session_factory() as db:
+        rows = {
+            row.item_id: row
+            for row in (await db.execute(select(UserProgress).where(UserProgress.item_id.in_([6, 12])))).scalars()
+        }
+        rows[12].probability = 995.0
+        await db.flush()
+        try:
+            async with db.begin_nested():
+                rows[6].probability = 1000.0
+                await db.flush()
+                raise RuntimeError("undo the savepoint")
+        except RuntimeError:
+            pass
+        await db.commit()
+
+    assert await _weak_labels(session_factory) == [
+        "palabra12",
+        "palabra1",
+        "palabra2",
+        "palabra3",
+        "palabra4",
+        "palabra5",
+    ]
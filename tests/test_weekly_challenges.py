@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.base import Base
+from app.db.models import User, UserChallengeProgress, UserProfile, WeeklyChallenge
+from app.services import gamification
+from app.services.challenge_rotation import WeeklyChallengeRotation, seconds_until_next_rotation
+from app.services.gamification import (
+    CHALLENGE_WEEKS_AHEAD,
+    current_weekly_challenge,
+    provision_weekly_challenges,
+    track_weekly_metric,
+)
+from app.services.state_version import state_versions
+
+
+@pytest_asyncio.fixture()
+async def challenge_db(tmp_path, monkeypatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'challenges.db'}", poolclass=NullPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(gamification, "_challenge_cache", {})
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    yield async_sessionmaker(engine, expire_on_commit=False), statements
+    await engine.dispose()
+
+
+def _challenge_queries(statements: list[str]) -> list[str]:
+    return [statement for statement in statements if "weekly_challenges" in statement]
+
+
+@pytest.mark.asyncio
+async def test_provisioning_creates_upcoming_weeks_once(challenge_db):
+    session_factory, _ = challenge_db
+    today = date(2026, 3, 4)
+    async with session_factory() as db:
+        first = await provision_weekly_challenges(db, today)
+        await db.commit()
+    async with session_factory() as db:
+        again = await provision_weekly_challenges(db, date(2026, 3, 11))
+        await db.commit()
+        rows = (await db.execute(select(WeeklyChallenge).order_by(WeeklyChallenge.starts_at))).scalars().all()
+
+    assert [challenge.starts_at for challenge in first] == [
+        date(2026, 3, 2),
+        date(2026, 3, 9),
+        date(2026, 3, 16),
+    ]
+    assert len(first) == CHALLENGE_WEEKS_AHEAD + 1
+    assert again[:2] == first[1:]
+    assert len(rows) == 4
+    assert [row.active for row in rows] == [False, True, False, False]
+
+
+@pytest.mark.asyncio
+async def test_repeat_rotation_writes_nothing(challenge_db):
+    session_factory, statements = challenge_db
+    async with session_factory() as db:
+        await provision_weekly_challenges(db, date(2026, 3, 4))
+        await db.commit()
+
+    content_version = state_versions.content
+    statements.clear()
+    async with session_factory() as db:
+        await provision_weekly_challenges(db, date(2026, 3, 5))
+        await db.commit()
+
+    assert state_versions.content == content_version
+    assert not [statement for statement in statements if statement.startswith("UPDATE")]
+
+
+@pytest.mark.asyncio
+async def test_rotation_caches_so_answers_skip_the_table(challenge_db):
+    session_factory, statements = challenge_db
+    rotation = WeeklyChallengeRotation(session_factory, interval=60)
+    current = (await rotation.rotate())[0]
+
+    async with session_factory() as db:
+        user = User(username="rotation_qa", password_hash="x")
+        db.add(user)
+        await db.flush()
+        profile = UserProfile(user_id=user.id)
+        db.add(profile)
+        await db.flush()
+        statements.clear()
+        for _ in range(3):
+            await track_weekly_metric(
+                db, user_id=user.id, metric_key=current.metric_key, delta=1, profile=profile
+            )
+        await db.commit()
+        progress = (await db.execute(select(UserChallengeProgress))).scalar_one()
+
+    assert await current_weekly_challenge(None) is current
+    assert progress.challenge_id == current.id
+    assert progress.progress == 3
+    assert _challenge_queries(statements) == []
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_reads_once_and_uncommitted_rows_are_not_cached(challenge_db):
+    session_factory, statements = challenge_db
+    today = date.today()
+
+    async with session_factory() as db:
+        provisioned = await current_weekly_challenge(db, today)
+        again = await current_weekly_challenge(db, today)
+        await db.rollback()
+    assert again == provisioned
+    assert gamification._challenge_cache == {}
+
+    async with session_factory() as db:
+        await provision_weekly_challenges(db, today)
+        await db.commit()
+    async with session_factory() as db:
+        statements.clear()
+        read = await current_weekly_challenge(db, today)
+        assert await current_weekly_challenge(db, today) is read
+    assert len(_challenge_queries(statements)) == 1
+
+
+@pytest.mark.asyncio
+async def test_rotation_job_runs_at_start_and_stops(challenge_db):
+    session_factory, _ = challenge_db
+    rotation = WeeklyChallengeRotation(session_factory, interval=60)
+    rotation.start()
+    for _ in range(100):
+        if gamification._challenge_cache:
+            break
+        await asyncio.sleep(0.01)
+    assert rotation.running
+    await rotation.stop()
+
+    assert not rotation.running
+    assert len(gamification._challenge_cache) == CHALLENGE_WEEKS_AHEAD + 1
+
+
+def test_rotation_wakes_at_the_week_boundary():
+    sunday_evening = datetime(2026, 3, 8, 23, 30)
+    assert seconds_until_next_rotation(sunday_evening, 3600) == 1800
+    assert seconds_until_next_rotation(datetime(2026, 3, 4, 12, 0), 3600) == 3600